@@ -0,0 +1,192 @@
+"""
+Defines the SplineBank class, many splines packed in concatenated arrays.
+"""
+
+import numpy as np
+import parallel
+from spline import CubicSpline, bc_ends
+
+class RelativeSizeException(Exception):
+    pass
+
+class SplineBank():
+    """
+    Many splines, or curves, stored in the manner of a sparse CSR matrix: the nodes of all the curves are
+    concatenated in one array, their coefficients in one block, and an offset table gives the first node of each
+    curve. A single call evaluates any mix of curves and points, without a Python call per curve.
+
+    Parameters
+    --------------
+    nodes : np.array
+        Concatenated nodes of the curves.
+    coeffs : np.array
+        Concatenated coefficients of the curves, with shape (intervals, P, ...).
+    offsets : np.array
+        Index of the first node of each curve in 'nodes', followed by the total number of nodes.
+        Curve i has offsets[i + 1] - offsets[i] nodes, and its intervals start at row offsets[i] - i of 'coeffs'.
+    bc_types : str, tuple or list, optional
+        Types of the boundary conditions of the curves, see 'CubicSpline': a list with one for each curve,
+        or a single type shared by all.
+        By default the curves are taken as clamped.
+    """
+
+    def __init__(self, nodes: np.ndarray, coeffs: np.ndarray, offsets: np.ndarray, bc_types: "str | tuple | list | None" = None):
+        """
+        SplineBank constructor, wrapping already packed arrays.
+        The types of the boundary conditions are kept so that the curves given back by indexing are updated,
+        extended and saved as the splines they come from.
+
+        Raises
+        ---------------
+        RelativeSizeException: if the offsets do not match the nodes and the coefficients,
+        a curve has less than two nodes, or the types of the boundary conditions are not one for each curve.
+        Same exceptions of 'CubicSpline' for unknown types of the boundary conditions.
+        """
+        self.nodes = np.ascontiguousarray(nodes, dtype = np.float64)
+        self.coeffs = np.ascontiguousarray(coeffs)
+        self.offsets = np.asarray(offsets, dtype = np.intp)
+
+        if self.offsets[0] != 0 or self.offsets[-1] != len(self.nodes):
+            raise RelativeSizeException("Offsets do not match the nodes.")
+        if not np.all(np.diff(self.offsets) >= 2):
+            raise RelativeSizeException("Each curve must have at least two nodes.")
+        if len(self.coeffs) != len(self.nodes) - len(self):
+            raise RelativeSizeException("Coefficients do not match the nodes.")
+
+        if bc_types is None or isinstance(bc_types, (str, tuple)):
+            bc_types = [bc_types or "clamped"] * len(self)
+        if len(bc_types) != len(self):
+            raise RelativeSizeException("Types of the boundary conditions do not match the curves.")
+        self.bc_types = [bc_ends(bc_type)[0] for bc_type in bc_types]
+
+    @classmethod
+    def from_splines(cls, splines: list[CubicSpline]) -> "SplineBank":
+        """
+        Pack existing splines, copying their nodes and coefficients.
+
+        Parameters
+        --------------
+        splines : list
+            Splines sharing the number of coefficients and the channels.
+
+        Returns
+        --------------
+        SplineBank
+            Returns the bank, curve i being splines[i].
+
+        Raises
+        --------------
+        RelativeSizeException: if no spline is given, or the splines do not share the shape of their coefficients.
+        """
+        if not splines:
+            raise RelativeSizeException("At least one spline is required.")
+        if any(cs.coeffs.shape[1:] != splines[0].coeffs.shape[1:] for cs in splines):
+            raise RelativeSizeException("Splines must share the shape of their coefficients.")
+
+        offsets = np.cumsum([0] + [len(cs.nodes) for cs in splines])
+        return cls(np.concatenate([cs.nodes for cs in splines]), np.concatenate([cs.coeffs for cs in splines]), offsets, [cs.bc_type for cs in splines])
+
+    @classmethod
+    def fit(cls, specs: list[tuple[np.ndarray, np.ndarray, np.ndarray]], workers: int = 1) -> "SplineBank":
+        """
+        Fit the curves directly into a bank.
+
+        Parameters
+        --------------
+        specs : list
+            List of (X, Y, BC) tuples, the arguments of each 'CubicSpline'.
+        workers : int
+            Number of processes fitting the curves, see 'parallel.fit_many'.
+
+        Returns
+        --------------
+        SplineBank
+            Returns the bank, curve i being fitted on specs[i].
+
+        Raises
+        --------------
+        Same exceptions of 'CubicSpline', for the first invalid curve met.
+        """
+        return cls.from_splines(parallel.fit_many(specs, workers = workers))
+
+    def __len__(self) -> int:
+        """
+        Number of curves.
+        """
+        return len(self.offsets) - 1
+
+    def __getitem__(self, curve: int) -> CubicSpline:
+        """
+        Curve of the bank as a spline, with its own boundary conditions, whose arrays are views of the bank:
+        'CubicSpline.update_y' changes the bank in place. Negative indices count from the last curve.
+
+        Raises
+        ---------------
+        IndexError: if the curve is out of the bank.
+        """
+        if not -len(self) <= curve < len(self):
+            raise IndexError("Curve index out of range.")
+        curve = curve % len(self)
+        start, stop = self.offsets[curve], self.offsets[curve + 1]
+        cs = CubicSpline.__new__(CubicSpline)
+        cs.nodes, cs.coeffs = self.nodes[start:stop], self.coeffs[start - curve:stop - curve - 1]
+        cs.size, cs.step, cs.bc_type = stop - start - 1, None, self.bc_types[curve]
+        return cs
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory held by the arrays of the bank, in bytes.
+        """
+        return self.nodes.nbytes + self.coeffs.nbytes + self.offsets.nbytes
+
+    def eval(self, curve_ids: np.ndarray, x: np.ndarray) -> np.ndarray:
+        """
+        Evaluate pairs of curves and points.
+        Each point is located by a bisection over the nodes of its curve, run on all the points at once.
+
+        Parameters
+        ------------------
+        curve_ids : np.array
+            Curve of each point.
+        x : np.array
+            Points, broadcastable with 'curve_ids'.
+
+        Returns
+        ------------------
+        np.array:
+            Returns the values, with shape np.broadcast(curve_ids, x).shape + the channels of the curves.
+
+        Raises
+        ------------------
+        IndexError: if a curve id is out of the bank.
+        ValueError: if a point is out of the node domain of its curve.
+        """
+        curve_ids, x = np.broadcast_arrays(np.asarray(curve_ids, dtype = np.intp), np.asarray(x, dtype = np.float64))
+        shape = x.shape
+        curve_ids, x = curve_ids.reshape(-1), x.reshape(-1)
+        if np.any(curve_ids < 0) or np.any(curve_ids >= len(self)):
+            raise IndexError("Curve id out of range.")
+
+        # the interval of a point is searched between the first and the last interval of its curve
+        lo, hi = self.offsets[curve_ids], self.offsets[curve_ids + 1] - 2
+        if np.any(x < self.nodes[lo]) or np.any(x > self.nodes[hi + 1]):
+            raise ValueError("Some values are out of the curve domain.")
+
+        while True:
+            active = lo < hi
+            if not np.any(active):
+                break
+            mid = (lo + hi + 1) // 2
+            right = active & (self.nodes[mid] <= x)
+            lo = np.where(right, mid, lo)
+            hi = np.where(active & ~right, mid - 1, hi)
+
+        channels = self.coeffs.shape[2:]
+        t = (x - self.nodes[lo]).reshape((-1,) + (1,) * len(channels))
+        c = self.coeffs[lo - curve_ids]
+        y = c[:, 0]
+        for p in range(1, c.shape[1]):
+            y = y * t + c[:, p]
+
+        return y.reshape(shape + channels)
@@ -0,0 +1,103 @@
+import os
+import tempfile
+import unittest
+import numpy as np
+import spline
+import bank
+
+class TestSplineBank(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(0)
+        self.specs = []
+        for n in (2, 3, 7, 20):
+            X = np.cumsum(rng.uniform(0.1, 1, n))
+            self.specs.append((X, rng.normal(size = (n, 2)), rng.normal(size = (2, 2))))
+        self.splines = [spline.CubicSpline(*spec) for spec in self.specs]
+
+    def test_from_splines(self):
+        """
+            Test that mixed pairs of curves and points give the values of the single splines, nodes included.
+        """
+        sb = bank.SplineBank.from_splines(self.splines)
+        rng = np.random.default_rng(1)
+        ids = rng.integers(len(self.splines), size = 500)
+        x = np.array([rng.uniform(self.splines[i].nodes[0], self.splines[i].nodes[-1]) for i in ids])
+
+        y = sb.eval(ids, x)
+        self.assertEqual(len(sb), 4)
+        self.assertEqual(y.shape, (500, 2))
+        for i, cs in enumerate(self.splines):
+            self.assertTrue(np.allclose(y[ids == i], cs.eval(x[ids == i])))
+            self.assertTrue(np.allclose(sb.eval(i, cs.nodes), cs.eval(cs.nodes)))
+
+    def test_fit(self):
+        """
+            Test that fitting the curves directly gives the bank of the single splines.
+        """
+        sb = bank.SplineBank.fit(self.specs)
+        packed = bank.SplineBank.from_splines(self.splines)
+
+        self.assertTrue(np.array_equal(sb.offsets, packed.offsets))
+        self.assertTrue(np.allclose(sb.coeffs, packed.coeffs))
+
+    def test_broadcast_and_items(self):
+        """
+            Test that curve ids broadcast against the points, and that the curves are given back as splines.
+        """
+        sb = bank.SplineBank.from_splines(self.splines)
+        x = np.linspace(self.splines[3].nodes[0], self.splines[3].nodes[-1], 12).reshape(3, 4)
+
+        self.assertTrue(np.allclose(sb.eval(3, x), self.splines[3].eval(x)))
+        self.assertTrue(np.allclose(sb[2].eval(self.splines[2].nodes), self.splines[2].eval(self.splines[2].nodes)))
+        self.assertTrue(np.array_equal(sb[-1].nodes, self.splines[3].nodes))
+        self.assertTrue(np.array_equal(sb[-4].coeffs, self.splines[0].coeffs))
+        self.assertEqual(sb[-1].size, self.splines[3].size)
+
+    def test_invalid_input(self):
+        """
+            Test that unknown curves, points out of their curve and splines of different shapes raise an exception.
+        """
+        sb = bank.SplineBank.from_splines(self.splines)
+
+        with self.assertRaises(IndexError):
+            sb.eval(4, self.splines[0].nodes[0])
+        with self.assertRaises(ValueError):
+            sb.eval(0, self.splines[0].nodes[-1] + 1)
+        with self.assertRaises(bank.RelativeSizeException):
+            bank.SplineBank.from_splines([self.splines[0], spline.CubicSpline([0, 1], [0, 1], [0, 0])])
+        with self.assertRaises(bank.RelativeSizeException):
+            bank.SplineBank(sb.nodes, sb.coeffs, np.array([0, 1, len(sb.nodes)]))
+
+        with self.assertRaises(bank.RelativeSizeException):
+            bank.SplineBank.from_splines([])
+        for curve in (4, -5):
+            with self.assertRaises(IndexError):
+                sb[curve]
+        with self.assertRaises(bank.RelativeSizeException):
+            bank.SplineBank(sb.nodes, sb.coeffs, sb.offsets, ["clamped"] * 3)
+
+    def test_boundary_conditions(self):
+        """
+            Test that the curves keep the boundary conditions of their splines, so that updating a curve
+            of the bank in place gives the updated spline, and saving it records its type.
+        """
+        X = self.specs[3][0]
+        splines = [spline.CubicSpline(X, np.sin(X), bc_type = bc_type) for bc_type in ("natural", ("not-a-knot", "natural"))]
+        splines[1:1] = [spline.CubicSpline(X, np.cos(X), np.zeros(2))]
+        sb = bank.SplineBank.from_splines(splines)
+
+        self.assertEqual(sb.bc_types, ["natural", "clamped", ("not-a-knot", "natural")])
+        self.assertEqual(bank.SplineBank(sb.nodes, sb.coeffs, sb.offsets).bc_types, ["clamped"] * 3)
+        for i, cs in enumerate(splines):
+            self.assertEqual(sb[i].bc_type, cs.bc_type)
+            sb[i].update_y([0, 10], [1, -1])
+            cs.update_y([0, 10], [1, -1])
+            self.assertTrue(np.allclose(sb.eval(i, X), cs.eval(X)))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "curve.bin")
+            sb[2].save(path)
+            self.assertEqual(spline.CubicSpline.load(path, mmap = False).bc_type, ("not-a-knot", "natural"))
+
+
+unittest.main()
@@ -0,0 +1,541 @@
+"""
+Defines the benchmarks of the project. Run it from the inside of the `code` folder with
+
+    python bench.py [name ...]
+
+where each name selects one of the benchmarks below; with no names all of them are run.
+"""
+
+import os
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+from lu import lu
+import tls
+import spline
+import bank
+import bicubic
+import parallel
+
+
+def timeit(func, repeat: int = 3) -> float:
+    """
+    Measure the best wall-clock time of a function call.
+
+    Parameters
+    --------------
+    func : callable
+        Function without arguments to be timed.
+    repeat : int
+        Number of measurements, the minimum one is returned.
+
+    Returns
+    --------------
+    float
+        Returns the best time in seconds.
+    """
+    best = np.inf
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+
+    return best
+
+
+def diagonally_dominant(n: int, rng: np.random.Generator) -> list[np.ndarray]:
+    """
+    Build a random, diagonally dominant tridiagonal system of size n.
+
+    Returns
+    --------------
+    list
+        Returns the lower, main and upper diagonals and the known values.
+    """
+    v = rng.uniform(0, 1, n - 1)
+    w = rng.uniform(0, 1, n - 1)
+    u = 2 + rng.uniform(0, 1, n)
+    delta = rng.uniform(-1, 1, n)
+
+    return [v, u, w, delta]
+
+
+def bench_solver(sizes: list[int] | None = None):
+    """
+    Time the forward-backward substitution in `tls.solver` from 10^3 to 10^7 unknowns.
+    The time per unknown should stay constant, since the algorithm is linear.
+    """
+    if sizes is None:
+        sizes = [10**3, 10**4, 10**5, 10**6, 10**7]
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>10} {'time [s]':>12} {'ns / unknown':>14}")
+    for n in sizes:
+        v, u, w, delta = diagonally_dominant(n, rng)
+        beta, alpha, gamma = lu(v, u, w)
+
+        t = timeit(lambda: tls.solver(beta, alpha, gamma, delta), repeat = 1 if n >= 10**6 else 3)
+        print(f"{n:>10} {t:>12.4f} {1e9 * t / n:>14.1f}")
+
+
+def bench_backends(sizes: list[int] | None = None):
+    """
+    Compare the backends of `tls.thomas`, which fuses factorization and substitution,
+    against the pure numpy `lu` followed by `tls.solver`.
+    """
+    if sizes is None:
+        sizes = [10**3, 10**5, 10**6]
+
+    rng = np.random.default_rng(0)
+    print(f"selected backend: {tls.backend()} (available: {', '.join(tls.available_backends())})")
+    print(f"{'n':>10} {'backend':>10} {'time [s]':>12}")
+    for n in sizes:
+        v, u, w, delta = diagonally_dominant(n, rng)
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            tls.thomas(v, u, w, delta)  # warm up, e.g. numba compilation
+            t = timeit(lambda: tls.thomas(v, u, w, delta))
+            print(f"{n:>10} {name:>10} {t:>12.4f}")
+        tls.BACKEND = "auto"
+
+
+def bench_rhs(n: int = 1000, columns: list[int] | None = None):
+    """
+    Solve k known values vectors sharing one matrix: a `tls.thomas` call per column
+    against a single `tls.Factorization` solving the (n, k) array in one sweep.
+    """
+    if columns is None:
+        columns = [1, 10, 100, 1000]
+
+    rng = np.random.default_rng(0)
+    v, u, w, _ = diagonally_dominant(n, rng)
+    print(f"backend: {tls.backend()}, n = {n}")
+    print(f"{'k':>8} {'loop [s]':>12} {'batched [s]':>12}")
+    for k in columns:
+        delta = rng.uniform(-1, 1, (n, k))
+        loop = timeit(lambda: [tls.thomas(v, u, w, delta[:, j]) for j in range(k)])
+        batched = timeit(lambda: tls.Factorization(v, u, w).solve(delta))
+        print(f"{k:>8} {loop:>12.4f} {batched:>12.4f}")
+
+
+def bench_stacked(n: int = 100, systems: list[int] | None = None):
+    """
+    Solve m independent systems of size n: `lu` and `tls.solver` called in a loop
+    against a single call on the stacked (m, n) diagonals.
+    """
+    if systems is None:
+        systems = [1, 10, 100, 1000, 10000]
+
+    rng = np.random.default_rng(0)
+    print(f"n = {n}")
+    print(f"{'m':>8} {'loop [s]':>12} {'stacked [s]':>12}")
+    for m in systems:
+        v = rng.uniform(0, 1, (m, n - 1))
+        w = rng.uniform(0, 1, (m, n - 1))
+        u = 2 + rng.uniform(0, 1, (m, n))
+        delta = rng.uniform(-1, 1, (m, n))
+
+        loop = timeit(lambda: [tls.solver(*lu(v[j], u[j], w[j]), delta[j]) for j in range(m)], repeat = 1)
+        stacked = timeit(lambda: tls.solver(*lu(v, u, w), delta))
+        print(f"{m:>8} {loop:>12.4f} {stacked:>12.4f}")
+
+
+def bench_channels(nodes: int = 1000, samples: int = 10**6, channels: list[int] | None = None):
+    """
+    Evaluate k channels sharing the same nodes: k one dimensional splines
+    against a single multi-channel spline.
+    """
+    if channels is None:
+        channels = [1, 2, 3, 8]
+
+    rng = np.random.default_rng(0)
+    X = np.cumsum(rng.uniform(0.1, 1, nodes))
+    x = rng.uniform(X[0], X[-1], samples)
+    print(f"{nodes} nodes, {samples} samples")
+    print(f"{'k':>8} {'separate [s]':>14} {'channels [s]':>14}")
+    for k in channels:
+        Y = rng.normal(size = (nodes, k))
+        separate = [spline.CubicSpline(X, Y[:, j], np.zeros(2)) for j in range(k)]
+        together = spline.CubicSpline(X, Y, np.zeros(2))
+
+        t1 = timeit(lambda: [cs.eval(x) for cs in separate])
+        t2 = timeit(lambda: together.eval(x))
+        print(f"{k:>8} {t1:>14.4f} {t2:>14.4f}")
+
+
+def bench_prepared(nodes: list[int] | None = None, fits: int = 100):
+    """
+    Fit many y series over the same nodes: a `spline.CubicSpline` built from the nodes each time
+    against fits from `spline.prepare`, which validates and factorizes the nodes once.
+    """
+    if nodes is None:
+        nodes = [10, 100, 1000]
+
+    rng = np.random.default_rng(0)
+    print(f"backend: {tls.backend()}, {fits} fits")
+    print(f"{'n':>8} {'rebuilt [s]':>14} {'prepared [s]':>14}")
+    for n in nodes:
+        X = np.cumsum(rng.uniform(0.1, 1, n))
+        Y = rng.normal(size = (fits, n))
+        BC = np.zeros(2)
+
+        rebuilt = timeit(lambda: [spline.CubicSpline(X, y, BC) for y in Y])
+        prepared = timeit(lambda: [spline.prepare(X).fit(y, BC) for y in Y])
+        print(f"{n:>8} {rebuilt:>14.4f} {prepared:>14.4f}")
+
+
+def bench_construction(nodes: list[int] | None = None):
+    """
+    Time the construction of a `spline.CubicSpline`, with and without the validation of the nodes.
+    """
+    if nodes is None:
+        nodes = [10**3, 10**4, 10**5, 10**6]
+
+    rng = np.random.default_rng(0)
+    print(f"backend: {tls.backend()}")
+    print(f"{'n':>8} {'checked [s]':>14} {'unchecked [s]':>14}")
+    for n in nodes:
+        X = np.cumsum(rng.uniform(0.1, 1, n))
+        Y = rng.normal(size = n)
+        BC = np.zeros(2)
+
+        checked = timeit(lambda: spline.CubicSpline(X, Y, BC))
+        unchecked = timeit(lambda: spline.CubicSpline(X, Y, BC, check = False))
+        print(f"{n:>8} {checked:>14.4f} {unchecked:>14.4f}")
+
+
+def bench_uniform(nodes: int = 10**4, samples: int = 10**7):
+    """
+    Evaluate a spline over evenly spaced nodes, locating the intervals by binary search
+    or arithmetically.
+    """
+    rng = np.random.default_rng(0)
+    X = np.linspace(0, 1, nodes)
+    Y = rng.normal(size = nodes)
+    x = rng.uniform(0, 1, samples)
+
+    searched = timeit(lambda: spline.CubicSpline(X, Y, np.zeros(2), uniform = False).eval(x))
+    uniform = timeit(lambda: spline.CubicSpline(X, Y, np.zeros(2), uniform = True).eval(x))
+    print(f"{nodes} nodes, {samples} samples")
+    print(f"binary search: {searched:.4f} s, {samples / searched / 1e6:.1f} Mpoints/s")
+    print(f"uniform:       {uniform:.4f} s, {samples / uniform / 1e6:.1f} Mpoints/s")
+
+
+def bench_sorted(nodes: list[int] | None = None, samples: int = 10**7):
+    """
+    Evaluate a spline over sorted points, as produced by np.linspace, with a binary search
+    for each point or with the merge of `assume_sorted = True`.
+    """
+    if nodes is None:
+        nodes = [10, 10**3, 10**5]
+
+    rng = np.random.default_rng(0)
+    print(f"{samples} samples")
+    print(f"{'n':>8} {'searched [s]':>14} {'sorted [s]':>14}")
+    for n in nodes:
+        X = np.cumsum(rng.uniform(0.1, 1, n))
+        cs = spline.CubicSpline(X, rng.normal(size = n), np.zeros(2))
+        x = np.linspace(X[0], X[-1], samples)
+
+        searched = timeit(lambda: cs.eval(x))
+        merged = timeit(lambda: cs.eval(x, assume_sorted = True))
+        print(f"{n:>8} {searched:>14.4f} {merged:>14.4f}")
+
+
+def bench_chunks(nodes: int = 1000, samples: int = 10**7, chunk: int = 10**5):
+    """
+    Evaluate a spline over many points at once, and in fixed-size chunks reusing
+    the same output and scratch buffers; reports time and peak memory allocated.
+    """
+    rng = np.random.default_rng(0)
+    X = np.cumsum(rng.uniform(0.1, 1, nodes))
+    cs = spline.CubicSpline(X, rng.normal(size = nodes), np.zeros(2))
+    x = rng.uniform(X[0], X[-1], samples)
+
+    def chunked():
+        out, scratch = np.empty(chunk), cs.workspace(chunk)
+        for start in range(0, samples, chunk):
+            cs.eval(x[start:start + chunk], out = out, scratch = scratch)
+
+    def stream():
+        for _ in cs.eval_stream(x[start:start + chunk] for start in range(0, samples, chunk)):
+            pass
+
+    print(f"{nodes} nodes, {samples} samples, chunks of {chunk}")
+    for name, func in (("whole", lambda: cs.eval(x)), ("chunked", chunked), ("stream", stream)):
+        t = timeit(func)
+        tracemalloc.start()
+        func()
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(f"{name:>8}: {t:.4f} s, peak {peak / 2**20:.1f} MiB")
+
+
+def bench_parallel(nodes: int = 1000, samples: int = 10**7, workers: list[int] | None = None):
+    """
+    Evaluate a spline with `parallel.eval` on 1 to N threads and processes, reporting the speedup
+    against a single worker.
+    """
+    if workers is None:
+        cores = os.cpu_count() or 1
+        workers = sorted({1, 2, 4, 8, 16, 32, 64, cores} & set(range(1, cores + 1)))
+
+    rng = np.random.default_rng(0)
+    X = np.cumsum(rng.uniform(0.1, 1, nodes))
+    cs = spline.CubicSpline(X, rng.normal(size = nodes), np.zeros(2))
+    x = rng.uniform(X[0], X[-1], samples)
+
+    print(f"{nodes} nodes, {samples} samples, {os.cpu_count()} cores")
+    print(f"{'workers':>8} {'threads [s]':>12} {'speedup':>8} {'processes [s]':>14} {'speedup':>8}")
+    base = {}
+    for n in workers:
+        row = [f"{n:>8}"]
+        for processes in (False, True):
+            t = timeit(lambda: parallel.eval(cs, x, workers = n, processes = processes), repeat = 1)
+            base.setdefault(processes, t)
+            row.append(f"{t:>{14 if processes else 12}.4f} {base[processes] / t:>8.2f}")
+        print(" ".join(row))
+
+
+def bench_fit_many(splines: int = 10**4, nodes: int = 100, workers: list[int] | None = None):
+    """
+    Fit many independent splines: a serial loop of `spline.CubicSpline` against `parallel.fit_many`.
+    """
+    if workers is None:
+        workers = sorted({1, 2, 4, os.cpu_count() or 1})
+
+    rng = np.random.default_rng(0)
+    specs = [(np.cumsum(rng.uniform(0.1, 1, nodes)), rng.normal(size = nodes), np.zeros(2)) for _ in range(splines)]
+
+    serial = timeit(lambda: [spline.CubicSpline(*spec) for spec in specs], repeat = 1)
+    print(f"{splines} splines of {nodes} nodes, {os.cpu_count()} cores")
+    print(f"serial loop: {serial:.4f} s")
+    for n in workers:
+        t = timeit(lambda: parallel.fit_many(specs, workers = n), repeat = 1)
+        print(f"fit_many, {n:>3} workers: {t:.4f} s")
+
+
+def bench_append(nodes: int = 10**4, start: int = 100):
+    """
+    Extend a spline one node at a time: refitting on all the nodes against `CubicSpline.append`.
+    """
+    X = np.arange(nodes, dtype = np.float64)
+    Y = np.sin(X / 10)
+    BC = np.zeros(2)
+    samples = range(start, nodes, (nodes - start) // 100)
+
+    refit = timeit(lambda: [spline.CubicSpline(X[:i + 1], Y[:i + 1], BC) for i in samples], repeat = 1) / len(samples)
+
+    def stream():
+        cs = spline.CubicSpline(X[:start], Y[:start], BC)
+        for x, y in zip(X[start:], Y[start:]):
+            cs.append(x, y)
+
+    append = timeit(stream, repeat = 1) / (nodes - start)
+    print(f"up to {nodes} nodes, per new node")
+    print(f"full refit: {refit * 1e6:.1f} us")
+    print(f"append:     {append * 1e6:.1f} us")
+
+
+def bench_update(nodes: int = 10**5, updates: int = 100):
+    """
+    Change single values of a spline: refitting on all the nodes against `CubicSpline.update_y`.
+    """
+    X = np.arange(nodes, dtype = np.float64)
+    Y = np.sin(X / 10)
+    BC = np.zeros(2)
+    index = np.random.default_rng(0).integers(nodes, size = updates)
+
+    cs = spline.CubicSpline(X, Y, BC)
+    refit = timeit(lambda: spline.CubicSpline(X, Y, BC))
+    update = timeit(lambda: [cs.update_y(i, 1) for i in index], repeat = 1) / updates
+    print(f"{nodes} nodes, per changed value")
+    print(f"full refit: {refit * 1e6:.1f} us")
+    print(f"update_y:   {update * 1e6:.1f} us")
+
+
+def bench_bank(curves: int = 5 * 10**4, nodes: int = 20, samples: int = 10**6):
+    """
+    Evaluate mixed pairs of curves and points: a `spline.CubicSpline` call per curve against one `bank.SplineBank.eval`.
+    """
+    rng = np.random.default_rng(0)
+    X = np.linspace(0, 1, nodes)
+    splines = [spline.CubicSpline(X, rng.normal(size = nodes), np.zeros(2)) for _ in range(curves)]
+    sb = bank.SplineBank.from_splines(splines)
+    ids, x = rng.integers(curves, size = samples), rng.uniform(0, 1, samples)
+
+    def loop():
+        order = np.argsort(ids, kind = 'stable')
+        bounds = np.searchsorted(ids[order], np.arange(curves + 1))
+        y = np.empty(samples)
+        for i, cs in enumerate(splines):
+            points = order[bounds[i]:bounds[i + 1]]
+            y[points] = cs.eval(x[points])
+        return y
+
+    print(f"{curves} curves of {nodes} nodes, {samples} points")
+    print(f"loop over curves: {timeit(loop, repeat = 1):.4f} s")
+    print(f"SplineBank.eval:  {timeit(lambda: sb.eval(ids, x)):.4f} s")
+    print(f"memory: {sum(cs.nodes.nbytes + cs.coeffs.nbytes for cs in splines)} bytes in splines, {sb.nbytes} in the bank")
+
+
+def bench_bicubic(nodes: int = 200, samples: int = 10**6):
+    """
+    Fit a table on a square grid: a `spline.CubicSpline` per row and per column against `bicubic.BicubicSpline`,
+    then evaluate it at scattered points.
+    """
+    X = np.linspace(0, 1, nodes)
+    Z = np.sin(4 * X[:, None]) * np.cos(3 * X[None, :])
+    BC = np.zeros(2)
+
+    def rows():
+        for z in Z:
+            spline.CubicSpline(X, z, BC)
+        for z in Z.T:
+            spline.CubicSpline(X, z, BC)
+
+    rng = np.random.default_rng(0)
+    x, y = rng.uniform(0, 1, samples), rng.uniform(0, 1, samples)
+    bs = bicubic.BicubicSpline(X, X, Z, (BC, BC))
+    print(f"{nodes}x{nodes} grid, {samples} points")
+    print(f"1-D splines row by row: {timeit(rows):.4f} s")
+    print(f"BicubicSpline fit:      {timeit(lambda: bicubic.BicubicSpline(X, X, Z, (BC, BC))):.4f} s")
+    print(f"BicubicSpline eval:     {timeit(lambda: bs.eval(x, y)):.4f} s")
+
+
+def bench_periodic(nodes: int = 10**4, samples: int = 10**6):
+    """
+    Fit and evaluate a periodic signal: a clamped spline over three periods, the middle one evaluated,
+    against a periodic spline over one period.
+    """
+    X = np.linspace(0, 2 * np.pi, nodes)
+    Y = np.sin(X) + np.cos(3 * X)
+    Y[-1] = Y[0]
+    x = np.random.default_rng(0).uniform(0, 2 * np.pi, samples)
+
+    X3 = np.concatenate((X[:-1] - 2 * np.pi, X[:-1], X + 2 * np.pi))
+    Y3 = np.concatenate((Y[:-1], Y[:-1], Y))
+    padded = timeit(lambda: spline.CubicSpline(X3, Y3, np.zeros(2)).eval(x))
+    periodic = timeit(lambda: spline.CubicSpline(X, Y, bc_type = "periodic").eval(x))
+    print(f"{nodes} nodes, {samples} points")
+    print(f"three periods, clamped: {padded:.4f} s")
+    print(f"one period, periodic:   {periodic:.4f} s")
+
+
+def bench_extrapolate(nodes: int = 1000, samples: int = 10**7):
+    """
+    Evaluate points partly out of the nodes: clipping them in a separate pass before `eval`,
+    against the extrapolation modes of `eval`.
+    """
+    X = np.linspace(0, 1, nodes) ** 2
+    cs = spline.CubicSpline(X, np.sin(10 * X), np.zeros(2))
+    x = np.random.default_rng(0).uniform(-0.01, 1.01, samples)
+    inside = np.clip(x, 0, 1)
+
+    print(f"{nodes} nodes, {samples} points")
+    print(f"points inside, checked:    {timeit(lambda: cs.eval(inside)):.4f} s")
+    print(f"clip pass, then eval:      {timeit(lambda: cs.eval(np.clip(x, 0, 1))):.4f} s")
+    for mode in ("clip", "linear", "cubic", "nan"):
+        print(f"extrapolate = {mode + ',':<8}    {timeit(lambda: cs.eval(x, extrapolate = mode)):.4f} s")
+
+
+def bench_precision(nodes: int = 10**4, samples: int = 10**7):
+    """
+    Fit and evaluate in double, mixed (float32 coefficients over float64 factors) and single precision,
+    reporting the memory of the coefficients and the largest error against the double precision spline.
+    """
+    X = np.linspace(0, 100, nodes) + np.random.default_rng(0).uniform(0, 1e-3, nodes)
+    Y = np.sin(X) + 0.1 * X
+    BC = np.array([np.cos(X[0]) + 0.1, np.cos(X[-1]) + 0.1])
+    x = np.sort(np.random.default_rng(1).uniform(X[0], X[-1], samples))
+    reference = spline.CubicSpline(X, Y, BC).eval(x, assume_sorted = True)
+
+    print(f"{nodes} nodes, {samples} sorted points")
+    print(f"{'mode':>8} {'fit [s]':>10} {'eval [s]':>10} {'coeffs [MB]':>12} {'max error':>10}")
+    for mode, dtype, factor_dtype in (("double", np.float64, np.float64), ("mixed", np.float32, np.float64), ("single", np.float32, np.float32)):
+        fit = timeit(lambda: spline.CubicSpline(X, Y, BC, dtype = dtype, factor_dtype = factor_dtype))
+        cs = spline.CubicSpline(X, Y, BC, dtype = dtype, factor_dtype = factor_dtype)
+        t = timeit(lambda: cs.eval(x, assume_sorted = True))
+        error = np.max(np.abs(cs.eval(x, assume_sorted = True) - reference))
+        print(f"{mode:>8} {fit:>10.4f} {t:>10.4f} {cs.coeffs.nbytes / 2**20:>12.2f} {error:>10.2e}")
+
+
+def bench_solve(nodes: int = 1000, targets: int = 10**6, scalar: int = 1000):
+    """
+    Invert a monotone spline: a scalar bisection wrapped around `eval` for a few values,
+    against `CubicSpline.solve` for all of them.
+    """
+    X = np.linspace(0, 10, nodes)
+    cs = spline.CubicSpline(X, X**3 / 100 + X, np.array([1, 4]))
+    y = np.random.default_rng(0).uniform(0, 20, targets)
+
+    def bisection():
+        for value in y[:scalar]:
+            a, b = X[0], X[-1]
+            while b - a > 1e-12:
+                m = (a + b) / 2
+                a, b = (m, b) if cs.eval(m) < value else (a, m)
+
+    t = timeit(bisection, repeat = 1)
+    print(f"{nodes} nodes, {targets} values")
+    print(f"scalar bisection:  {t * targets / scalar:.4f} s (estimated from {scalar} values)")
+    print(f"CubicSpline.solve: {timeit(lambda: cs.solve(y)):.4f} s")
+
+
+def bench_smoothing(sizes: list[int] | None = None):
+    """
+    Fit noisy samples of a sine: an interpolating spline over a moving average of the samples,
+    against the smoothing spline, timing the fits and reporting their distance from the sine.
+    """
+    if sizes is None:
+        sizes = [10**4, 10**5, 10**6]
+
+    rng = np.random.default_rng(0)
+    print(f"{'n':>10} {'filter+fit [s]':>15} {'smoothing [s]':>14} {'error filter':>13} {'error smooth':>13}")
+    for n in sizes:
+        X = np.linspace(0, 100, n)
+        Y = np.sin(X) + 0.1 * rng.standard_normal(n)
+        lam = (X[1] - X[0]) ** 3 * 1e4
+        x = np.linspace(1, 99, 10**5)
+
+        def filtered():
+            return spline.CubicSpline(X, np.convolve(Y, np.ones(25) / 25, mode = "same"), bc_type = "natural")
+
+        repeat = 1 if n >= 10**6 else 3
+        t_filter = timeit(filtered, repeat = repeat)
+        t_smooth = timeit(lambda: spline.CubicSpline.smoothing(X, Y, lam), repeat = repeat)
+        error_filter = np.max(np.abs(filtered().eval(x) - np.sin(x)))
+        error_smooth = np.max(np.abs(spline.CubicSpline.smoothing(X, Y, lam).eval(x) - np.sin(x)))
+        print(f"{n:>10} {t_filter:>15.4f} {t_smooth:>14.4f} {error_filter:>13.2e} {error_smooth:>13.2e}")
+
+
+BENCHMARKS = {
+    "solver": bench_solver,
+    "backends": bench_backends,
+    "rhs": bench_rhs,
+    "stacked": bench_stacked,
+    "channels": bench_channels,
+    "prepared": bench_prepared,
+    "construction": bench_construction,
+    "uniform": bench_uniform,
+    "sorted": bench_sorted,
+    "chunks": bench_chunks,
+    "parallel": bench_parallel,
+    "fit_many": bench_fit_many,
+    "append": bench_append,
+    "update": bench_update,
+    "bank": bench_bank,
+    "bicubic": bench_bicubic,
+    "periodic": bench_periodic,
+    "extrapolate": bench_extrapolate,
+    "precision": bench_precision,
+    "solve": bench_solve,
+    "smoothing": bench_smoothing,
+}
+
+if __name__ == "__main__":
+    for name in sys.argv[1:] or BENCHMARKS:
+        print(f"== {name}")
+        BENCHMARKS[name]()
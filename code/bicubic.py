@@ -0,0 +1,107 @@
+"""
+Defines the BicubicSpline class, the tensor product of cubic splines on a rectilinear grid.
+"""
+
+import numpy as np
+from spline import CubicSpline, PreparedKnots
+
+class RelativeSizeException(Exception):
+    pass
+
+class BicubicSpline():
+    """
+    BicubicSpline class, interpolating a table of values on a rectilinear grid with cubic polynomials
+    in both the coordinates.
+
+    Parameters
+    --------------
+    X : np.array
+        Contains x values of the grid nodes.
+    Y : np.array
+        Contains y values of the grid nodes.
+    Z : np.array
+        Contains the values at the grid nodes, with shape (len(X), len(Y)).
+    bc : tuple
+        Boundary conditions (BCx, BCy) or (BCx, BCy, BCxy): first derivatives along x at the first and last x,
+        of shape (2,) or (2, len(Y)); first derivatives along y at the first and last y, of shape (2,) or (2, len(X));
+        mixed derivatives at the corners, of shape (2, 2) indexed by x end then y end, null by default.
+    """
+
+    def __init__(self, X: np.ndarray, Y: np.ndarray, Z: np.ndarray, bc: tuple):
+        """
+        BicubicSpline constructor. Instanciate a BicubicSpline object, computing all the coefficients.
+        The spline is fitted along x for all the rows of the table at once, as channels sharing one factorization,
+        then along y for all the coefficients of the first fit at once.
+
+        Raises
+        ---------------
+        RelativeSizeException: if the shape of Z or of the boundary conditions does not match the nodes.
+        Same exceptions of 'CubicSpline' for invalid nodes.
+        """
+        Z = np.asarray(Z, dtype = np.float64)
+        nx, ny = len(X), len(Y)
+        if Z.shape != (nx, ny):
+            raise RelativeSizeException("Shape of Z does not match the nodes.")
+
+        # conditions of shape (2,) are shared by all the rows, or columns
+        BCx, BCy = (np.asarray(b, dtype = np.float64).reshape((2, -1)) if np.size(b) == 2 else np.asarray(b, dtype = np.float64) for b in bc[:2])
+        BCxy = np.asarray(bc[2], dtype = np.float64) if len(bc) > 2 else np.zeros((2, 2))
+        try:
+            BCx, BCy = np.broadcast_to(BCx, (2, ny)), np.broadcast_to(BCy, (2, nx))
+            BCxy = np.broadcast_to(BCxy, (2, 2))
+        except ValueError:
+            raise RelativeSizeException("Shape of the boundary conditions does not match the nodes.")
+
+        xknots, yknots = PreparedKnots(X), PreparedKnots(Y)
+
+        # coefficients along x of the rows, (nx - 1, 4, ny), and of the slopes along y at the ends, (nx - 1, 4, 2)
+        A = CubicSpline(xknots, Z, BCx).coeffs
+        D = CubicSpline(xknots, BCy.T, BCxy).coeffs
+
+        # each coefficient along x is interpolated along y, with the slopes fitted above as boundary conditions
+        C = CubicSpline(yknots, np.moveaxis(A, 2, 0), np.moveaxis(D, 2, 0)).coeffs
+
+        self.xnodes, self.ynodes = xknots.nodes, yknots.nodes
+        # coefficients of each cell, from the highest powers of x then of y, in one block of shape (nx - 1, ny - 1, 4, 4)
+        self.coeffs = np.ascontiguousarray(np.transpose(C, (2, 0, 3, 1)))
+
+    def eval(self, x: np.ndarray, y: np.ndarray) -> np.ndarray:
+        """
+        Evaluate the spline at scattered points.
+
+        Parameters
+        ------------------
+        x : np.array
+            x values of the points.
+        y : np.array
+            y values of the points, broadcastable with 'x'.
+
+        Returns
+        ------------------
+        np.array:
+            Returns the values, with shape np.broadcast(x, y).shape.
+
+        Raises
+        ------------------
+        ValueError: if a point is out of the grid.
+        """
+        x, y = np.broadcast_arrays(np.asarray(x, dtype = np.float64), np.asarray(y, dtype = np.float64))
+        shape = x.shape
+        x, y = x.reshape(-1), y.reshape(-1)
+        if x.size and (x.min() < self.xnodes[0] or x.max() > self.xnodes[-1] or y.min() < self.ynodes[0] or y.max() > self.ynodes[-1]):
+            raise ValueError("Some values are out of the grid.")
+
+        i = np.clip(np.searchsorted(self.xnodes, x, 'right') - 1, 0, len(self.xnodes) - 2)
+        j = np.clip(np.searchsorted(self.ynodes, y, 'right') - 1, 0, len(self.ynodes) - 2)
+        t, u = x - self.xnodes[i], y - self.ynodes[j]
+        c = self.coeffs[i, j]
+
+        # Horner scheme along y for the four powers of x at once, then along x
+        r = c[:, :, 0]
+        for q in range(1, 4):
+            r = r * u[:, None] + c[:, :, q]
+        z = r[:, 0]
+        for p in range(1, 4):
+            z = z * t + r[:, p]
+
+        return z.reshape(shape)
@@ -0,0 +1,72 @@
+import unittest
+import numpy as np
+import spline
+import bicubic
+
+def f(x, y):
+    return x**3 - 2 * x * y**2 + y**3 + x * y + 1
+def fx(x, y):
+    return 3 * x**2 - 2 * y**2 + y
+def fy(x, y):
+    return -4 * x * y + 3 * y**2 + x
+def fxy(x, y):
+    return -4 * y + 1
+
+class TestBicubicSpline(unittest.TestCase):
+    def setUp(self):
+        self.X = np.linspace(0, 2, 9)
+        self.Y = np.array([-1, -0.5, 0, 0.2, 0.7, 1.5, 2])
+        X, Y = self.X, self.Y
+        self.Z = f(X[:, None], Y[None, :])
+        self.bc = (np.array([fx(X[0], Y), fx(X[-1], Y)]),
+                   np.array([fy(X, Y[0]), fy(X, Y[-1])]),
+                   np.array([[fxy(X[0], Y[0]), fxy(X[0], Y[-1])], [fxy(X[-1], Y[0]), fxy(X[-1], Y[-1])]]))
+
+    def test_bicubic_polynomial(self):
+        """
+            Test that a bicubic polynomial is interpolated exactly, given its derivatives at the boundary.
+        """
+        bs = bicubic.BicubicSpline(self.X, self.Y, self.Z, self.bc)
+        rng = np.random.default_rng(0)
+        x, y = rng.uniform(0, 2, 1000), rng.uniform(-1, 2, 1000)
+
+        self.assertEqual(bs.coeffs.shape, (8, 6, 4, 4))
+        self.assertTrue(np.allclose(bs.eval(x, y), f(x, y)))
+
+    def test_nodes_and_broadcast(self):
+        """
+            Test that the table is reproduced at the nodes, evaluating a grid by broadcasting.
+        """
+        bs = bicubic.BicubicSpline(self.X, self.Y, self.Z, (np.zeros(2), np.zeros(2)))
+        z = bs.eval(self.X[:, None], self.Y[None, :])
+
+        self.assertEqual(z.shape, self.Z.shape)
+        self.assertTrue(np.allclose(z, self.Z))
+
+    def test_rows_are_splines(self):
+        """
+            Test that along a row of nodes the spline is the cubic spline of that row.
+        """
+        bs = bicubic.BicubicSpline(self.X, self.Y, self.Z, self.bc)
+        cs = spline.CubicSpline(self.X, self.Z[:, 3], self.bc[0][:, 3])
+        x = np.linspace(0, 2, 50)
+
+        self.assertTrue(np.allclose(bs.eval(x, self.Y[3]), cs.eval(x)))
+
+    def test_invalid_input(self):
+        """
+            Test that tables or boundary conditions of the wrong shape, and points out of the grid, raise an exception.
+        """
+        with self.assertRaises(bicubic.RelativeSizeException):
+            bicubic.BicubicSpline(self.X, self.Y, self.Z.T, self.bc)
+        with self.assertRaises(bicubic.RelativeSizeException):
+            bicubic.BicubicSpline(self.X, self.Y, self.Z, (np.zeros(3), np.zeros(2)))
+
+        bs = bicubic.BicubicSpline(self.X, self.Y, self.Z, self.bc)
+        with self.assertRaises(ValueError):
+            bs.eval(2.5, 0)
+        with self.assertRaises(ValueError):
+            bs.eval(1, -2)
+
+
+unittest.main()
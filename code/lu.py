@@ -12,9 +12,11 @@ class RelativeSizeException(Exception):
 import numpy as np
 
 
-def lu(v: np.ndarray, u: np.ndarray, w: np.ndarray) -> list[np.ndarray]:
+def lu(v: np.ndarray, u: np.ndarray, w: np.ndarray, dtype: type = np.float64) -> list[np.ndarray]:
     """ 
     Lower-Upper Matrix Factorization algorithm using numpy arrays. 
+    Arrays of shape (m, n) are treated as m independent matrices, stacked along the first axis, 
+    and factorized together.
         
         Parameters
         -----------------
@@ -24,6 +26,8 @@ def lu(v: np.ndarray, u: np.ndarray, w: np.ndarray) -> list[np.ndarray]:
             Main diagonal numbers.
         w : np.array
             Upper diagonal number.
+        dtype : np.dtype
+            Floating point type of the working array, and so of the factors.
 
         Returns
         -----------------
@@ -33,36 +37,110 @@ def lu(v: np.ndarray, u: np.ndarray, w: np.ndarray) -> list[np.ndarray]:
         Raises
         -----------------
         - MinSizeException: if the array associaed with the main diagonal has less than two elements.
-        - RelativeSizeException: if either one of the two off diagonal has a number of element different from the number of elements in the main diagonal minus one.
+        - RelativeSizeException: if either one of the two off diagonal has a number of element different from the number of elements in the main diagonal minus one,
+          or if stacked diagonals do not describe the same number of matrices.
         - ZeroDivisionError: when division by 0 is met during the algorithm.
     """
 
-    if len(u) < 2:
+    v, u, w = np.asarray(v), np.asarray(u), np.asarray(w)
+
+    if u.shape[-1] < 2:
         raise MinSizeException("main diagonal has less than 2 elements.")
-    if len(u) != len(v) + 1:
+    if u.shape[-1] != v.shape[-1] + 1:
         raise RelativeSizeException("Diagonal and lower diagonal arrays do not have the correct relative size.")
-    if len(u) != len(w) + 1:
+    if u.shape[-1] != w.shape[-1] + 1:
         raise RelativeSizeException("Diagonal and upper diagonal arrays do not have proper relative size.")
+    if not u.shape[:-1] == v.shape[:-1] == w.shape[:-1]:
+        raise RelativeSizeException("Diagonal arrays do not stack the same number of matrices.")
 
-    pars = np.array([u[1:], v, w], dtype = np.float64)
+    # stacked matrices are transposed so that each step of the recurrence works on all of them at once
+    pars = np.array([u[..., 1:].T, v.T, w.T], dtype = dtype)
     
     # manually compute first element
-    pars[0, 0] = pars[0, 0] * u[0] - pars[1, 0] * pars[2, 0] 
+    pars[0, 0] = pars[0, 0] * u[..., 0] - pars[1, 0] * pars[2, 0] 
     
     # scaled coefficeints, il primo ed il terzo elemento della prima colonna 
     # per il primo coefficiente della colonna precedente
-    if not u[0] == 0:
-        pars[::2, 0] = pars[::2, 0] / u[0]
+    if np.all(u[..., 0] != 0):
+        pars[::2, 0] = pars[::2, 0] / u[..., 0]
     else:
         raise ZeroDivisionError
     
-    for i in range(1, len(u) - 1):
+    for i in range(1, u.shape[-1] - 1):
         pars[0, i] = pars[0, i] * pars[0, i - 1] - pars[1, i] * pars[2, i]
         
-        if not pars[0, i - 1] == 0:
+        if np.all(pars[0, i - 1] != 0):
             pars[::2, i] = pars[::2, i] / pars[0, i - 1]
         else:
             raise ZeroDivisionError
 
 
-    return [pars[1], np.concatenate((u[:1], pars[0])), pars[2]]
\ No newline at end of file
+    return [pars[1].T, np.concatenate((u[..., :1].astype(dtype), pars[0].T), axis = -1), pars[2].T]
+
+def lu5(e: np.ndarray, v: np.ndarray, u: np.ndarray, w: np.ndarray, f: np.ndarray) -> list[np.ndarray]:
+    """
+    Lower-Upper Matrix Factorization algorithm for pentadiagonal matrices, without pivoting.
+    L has a unit diagonal and two lower diagonals, U the main diagonal and two upper diagonals;
+    the second upper diagonal of U is the one of the matrix. Arrays of shape (m, n) are treated as
+    m independent matrices, factorized together.
+
+        Parameters
+        -----------------
+        e : np.array
+            Second lower diagonal numbers.
+        v : np.array
+            Lower diagonal numbers.
+        u : np.array
+            Main diagonal numbers.
+        w : np.array
+            Upper diagonal numbers.
+        f : np.array
+            Second upper diagonal numbers.
+
+        Returns
+        -----------------
+        list
+            Returns a list of numpy arrays. The order is L-second lower diagonal, L-lower diagonal,
+            U-diagonal, U-upper diagonal and U-second upper diagonal elements.
+
+        Raises
+        -----------------
+        - MinSizeException: if the array associaed with the main diagonal has less than three elements.
+        - RelativeSizeException: if the off diagonals do not have one, or two, elements less than the main diagonal,
+          or if stacked diagonals do not describe the same number of matrices.
+        - ZeroDivisionError: when division by 0 is met during the algorithm.
+    """
+
+    e, v, u, w, f = (np.asarray(a, dtype = np.float64) for a in (e, v, u, w, f))
+    n = u.shape[-1]
+
+    if n < 3:
+        raise MinSizeException("main diagonal has less than 3 elements.")
+    if v.shape[-1] != n - 1 or w.shape[-1] != n - 1:
+        raise RelativeSizeException("Diagonal and first off diagonal arrays do not have the correct relative size.")
+    if e.shape[-1] != n - 2 or f.shape[-1] != n - 2:
+        raise RelativeSizeException("Diagonal and second off diagonal arrays do not have the correct relative size.")
+    if not u.shape[:-1] == e.shape[:-1] == v.shape[:-1] == w.shape[:-1] == f.shape[:-1]:
+        raise RelativeSizeException("Diagonal arrays do not stack the same number of matrices.")
+
+    l2, l1, alpha, gamma = np.empty_like(e), np.empty_like(v), np.empty_like(u), np.empty_like(w)
+
+    # each row eliminates the two rows above it: stacked matrices are handled along the last axis
+    alpha[..., 0], gamma[..., 0] = u[..., 0], w[..., 0]
+    for i in range(1, n):
+        if not np.all(alpha[..., i - 1] != 0):
+            raise ZeroDivisionError
+        if i > 1:
+            l2[..., i - 2] = e[..., i - 2] / alpha[..., i - 2]
+            l1[..., i - 1] = (v[..., i - 1] - l2[..., i - 2] * gamma[..., i - 2]) / alpha[..., i - 1]
+            alpha[..., i] = u[..., i] - l1[..., i - 1] * gamma[..., i - 1] - l2[..., i - 2] * f[..., i - 2]
+        else:
+            l1[..., 0] = v[..., 0] / alpha[..., 0]
+            alpha[..., 1] = u[..., 1] - l1[..., 0] * gamma[..., 0]
+        if i < n - 1:
+            gamma[..., i] = w[..., i] - l1[..., i - 1] * f[..., i - 1]
+
+    if not np.all(alpha[..., n - 1] != 0):
+        raise ZeroDivisionError
+
+    return [l2, l1, alpha, gamma, f]
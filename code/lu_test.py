@@ -170,4 +170,94 @@ class TestDecompositionLU(unittest.TestCase):
         with self.assertRaises(ZeroDivisionError):
             lu(v, u, w)
 
-unittest.main()
\ No newline at end of file
+class TestStackedDecompositionLU(unittest.TestCase):
+    def test_stacked_matrices(self):
+        """
+            Factorize many independent matrices stacked along the first axis and 
+            check that each factorization coincides with the one of the single matrix.
+        """
+        rng = np.random.default_rng(0)
+        m, n = 20, 8
+        v = rng.uniform(0, 1, (m, n - 1))
+        u = 2 + rng.uniform(0, 1, (m, n))
+        w = rng.uniform(0, 1, (m, n - 1))
+
+        diags = lu(v, u, w)
+        for j in range(m):
+            for stacked, single in zip(diags, lu(v[j], u[j], w[j])):
+                self.assertTrue(np.allclose(stacked[j], single))
+
+    def test_stacked_size(self):
+        """
+            Stacked diagonals must describe the same number of matrices, 
+            otherwise an exception is raised.
+        """
+        v = np.ones((3, 2))
+        u = np.ones((4, 3))
+        w = np.ones((4, 2))
+
+        with self.assertRaises(RelativeSizeException):
+            lu(v, u, w)
+
+    def test_stacked_zero_division(self):
+        """
+            A null pivot in any of the stacked matrices raises a ZeroDivisionError.
+        """
+        v = np.array([[1, 1], [1, -2]])
+        u = np.array([[4, 4, 4], [2, 1, 4]])
+        w = np.array([[1, 1], [2, -1]])
+
+        with self.assertRaises(ZeroDivisionError):
+            lu(v, u, w)
+
+    def test_dtype(self):
+        """
+            The factors are computed in the requested floating point type.
+        """
+        v = np.array([1., 2.])
+        u = np.array([4., 5., 6.])
+        w = np.array([1., 1.])
+
+        for factor, double in zip(lu(v, u, w, dtype = np.float32), lu(v, u, w)):
+            self.assertEqual(factor.dtype, np.float32)
+            self.assertTrue(np.allclose(factor, double, rtol = 1e-6))
+
+class TestPentadiagonalLU(unittest.TestCase):
+    def test_known_factors(self):
+        """
+            The product of the factors gives back the matrix, for single and stacked matrices.
+        """
+        rng = np.random.default_rng(0)
+        n = 7
+        e, v, w, f = rng.random(n - 2), rng.random(n - 1), rng.random(n - 1), rng.random(n - 2)
+        u = 4 + rng.random(n)
+
+        l2, l1, alpha, gamma, ff = lu5(e, v, u, w, f)
+        L = np.eye(n) + np.diag(l1, -1) + np.diag(l2, -2)
+        U = np.diag(alpha) + np.diag(gamma, 1) + np.diag(ff, 2)
+        A = np.diag(u) + np.diag(v, -1) + np.diag(w, 1) + np.diag(e, -2) + np.diag(f, 2)
+        self.assertTrue(np.allclose(L @ U, A))
+
+        stacked = lu5(*(np.stack((a, 2 * a)) for a in (e, v, u, w, f)))
+        for factor, single in zip(stacked, (l2, l1, alpha, gamma, ff)):
+            self.assertTrue(np.allclose(factor[0], single))
+
+    def test_size(self):
+        """
+            Matrices smaller than three, or off diagonals of the wrong size, raise an exception.
+        """
+        with self.assertRaises(MinSizeException):
+            lu5([], [1], [1, 1], [1], [])
+        with self.assertRaises(RelativeSizeException):
+            lu5([1], [1, 1], [1, 1, 1], [1, 1], [1, 1])
+        with self.assertRaises(RelativeSizeException):
+            lu5([1], [1], [1, 1, 1], [1, 1], [1])
+
+    def test_zero_division(self):
+        """
+            A null pivot raises a ZeroDivisionError.
+        """
+        with self.assertRaises(ZeroDivisionError):
+            lu5([1], [1, 1], [1, 1, 1], [1, 1], [1])
+
+unittest.main()
@@ -0,0 +1,205 @@
+"""
+Defines the parallel evaluation and fitting of cubic splines, on threads or on processes sharing memory.
+"""
+
+import copy
+import os
+from concurrent.futures import ProcessPoolExecutor, ThreadPoolExecutor
+from multiprocessing.shared_memory import SharedMemory
+
+import numpy as np
+from spline import CubicSpline
+
+
+def _bounds(size: int, workers: int) -> list[tuple[int, int]]:
+    """
+    Split 'size' items into at most 'workers' contiguous, non-empty and disjoint slices.
+    """
+    edges = np.linspace(0, size, min(workers, size) + 1).astype(int)
+    return list(zip(edges[:-1], edges[1:]))
+
+
+def _share(array: np.ndarray) -> tuple[SharedMemory, np.ndarray]:
+    """
+    Copy an array into a new shared memory block.
+
+    Returns
+    --------------
+    tuple
+        Returns the block and the array backed by it.
+    """
+    block = SharedMemory(create = True, size = max(array.nbytes, 1))
+    shared = np.ndarray(array.shape, dtype = array.dtype, buffer = block.buf)
+    shared[...] = array
+    return block, shared
+
+
+def _eval_slice(spline: CubicSpline, arrays: list[tuple[str, tuple, str]], start: int, stop: int, assume_sorted: bool, extrapolate: str):
+    """
+    Process worker: evaluate the points in [start, stop) of the shared arrays of points into the shared output.
+    'arrays' describes, by name, shape and type, the shared nodes, coefficients, points and output.
+    """
+    # the workers share the resource tracker of the parent, which keeps the ownership of the blocks
+    blocks = [SharedMemory(name = name) for name, _, _ in arrays]
+    try:
+        nodes, coeffs, x, out = (np.ndarray(shape, dtype = dtype, buffer = block.buf) for block, (_, shape, dtype) in zip(blocks, arrays))
+        spline.nodes, spline.coeffs = nodes, coeffs
+        spline.eval_into(x[start:stop], out[start:stop], assume_sorted = assume_sorted, extrapolate = extrapolate)
+    finally:
+        spline.nodes = spline.coeffs = nodes = coeffs = x = out = None
+        for block in blocks:
+            block.close()
+
+
+def eval(spline: CubicSpline, x: np.ndarray, workers: int | None = None, processes: bool = False, assume_sorted: bool = False, extrapolate: str = "raise") -> np.ndarray:
+    """
+    Evaluate a spline over many points, splitting them in contiguous slices evaluated in parallel.
+    Each worker writes its values into a disjoint slice of one preallocated output.
+
+    Threads share the spline and the arrays directly; the numpy kernels of the evaluation release the GIL.
+    Processes get the nodes, the coefficients, the points and the output through shared memory blocks,
+    created for the call and released at its end.
+
+    Parameters
+    --------------
+    spline : CubicSpline
+        Spline to evaluate.
+    x : np.array
+        Set of points at which compute the spline.
+    workers : int, optional
+        Number of workers, the number of cores by default.
+    processes : bool
+        If True the slices are evaluated by a pool of processes, otherwise by a pool of threads.
+    assume_sorted : bool
+        If True the points are trusted to be in increasing order.
+    extrapolate : str
+        Treatment of the points out of the nodes, see 'CubicSpline.eval'.
+
+    Returns
+    --------------
+    np.array
+        Returns the values, with shape x.shape + Y.shape[1:].
+
+    Raises
+    --------------
+    ValueError: same conditions of 'CubicSpline.eval'.
+    """
+    workers = workers or os.cpu_count() or 1
+    x = np.ascontiguousarray(x)
+    channels = spline.coeffs.shape[2:]
+    out = np.empty(x.shape + channels, dtype = spline.coeffs.dtype)
+    if x.size == 0:
+        return out
+
+    xf, yf = x.reshape(-1), out.reshape((-1,) + channels)
+    bounds = _bounds(len(xf), workers)
+
+    if not processes:
+        with ThreadPoolExecutor(len(bounds)) as pool:
+            futures = [pool.submit(spline.eval_into, xf[a:b], yf[a:b], assume_sorted = assume_sorted, extrapolate = extrapolate) for a, b in bounds]
+            for future in futures:
+                future.result()
+        return out
+
+    # only the small attributes are pickled: the arrays reach the workers through shared memory
+    light = copy.copy(spline)
+    light.nodes = light.coeffs = None
+
+    blocks, arrays, shared = [], [], None
+    try:
+        for array in (spline.nodes, spline.coeffs, xf, yf):
+            block, shared = _share(np.ascontiguousarray(array))
+            blocks.append(block)
+            arrays.append((block.name, shared.shape, shared.dtype.str))
+
+        with ProcessPoolExecutor(len(bounds)) as pool:
+            futures = [pool.submit(_eval_slice, light, arrays, a, b, assume_sorted, extrapolate) for a, b in bounds]
+            for future in futures:
+                future.result()
+
+        yf[...] = shared
+    finally:
+        shared = None
+        for block in blocks:
+            block.close()
+            block.unlink()
+
+    return out
+
+
+def _fit_batch(batch: list[tuple[int, np.ndarray, np.ndarray, np.ndarray]], name: str, total: int) -> list[CubicSpline]:
+    """
+    Process worker: fit the splines of a batch, writing their coefficients at the given offsets of the shared
+    packed buffer. The splines are returned without their arrays, which the parent rebinds to the packed ones.
+    """
+    block = SharedMemory(name = name)
+    try:
+        packed = np.ndarray((total,), dtype = np.float64, buffer = block.buf)
+        fitted = []
+        for offset, X, Y, BC in batch:
+            cs = CubicSpline(X, Y, BC)
+            packed[offset:offset + cs.coeffs.size] = cs.coeffs.reshape(-1)
+
+            cs.nodes = cs.coeffs = None
+            fitted.append(cs)
+    finally:
+        packed = None
+        block.close()
+
+    return fitted
+
+
+def fit_many(specs: list[tuple[np.ndarray, np.ndarray, np.ndarray]], workers: int | None = None) -> list[CubicSpline]:
+    """
+    Fit many independent splines on a pool of processes.
+    The coefficients of all the splines are written by the workers into one shared buffer, so that they are not
+    pickled back: the returned splines hold views of a single packed array of coefficients, and one of nodes.
+
+    Parameters
+    --------------
+    specs : list
+        List of (X, Y, BC) tuples, the arguments of each 'CubicSpline'.
+    workers : int, optional
+        Number of processes, the number of cores by default; with a single one the splines are fitted in this process.
+
+    Returns
+    --------------
+    list
+        Returns the fitted splines, in the order of 'specs'.
+
+    Raises
+    --------------
+    Same exceptions of 'CubicSpline', for the first invalid spline met.
+    """
+    workers = workers or os.cpu_count() or 1
+    specs = [(np.asarray(X, dtype = np.float64), np.asarray(Y), np.asarray(BC)) for X, Y, BC in specs]
+
+    # offsets of the nodes and of the coefficients of each spline in the packed arrays
+    nodes = np.concatenate([X for X, _, _ in specs]) if specs else np.empty(0)
+    starts = np.cumsum([0] + [len(X) for X, _, _ in specs])
+    shapes = [(max(len(X) - 1, 0), 4) + Y.shape[1:] for X, Y, _ in specs]
+    offsets = np.cumsum([0] + [int(np.prod(shape)) for shape in shapes])
+    total = int(offsets[-1])
+
+    jobs = [(int(offset), X, Y, BC) for offset, (X, Y, BC) in zip(offsets, specs)]
+    batches = [jobs[a:b] for a, b in _bounds(len(jobs), 4 * workers)]
+
+    block = SharedMemory(create = True, size = max(8 * total, 1))
+    try:
+        if workers == 1:
+            fitted = [cs for batch in batches for cs in _fit_batch(batch, block.name, total)]
+        else:
+            with ProcessPoolExecutor(workers) as pool:
+                futures = [pool.submit(_fit_batch, batch, block.name, total) for batch in batches]
+                fitted = [cs for future in futures for cs in future.result()]
+
+        coeffs = np.ndarray((total,), dtype = np.float64, buffer = block.buf).copy()
+    finally:
+        block.close()
+        block.unlink()
+
+    for cs, a, b, shape, start, stop in zip(fitted, offsets[:-1], offsets[1:], shapes, starts[:-1], starts[1:]):
+        cs.nodes = nodes[start:stop]
+        cs.coeffs = coeffs[a:b].reshape(shape)
+
+    return fitted
@@ -0,0 +1,97 @@
+import unittest
+import numpy as np
+import spline
+import parallel
+
+class TestParallelEval(unittest.TestCase):
+    def setUp(self):
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([[2, 0], [-4, 1], [5, 3], [7, -2], [3, 1]])
+        self.cs = spline.CubicSpline(X, Y, np.array([0, 0]))
+        self.x = np.random.default_rng(0).uniform(1, 10, (50, 20))
+
+    def test_threads(self):
+        """
+            Test that the evaluation on a pool of threads gives the values of a single evaluation.
+        """
+        y = parallel.eval(self.cs, self.x, workers = 4)
+
+        self.assertEqual(y.shape, (50, 20, 2))
+        self.assertTrue(np.allclose(y, self.cs.eval(self.x)))
+
+    def test_processes(self):
+        """
+            Test that the evaluation on a pool of processes sharing memory gives the values of a single evaluation.
+        """
+        y = parallel.eval(self.cs, self.x, workers = 3, processes = True)
+
+        self.assertTrue(np.allclose(y, self.cs.eval(self.x)))
+
+    def test_more_workers_than_points(self):
+        """
+            Test that the points are split in non-empty slices when the workers are more than the points.
+        """
+        x = np.array([1.5, 9.5])
+
+        self.assertTrue(np.allclose(parallel.eval(self.cs, x, workers = 8), self.cs.eval(x)))
+
+    def test_out_of_domain(self):
+        """
+            Test that a point out of the node domain raises an exception from the workers.
+        """
+        x = self.x.copy()
+        x[-1, -1] = 0
+
+        with self.assertRaises(ValueError):
+            parallel.eval(self.cs, x, workers = 2)
+        with self.assertRaises(ValueError):
+            parallel.eval(self.cs, x, workers = 2, processes = True)
+
+class TestFitMany(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        self.specs = []
+        for n in rng.integers(2, 30, 40):
+            X = np.cumsum(rng.uniform(0.1, 1, n))
+            self.specs.append((X, rng.normal(size = n), rng.normal(size = 2)))
+        self.specs.append((np.array([0, 1, 2]), np.array([[0, 1], [1, 0], [4, 2]]), np.array([0, 1])))
+
+    def check(self, fitted):
+        self.assertEqual(len(fitted), len(self.specs))
+        for cs, (X, Y, BC) in zip(fitted, self.specs):
+            single = spline.CubicSpline(X, Y, BC)
+            x = np.linspace(X[0], X[-1], 17)
+            self.assertTrue(np.allclose(cs.coeffs, single.coeffs))
+            self.assertTrue(np.allclose(cs.eval(x), single.eval(x)))
+
+    def test_processes(self):
+        """
+            Test that splines fitted on a pool of processes coincide with the ones fitted one by one.
+        """
+        self.check(parallel.fit_many(self.specs, workers = 3))
+
+    def test_single_process(self):
+        """
+            Test the fit of many splines within this process.
+        """
+        self.check(parallel.fit_many(self.specs, workers = 1))
+
+    def test_packed_coefficients(self):
+        """
+            Test that the coefficients of all the splines are views of a single packed array.
+        """
+        fitted = parallel.fit_many(self.specs, workers = 2)
+        base = fitted[0].coeffs.base
+
+        self.assertTrue(all(cs.coeffs.base is base for cs in fitted))
+
+    def test_invalid_spline(self):
+        """
+            Test that an invalid spline raises its exception.
+        """
+        self.specs[5] = (np.array([1, 0, 2]), np.array([1, 2, 3]), np.array([0, 0]))
+
+        with self.assertRaises(spline.UnorderedSetException):
+            parallel.fit_many(self.specs, workers = 2)
+
+unittest.main()
@@ -12,10 +12,44 @@ class UnorderedSetException(Exception):
     pass
 class BoundaryConditionException(Exception):
     pass
+class FormatException(Exception):
+    pass
+
+import copy
+import struct
+from collections import OrderedDict
+from collections.abc import Iterable, Iterator
 
 import numpy as np
-from lu import lu
-from tls import solver
+from tls import CyclicFactorization, Factorization, pentadiagonal, thomas
+
+# Memory budget, in bytes, of the knots kept by 'prepare'; least recently used knots are dropped first.
+CACHE_BYTES = 64 * 2**20
+
+_cache: OrderedDict = OrderedDict()
+
+# Binary format of 'CubicSpline.save': magic, version, header size, type of the coefficients, number of
+# coefficients per interval, number of channel dimensions, number of nodes, step (nan if not uniform) and,
+# since version 2, type of the boundary conditions, as the types of the two ends separated by a comma since
+# version 3, followed by the channel dimensions; the header is padded to FILE_ALIGN bytes, then the nodes and
+# the coefficients follow as contiguous little-endian blocks.
+FILE_MAGIC = b"CSPLINE\0"
+FILE_VERSION = 3
+FILE_ALIGN = 64
+_header = struct.Struct("<8sII8sIIQd")
+_bc_field = {1: 0, 2: 16, 3: 40} # bytes of the type of the boundary conditions in each version
+
+# Boundary conditions of each end of a spline: first derivative given, second derivative given, second derivative
+# null, or continuous third derivative at the next node; a spline may also be periodic, with no conditions at the ends.
+END_TYPES = ("clamped", "second-derivative", "natural", "not-a-knot")
+BC_TYPES = END_TYPES + ("periodic",)
+
+# Treatments of the points out of the nodes by 'CubicSpline.eval': raise an error, take the value at the nearest end,
+# continue with the tangent line or the polynomial of the end interval, give nan, or wrap around the node domain.
+EXTRAPOLATE = ("raise", "clip", "linear", "cubic", "nan", "periodic")
+
+# Number of points evaluated at a time by 'CubicSpline.eval_into', and by 'CubicSpline.eval' on larger arrays.
+CHUNK = 2**16
 
 class CubicSpline():
     """
@@ -23,26 +57,60 @@ class CubicSpline():
 
     Parameters
     --------------
-    X : np.array
-        Containts x values of spline nodes.
+    X : np.array or PreparedKnots
+        Containts x values of spline nodes, or the nodes already validated and factorized.
     Y : np.array
-        Contains y values of spline nodes.
-    BC : np.array
-        Numpy array of two elements containing first derivatives at first and last node, respectively.
+        Contains y values of spline nodes, with shape (n, ...): trailing dimensions are independent channels
+        sharing the same nodes.
+    BC : np.array, optional
+        Numpy array of two elements containing the values of the boundary conditions at first and last node,
+        respectively. It has shape (2,) or (2, ...), matching the channels of Y.
+    bc_type : str or tuple, optional
+        Type of the boundary conditions, one of 'BC_TYPES', or a pair of 'END_TYPES' for the first and last node.
+    dtype : np.dtype
+        Floating point type of the coefficients and of the values returned by 'eval'.
+    factor_dtype : np.dtype, optional
+        Floating point type of the factorization of the linear system, by default 'dtype'.
     """
 
-    def __init__(self, X: np.ndarray, Y: np.ndarray, BC: np.ndarray):
+    def __init__(self, X: "np.ndarray | PreparedKnots", Y: np.ndarray, BC: np.ndarray | None = None, check: bool = True, uniform: bool | None = None, bc_type: "str | tuple | None" = None,
+                 dtype: type = np.float64, factor_dtype: type | None = None):
         """
         CubicSpline constructor. Intanciate a CubicSpline object, computing all the coefficients.
 
         Parameters
         --------------
-        X : np.array
-            Containts x values of spline nodes.
+        X : np.array or PreparedKnots
+            Containts x values of spline nodes, or the nodes already validated and factorized,
+            in which case none of the work on the nodes is repeated.
         Y : np.array
-            Contains y values of spline nodes.
-        BC : np.array
-            Numpy array of two elements containing first derivatives at first and last node, respectively.
+            Contains y values of spline nodes, with shape (n, ...): trailing dimensions are independent channels
+            sharing the same nodes.
+        BC : np.array, optional
+            Numpy array of two elements containing the values of the boundary conditions at first and last node,
+            respectively: the first derivatives for clamped ends, the second derivatives for 'second-derivative' ones.
+            It has shape (2,), shared by all the channels, or (2, ...), matching the channels of Y.
+            Its values are not used at the other ends: it can be omitted if no end takes a value,
+            and it is not given for periodic splines.
+        check : bool
+            If False the nodes are trusted to be strictly increasing and are not validated.
+        uniform : bool, optional
+            Whether the nodes are evenly spaced, which makes the interval lookup of 'eval' arithmetic.
+            By default it is detected from the nodes.
+        bc_type : str or tuple, optional
+            Type of the boundary conditions, the same at both ends or a pair of types of the first and last node:
+            'clamped', first derivative given by BC; 'second-derivative', second derivative given by BC;
+            'natural', null second derivative; 'not-a-knot', continuous third derivative at the next node,
+            which requires four nodes. A spline is instead 'periodic' if it and its first two derivatives
+            are equal at the ends, which requires Y[0] == Y[-1].
+            By default the type of the prepared knots, or 'clamped'.
+        dtype : np.dtype
+            Floating point type of the coefficients, np.float64 or np.float32. Single precision halves the memory
+            of the spline and the traffic of 'eval', which then returns values of the same type.
+        factor_dtype : np.dtype, optional
+            Floating point type in which the linear system of the slopes is factorized and solved, by default 'dtype'.
+            A float32 spline fitted with np.float64 factors is only rounded when its coefficients are stored.
+            It is not used with prepared knots, which carry their own factorization.
 
         Returns
         ---------------
@@ -58,78 +126,1114 @@ class CubicSpline():
             - more than two boundary conditions are given.
             - x values for nodes are not ordered.
         """
-        if len(X) < 2:
-            raise MinSizeException("Less than two nodes proveided.")
-        if len(X) != len(Y):
-            raise RelativeSizeException("X and Y do not ha same size.")
-        if len(X) != len(np.unique(X)):
-            raise UniqueNodeException("X does not contain unique elements.")
-        if not np.all(np.diff(X) > 0):
-            raise UnorderedSetException("X elements are unordered.")
-        if len(BC) != 2:
-            raise BoundaryConditionException("Exactly two boundary conditions are required.")
+        if isinstance(X, PreparedKnots):
+            knots = X
+            if bc_type is not None and bc_ends(bc_type)[0] != knots.bc_type:
+                raise BoundaryConditionException("Boundary conditions do not match the prepared knots.")
+        else:
+            knots = PreparedKnots(X, check, uniform, bc_type or "clamped", dtype = dtype if factor_dtype is None else factor_dtype)
 
-        self.nodes = X
-        self.size = len(X) - 1
-        self.params = []
+        self.nodes = knots.nodes
+        self.size = knots.size
+        self.step = knots.step
+        self.bc_type = knots.bc_type
+        # coefficients of each interval, from the highest power, in one contiguous block of shape (n - 1, 4, ...)
+        self.coeffs = np.stack(knots.coefficients(Y, BC), axis = 1, dtype = dtype)
 
+    @classmethod
+    def smoothing(cls, X: np.ndarray, Y: np.ndarray, lam: float, weights: np.ndarray | None = None, check: bool = True, dtype: type = np.float64) -> "CubicSpline":
+        """
+        Fit a natural smoothing spline to noisy values: instead of interpolating them it minimizes
+        sum(weights * (Y - s(X))**2) + lam * integral of s''(x)**2 over the nodes.
+        By the algorithm of Reinsch the second derivatives gamma at the inner nodes solve the pentadiagonal system
+        (R + lam * Q^T W^-1 Q) gamma = Q^T Y, in linear time by 'tls.pentadiagonal'; the values of the spline
+        at the nodes are then Y - lam * W^-1 Q gamma.
 
-        dx = np.array([X[i + 1] - X[i] for i in range(self.size)])
-        dy = np.array([Y[i + 1] - Y[i] for i in range(self.size)])
-        
+        Parameters
+        --------------
+        X : np.array
+            Containts x values of spline nodes.
+        Y : np.array
+            Contains the noisy y values at the nodes, with shape (n, ...): trailing dimensions are independent channels.
+        lam : float
+            Penalty of the curvature, not negative: 0 interpolates the values with a natural spline,
+            large values approach the straight line of the weighted least squares.
+        weights : np.array, optional
+            Positive weights of the values, of shape (n,), all equal to one by default.
+        check : bool
+            If False the nodes are trusted to be strictly increasing and are not validated.
+        dtype : np.dtype
+            Floating point type of the coefficients, see the constructor.
 
-        if len(X) == 2:
-            self.params = self.__two_point_spline(dx, dy, BC, Y)
-        else:
-            self.params = self.__multiple_point_spline(dx, dy, BC, Y)
-            
+        Returns
+        ---------------
+        CubicSpline
+            Returns the smoothing spline, with natural ends.
+
+        Raises
+        ---------------
+        - RelativeSizeException: if Y or the weights do not match the nodes.
+        - ValueError: if the penalty is negative or a weight is not positive.
+        Same exceptions of 'PreparedKnots' for invalid nodes.
+        """
+        knots = PreparedKnots(X, check, bc_type = "natural")
+        Y = np.asarray(Y, dtype = np.float64)
+        w = np.ones(len(knots.nodes)) if weights is None else np.asarray(weights, dtype = np.float64)
+        if len(Y) != len(knots.nodes) or w.shape != knots.nodes.shape:
+            raise RelativeSizeException("Y and the weights must match the nodes.")
+        if lam < 0 or np.any(w <= 0):
+            raise ValueError("The penalty must not be negative and the weights must be positive.")
+
+        h = knots.dx.reshape((-1,) + (1,) * (Y.ndim - 1)) # broadcast over the channels
+        gamma = np.zeros_like(Y)
+        if knots.size > 1:
+            # Q has the columns (1 / h[j], -1 / h[j] - 1 / h[j + 1], 1 / h[j + 1]) on the rows j, j + 1, j + 2
+            r, s = 1 / knots.dx, 1 / w
+            q0, q1, q2 = r[:-1], -r[:-1] - r[1:], r[1:]
+            u = (knots.dx[:-1] + knots.dx[1:]) / 3 + lam * (q0**2 * s[:-2] + q1**2 * s[1:-1] + q2**2 * s[2:])
+            v = knots.dx[1:-1] / 6 + lam * (q1[:-1] * q0[1:] * s[1:-2] + q2[:-1] * q1[1:] * s[2:-1])
+            e = lam * q2[:-2] * q0[2:] * s[2:-2]
+            rhs = np.diff(np.diff(Y, axis = 0) / h, axis = 0)
+
+            # the matrix is symmetric; systems too small to be pentadiagonal are tridiagonal or scalar
+            if len(u) > 2:
+                gamma[1:-1] = pentadiagonal(e, v, u, v, e, rhs)
+            elif len(u) == 2:
+                gamma[1:-1] = thomas(v, u, v, rhs)
+            else:
+                gamma[1:-1] = rhs / u[0]
+
+        # Q gamma, the jumps of the slopes of the second derivatives, null beyond the ends
+        jumps = np.diff(np.concatenate((np.zeros_like(Y[:1]), np.diff(gamma, axis = 0) / h, np.zeros_like(Y[:1]))), axis = 0)
+        g = Y - lam * (1 / w).reshape((-1,) + (1,) * (Y.ndim - 1)) * jumps
+
+        cs = cls.__new__(cls)
+        cs.nodes, cs.size, cs.step, cs.bc_type = knots.nodes, knots.size, knots.step, knots.bc_type
+        dg = np.diff(g, axis = 0)
+        a = np.diff(gamma, axis = 0) / (6 * h)
+        b = gamma[:-1] / 2
+        c = dg / h - h * (2 * gamma[:-1] + gamma[1:]) / 6
+        cs.coeffs = np.stack([a, b, c, g[:-1]], axis = 1, dtype = dtype)
+        return cs
+
+    @property
+    def params(self) -> list[np.ndarray]:
+        """
+        List of the coefficients of the cubic polynomials, from the highest power, each of shape (n - 1, ...).
+        They are views of 'coeffs'.
+        """
+        return [self.coeffs[:, p] for p in range(self.coeffs.shape[1])]
+
+    def workspace(self, size: int) -> "Workspace":
+        """
+        Allocate the scratch buffers needed by 'eval' for up to 'size' points at a time.
+
+        Parameters
+        ------------------
+        size : int
+            Maximum number of points evaluated with the buffers.
+
+        Returns
+        ------------------
+        Workspace
+            Returns the buffers, to be passed to 'eval' as 'scratch'.
+        """
+        return Workspace(size, self.coeffs.shape[1:], self.coeffs.dtype)
             
-    def eval(self, x: np.ndarray) -> np.ndarray:
+    def eval(self, x: np.ndarray, assume_sorted: bool = False, out: np.ndarray | None = None, scratch: "Workspace | None" = None, extrapolate: str = "raise") -> np.ndarray:
         """
         Evaluate the spline value at a given x value.
+        The polynomials are computed with the Horner scheme, gathering the four coefficients of each point at once.
+        The points out of the nodes are found from their interval indices, without scanning the points again,
+        and only they are treated as 'extrapolate' asks.
 
         Parameters
         ------------------
         x : np.array
             Set of points at which compute the spline.
+        assume_sorted : bool
+            If True the points are trusted to be in increasing order, and their intervals are found with
+            a single sweep over the nodes instead of a binary search for each point.
+        out : np.array, optional
+            Contiguous array of shape x.shape + Y.shape[1:] where the values are written.
+        scratch : Workspace, optional
+            Buffers from 'workspace' reused for the temporary arrays, so that repeated calls do not allocate them.
+        extrapolate : str
+            Treatment of the points out of the nodes, one of 'EXTRAPOLATE': 'raise' an error; 'clip' to the value
+            at the nearest end; 'linear', along the tangent at the nearest end; 'cubic', with the polynomial of the
+            nearest interval; 'nan'; 'periodic', repeating the spline with the period of the node domain.
         
         Returns
         ------------------
         np.array:
-            Returns the corresponding values.
+            Returns the corresponding values, with shape x.shape + Y.shape[1:].
 
         Raises
         ------------------
         ValueError: if one of the following conditions are met:
-            - the input value is out of the node domain.
+            - the input value is out of the node domain, and 'extrapolate' is 'raise'.
+            - 'extrapolate' is unknown.
+            - 'out' has not the shape of the result, or it is not contiguous.
+            - 'scratch' is smaller than the number of points.
         """
+        if extrapolate not in EXTRAPOLATE:
+            raise ValueError(f"Unknown extrapolation mode '{extrapolate}'.")
 
-        if np.min(x) < self.nodes[0]:
-            raise ValueError
-        if np.max(x) > self.nodes[-1]:
-            raise ValueError
-        
-        k = np.searchsorted(self.nodes, x, 'right') - 1 # get the right interval index
-        k = np.clip(k, 0, len(self.nodes) - 2)          # squeeze the indices in the right range
+        x = np.asarray(x)
+        shape = x.shape
+        channels = self.coeffs.shape[2:]
 
-        dx = x - self.nodes[k]
-        return self.params[0][k] * dx**3 + self.params[1][k] * dx**2 + self.params[2][k] * dx + self.params[3][k]
+        if out is None:
+            out = np.empty(shape + channels, dtype = self.coeffs.dtype)
+        elif out.shape != shape + channels or not out.flags.c_contiguous:
+            raise ValueError("Output array has not the shape of the result or it is not contiguous.")
+        if scratch is None and x.size > CHUNK:
+            # large arrays are evaluated in chunks, so that the temporaries stay in cache
+            return self.eval_into(x, out, assume_sorted = assume_sorted, extrapolate = extrapolate)
 
-        
+        x = np.ravel(x)
+        m = len(x)
+
+        if scratch is None:
+            scratch = Workspace(m, self.coeffs.shape[1:], self.coeffs.dtype)
+        elif scratch.size < m:
+            raise ValueError("Workspace is smaller than the number of points.")
+
+        k = self._interval(x, assume_sorted)
+        low, high = self._outside(x, k, assume_sorted)
+        if len(low) or len(high):
+            if extrapolate == "raise":
+                raise ValueError("Some values are out of the node domain.")
+            if extrapolate == "periodic":
+                outside = np.concatenate((low, high))
+                x = x.astype(np.result_type(x, np.float64)) # a copy, in which integer points are not truncated
+                x[outside] = self.nodes[0] + np.mod(x[outside] - self.nodes[0], self.nodes[-1] - self.nodes[0])
+                k[outside] = self._interval(x[outside])
+                low = high = outside[:0]
+        np.clip(k, 0, self.size - 1, out = k) # squeeze the indices in the right range
+
+        dx = np.take(self.nodes, k, out = scratch.offset[:m])
+        dx = np.subtract(x, dx, out = scratch.local[:m])
+        if extrapolate in ("clip", "linear"):
+            # the polynomials are evaluated at the nearest end
+            dx[low], dx[high] = 0, self.nodes[-1] - self.nodes[-2]
+        dx = dx.reshape((m,) + (1,) * len(channels)) # broadcast over the channels
+        c = np.take(self.coeffs, k, axis = 0, out = scratch.coeffs[:m])
+
+        # Horner scheme: ((a * dx + b) * dx + c) * dx + d
+        y = out.reshape((m,) + channels)
+        y[...] = c[:, 0]
+        for p in range(1, c.shape[1]):
+            y *= dx
+            y += c[:, p]
+
+        if extrapolate == "linear" and (len(low) or len(high)):
+            first, last = self._end_slopes()
+            y[low] += first * (x[low] - self.nodes[0]).reshape((-1,) + (1,) * len(channels))
+            y[high] += last * (x[high] - self.nodes[-1]).reshape((-1,) + (1,) * len(channels))
+        elif extrapolate == "nan":
+            y[low], y[high] = np.nan, np.nan
+
+        return out
+
+    def eval_into(self, x: np.ndarray, out: np.ndarray, chunk: int | None = None, assume_sorted: bool = False, extrapolate: str = "raise") -> np.ndarray:
+        """
+        Evaluate the spline over an array of points, one chunk at a time, writing the values into 'out'.
+        The same scratch buffers are reused for every chunk, so the memory used does not depend on the number
+        of points: 'x' and 'out' can be memory mapped arrays (np.memmap) larger than the available memory.
+
+        Parameters
+        ------------------
+        x : np.array
+            Set of points at which compute the spline.
+        out : np.array
+            Contiguous array of shape x.shape + Y.shape[1:] where the values are written.
+        chunk : int, optional
+            Number of points evaluated at a time, 'CHUNK' by default.
+        assume_sorted : bool
+            If True the points are trusted to be in increasing order.
+        extrapolate : str
+            Treatment of the points out of the nodes, see 'eval'.
+
+        Returns
+        ------------------
+        np.array:
+            Returns 'out'.
+
+        Raises
+        ------------------
+        ValueError: same conditions of 'eval'.
+        """
+        channels = self.coeffs.shape[2:]
+        if out.shape != np.shape(x) + channels or not out.flags.c_contiguous:
+            raise ValueError("Output array has not the shape of the result or it is not contiguous.")
+
+        chunk = chunk or CHUNK
+        x = x.reshape(-1)
+        y = out.reshape((-1,) + channels)
+        scratch = self.workspace(min(chunk, len(x)))
+
+        for start in range(0, len(x), chunk):
+            stop = min(start + chunk, len(x))
+            self.eval(x[start:stop], assume_sorted = assume_sorted, out = y[start:stop], scratch = scratch, extrapolate = extrapolate)
+
+        return out
+
+    def eval_stream(self, chunks: Iterable[np.ndarray], assume_sorted: bool = False, extrapolate: str = "raise") -> Iterator[np.ndarray]:
+        """
+        Evaluate the spline over a stream of chunks of points, e.g. read from files or sockets.
+        The buffers are allocated for the largest chunk met so far and reused for the next ones:
+        each yielded array is overwritten by the following one, copy it to keep it.
+
+        Parameters
+        ------------------
+        chunks : iterable
+            Iterable of arrays of points.
+        assume_sorted : bool
+            If True the points of each chunk are trusted to be in increasing order.
+        extrapolate : str
+            Treatment of the points out of the nodes, see 'eval'.
+
+        Returns
+        ------------------
+        iterator
+            Yields the values of each chunk, with shape chunk.shape + Y.shape[1:].
+
+        Raises
+        ------------------
+        ValueError: same conditions of 'eval'.
+        """
+        channels = self.coeffs.shape[2:]
+        scratch = None
+
+        for x in chunks:
+            x = np.asarray(x)
+            if scratch is None or scratch.size < x.size:
+                scratch = self.workspace(x.size)
+                buffer = np.empty((x.size,) + channels, dtype = self.coeffs.dtype)
+
+            out = buffer[:x.size].reshape(x.shape + channels)
+            yield self.eval(x, assume_sorted = assume_sorted, out = out, scratch = scratch, extrapolate = extrapolate)
+
+    def derivative(self, nu: int = 1) -> "CubicSpline":
+        """
+        Compute the derivative of the spline, as a piecewise polynomial over the same nodes.
+
+        Parameters
+        ------------------
+        nu : int
+            Order of the derivative.
+
+        Returns
+        ------------------
+        CubicSpline
+            Returns the derivative, whose coefficients have nu columns less.
+
+        Raises
+        ------------------
+        ValueError: if nu is negative or not lower than the number of coefficients.
+        """
+        if not 0 <= nu < self.coeffs.shape[1]:
+            raise ValueError("Invalid order of the derivative.")
+
+        coeffs = self.coeffs
+        for _ in range(nu):
+            powers = np.arange(coeffs.shape[1] - 1, 0, -1).reshape((1, -1) + (1,) * (coeffs.ndim - 2))
+            coeffs = coeffs[:, :-1] * powers
+
+        return self._from_coeffs(coeffs)
+
+    def eval_derivative(self, x: np.ndarray, nu: int = 1, **kwargs) -> np.ndarray:
+        """
+        Evaluate the derivative of the spline at the given points.
+
+        Parameters
+        ------------------
+        x : np.array
+            Set of points at which compute the derivative.
+        nu : int
+            Order of the derivative.
+        kwargs
+            Further arguments of 'eval'.
+
+        Returns
+        ------------------
+        np.array:
+            Returns the corresponding values, with shape x.shape + Y.shape[1:].
+        """
+        return self.derivative(nu).eval(x, **kwargs)
+
+    def antiderivative(self) -> "CubicSpline":
+        """
+        Compute the antiderivative of the spline which is null at the first node,
+        as a piecewise polynomial over the same nodes.
+
+        Returns
+        ------------------
+        CubicSpline
+            Returns the antiderivative, whose coefficients have one more column.
+        """
+        powers = np.arange(self.coeffs.shape[1], 0, -1).reshape((1, -1) + (1,) * (self.coeffs.ndim - 2))
+        coeffs = np.zeros((self.size, self.coeffs.shape[1] + 1) + self.coeffs.shape[2:], dtype = self.coeffs.dtype)
+        coeffs[:, :-1] = self.coeffs / powers
+
+        # integral over each whole interval, by the Horner scheme at its end; their prefix sums give the constants
+        h = np.diff(self.nodes).reshape((-1,) + (1,) * (self.coeffs.ndim - 2))
+        total = coeffs[:, 0]
+        for p in range(1, coeffs.shape[1]):
+            total = total * h + coeffs[:, p]
+        coeffs[1:, -1] = np.cumsum(total[:-1], axis = 0)
+
+        return self._from_coeffs(coeffs)
+
+    def integrate(self, a: np.ndarray, b: np.ndarray) -> np.ndarray:
+        """
+        Compute the definite integrals of the spline between a and b.
+
+        Parameters
+        ------------------
+        a : np.array
+            Lower bounds of the integrals.
+        b : np.array
+            Upper bounds of the integrals, broadcastable with 'a'.
+
+        Returns
+        ------------------
+        np.array:
+            Returns the integrals, with shape np.broadcast(a, b).shape + Y.shape[1:].
+
+        Raises
+        ------------------
+        ValueError: if a bound is out of the node domain.
+        """
+        a, b = np.broadcast_arrays(a, b)
+        F = self.antiderivative()
+
+        return F.eval(b) - F.eval(a)
+
+    def extrema(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Compute the smallest and the largest value of the spline over each interval, among the values at its ends
+        and at the roots of the derivative inside it.
+
+        Returns
+        ------------------
+        tuple
+            Returns the minima and the maxima of the intervals, each of shape (n - 1,) + Y.shape[1:].
+
+        Raises
+        ------------------
+        ValueError: if the polynomials have degree higher than three.
+        """
+        P = self.coeffs.shape[1]
+        if P > 4:
+            raise ValueError("Extrema are computed for polynomials up to the third degree.")
+
+        # lower degrees have null leading coefficients
+        a, b, c, d = ([np.zeros_like(self.coeffs[:, 0])] * (4 - P)) + self.params
+        h = np.diff(self.nodes).reshape((-1,) + (1,) * (self.coeffs.ndim - 2))
+        end = ((a * h + b) * h + c) * h + d
+        low, high = np.minimum(d, end), np.maximum(d, end)
+
+        # roots of the derivative 3 a t^2 + 2 b t + c, a single one when a = 0; invalid roots fail the comparisons
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            root = np.sqrt(b * b - 3 * a * c)
+            for t in (np.where(a != 0, (-b - root) / (3 * a), -c / (2 * b)), np.where(a != 0, (-b + root) / (3 * a), np.nan)):
+                inside = (t > 0) & (t < h)
+                value = ((a * t + b) * t + c) * t + d
+                low, high = np.where(inside, np.minimum(low, value), low), np.where(inside, np.maximum(high, value), high)
+
+        return low, high
+
+    def solve(self, y: np.ndarray, tol: float = 1e-12, maxiter: int = 50) -> np.ndarray:
+        """
+        Invert a monotone spline, computing the points at which it takes the given values.
+        Each value is bracketed by a binary search over the maxima of the intervals, see 'extrema', then the
+        polynomial of its interval is solved by Newton steps run on all the values at once; a step leaving
+        the bracket of the root is replaced by a bisection, so that every value converges.
+
+        Parameters
+        ------------------
+        y : np.array
+            Values of the spline.
+        tol : float
+            Newton steps stop when shorter than 'tol' times the width of the interval.
+        maxiter : int
+            Maximum number of steps.
+
+        Returns
+        ------------------
+        np.array:
+            Returns the points, with the shape of y; in flat parts of the spline, any point of the part.
+
+        Raises
+        ------------------
+        ValueError: if one of the following conditions are met:
+            - the spline has more than one channel, or it is not monotone.
+            - a value is out of the range of the spline.
+        """
+        if self.coeffs.ndim != 2:
+            raise ValueError("Only splines of a single channel can be inverted.")
+
+        low, high = self.extrema()
+        left = self.coeffs[:, -1].astype(np.float64)
+        right = np.append(left[1:], np.polyval(self.coeffs[-1], self.nodes[-1] - self.nodes[-2]))
+
+        # a decreasing spline is inverted as the increasing one of the opposite values
+        sign = 1. if right[-1] >= left[0] else -1.
+        left, right = sign * left, sign * right
+        low, high = (low, high) if sign > 0 else (-high, -low)
+        slack = 8 * np.finfo(self.coeffs.dtype).eps * max(np.abs(low).max(), np.abs(high).max())
+        if np.any(low < left - slack) or np.any(high > right + slack):
+            raise ValueError("The spline is not monotone.")
+
+        y = np.asarray(y, dtype = np.float64)
+        shape = y.shape
+        target = sign * y.reshape(-1)
+        if target.size and (target.min() < left[0] or target.max() > right[-1]):
+            raise ValueError("Some values are out of the range of the spline.")
+
+        k = np.minimum(np.searchsorted(high, target), self.size - 1)
+        h = self.nodes[k + 1] - self.nodes[k]
+        roots = np.empty(len(target))
+
+        # first guess from the chord of the interval, then steps on the points not converged yet
+        with np.errstate(divide = 'ignore', invalid = 'ignore'):
+            t = h * (target - left[k]) / (right[k] - left[k])
+        t = np.where(np.isfinite(t), np.clip(t, 0, h), 0)
+        lo, hi, c, index = np.zeros_like(t), h.copy(), sign * self.coeffs[k], np.arange(len(t))
+        for _ in range(maxiter):
+            if not len(index):
+                break
+
+            # Horner scheme of the polynomial and of its derivative together
+            f, df = c[:, 0], np.zeros_like(t)
+            for p in range(1, c.shape[1]):
+                df = df * t + f
+                f = f * t + c[:, p]
+            f -= target
+
+            lo, hi = np.where(f < 0, t, lo), np.where(f > 0, t, hi)
+            with np.errstate(divide = 'ignore', invalid = 'ignore'):
+                step = t - f / df
+            step = np.where((step > lo) & (step < hi), step, (lo + hi) / 2)
+            step = np.where(f == 0, t, step)
+
+            roots[index] = step
+            active = (f != 0) & (np.abs(step - t) > tol * h)
+            index, t, target, lo, hi, c, h = (a[active] for a in (index, step, target, lo, hi, c, h))
+
+        return (self.nodes[k] + roots).reshape(shape)
+
+    def append(self, x: np.ndarray, y: np.ndarray, window: int | None = None, tol: float = 1e-12):
+        """
+        Extend the spline in place with new nodes past the last one, as for a stream of samples.
+        The boundary condition of the last node moves to the new end, with the same value.
+
+        A new node perturbs the slopes of the spline by an amount decaying geometrically away from the end,
+        so only a trailing window of nodes is fitted again, clamped at its left edge to the current slope.
+        The window starts from the length of the decay down to 'tol', see '_window', and is doubled until
+        the change of the slope at its inner edge is within 'tol', relative to the largest slope in the window;
+        the other nodes keep their coefficients. A window covering most of the spline fits it all again.
+        Nodes and coefficients grow in buffers of doubling capacity, so that an append costs no full copy.
+
+        Parameters
+        ------------------
+        x : float or np.array
+            New nodes, strictly increasing and greater than the last node.
+        y : np.array
+            Values at the new nodes, with shape x.shape + Y.shape[1:].
+        window : int, optional
+            If given, the first nodes are dropped to keep at most 'window' of them.
+            The retained pieces are unchanged, their first slope becoming the left boundary condition.
+        tol : float
+            Relative tolerance on the slopes of the nodes which are not fitted again.
+
+        Raises
+        ------------------
+        RelativeSizeException: if the shape of y does not match x and the channels.
+        UnorderedSetException: if the new nodes are not strictly increasing past the last one.
+        ValueError: if the spline is not cubic, is periodic, or the window keeps less than two nodes.
+        """
+        if self.coeffs.shape[1] != 4 or self.bc_type == "periodic":
+            raise ValueError("Only non periodic cubic splines can be extended.")
+        if window is not None and window < 2:
+            raise ValueError("The window must keep at least two nodes.")
+
+        x = np.atleast_1d(np.asarray(x, dtype = np.float64))
+        y = np.asarray(y, dtype = np.float64)
+        channels = self.coeffs.shape[2:]
+        if x.ndim != 1 or y.size != x.size * int(np.prod(channels)):
+            raise RelativeSizeException("Size of new x and y values do not match.")
+        y = y.reshape(x.shape + channels)
+        if not np.all(np.diff(x, prepend = self.nodes[-1]) > 0):
+            raise UnorderedSetException("New nodes must be strictly increasing past the last node.")
+
+        n, k = len(self.nodes), len(x)
+        if k == 0:
+            return
+        value, slope = self._end()
+
+        # grow the trailing window until the slopes before it are not perturbed beyond the tolerance
+        width = _window(tol)
+        while True:
+            lo = n - 1 - width if 2 * width < n - 1 else 0
+            X = np.concatenate((self.nodes[lo:], x))
+            Y = np.concatenate((self.coeffs[lo:, 3], value[None], y))
+            fitted = self._fit_window(X, Y, (self.coeffs[lo, 2], slope), lo == 0, True)
+
+            if lo == 0:
+                break
+            old = self.coeffs[lo + 1, 2] if lo + 1 < n - 1 else slope
+            if np.max(np.abs(fitted[1, 2] - old)) <= tol * np.max(np.abs(fitted[:, 2])):
+                break
+            width *= 2
+
+        nodes, coeffs = self._reserve(n + k)
+        nodes[n:] = x
+        coeffs[lo:] = fitted
+
+        drop = max(len(nodes) - window, 0) if window is not None else 0
+        self.nodes, self.coeffs = nodes[drop:], coeffs[drop:]
+        self._buffers = self._buffers[:2] + (self._buffers[2] + drop, self.nodes, self.coeffs)
+        if drop:
+            # the new first node is clamped to its current slope, so that later fits leave the retained pieces as they are
+            self.bc_type = bc_ends(("clamped", bc_ends(self.bc_type)[1][1]))[0]
+
+        self.size = len(self.nodes) - 1
+        if self.step is not None and not np.all(np.abs(np.diff(X[-k - 1:]) - self.step) <= 1e-9 * self.step):
+            self.step = None
+
+    def update_y(self, index: np.ndarray, value: np.ndarray, tol: float = 1e-12):
+        """
+        Change the values of the spline at some nodes, updating its coefficients in place.
+        Several nodes are changed at once by arrays of indices and values; for a repeated index the last value applies.
+
+        The change of a value perturbs the slopes by an amount decaying geometrically away from its node,
+        so only a window of nodes around each group of close indices is fitted again, clamped at its edges to the
+        current slopes, or keeping the boundary conditions at the ends of the spline. The window starts from
+        the length of the decay down to 'tol', see '_window', and is doubled until the change of the slopes at its
+        inner edges is within 'tol', relative to the largest slope in the window; the other nodes keep their
+        coefficients. A window covering most of the spline fits it all again.
+        Periodic splines are fitted again as a whole when the window reaches an end, the first and last values
+        being changed together.
+
+        Parameters
+        ------------------
+        index : int or np.array
+            Indices of the nodes to change, negative ones counting from the end.
+        value : np.array
+            New values at those nodes, with shape index.shape + Y.shape[1:].
+        tol : float
+            Relative tolerance on the slopes of the nodes which are not fitted again.
+
+        Raises
+        ------------------
+        RelativeSizeException: if the shape of value does not match index and the channels.
+        IndexError: if an index is out of the nodes.
+        ValueError: if the spline is not cubic, or its coefficients are read-only, as those mapped by 'load'.
+        """
+        if self.coeffs.shape[1] != 4:
+            raise ValueError("Only cubic splines can be updated.")
+        if not self.coeffs.flags.writeable:
+            raise ValueError("The coefficients are read-only.")
+
+        n = len(self.nodes)
+        channels = self.coeffs.shape[2:]
+        index = np.atleast_1d(np.asarray(index))
+        value = np.asarray(value, dtype = np.float64)
+        if index.ndim != 1 or value.size != index.size * int(np.prod(channels)):
+            raise RelativeSizeException("Size of indices and values do not match.")
+        if np.any(index < -n) or np.any(index >= n):
+            raise IndexError("Node index out of range.")
+
+        index = index % n
+        order = np.argsort(index, kind = 'stable')
+        index, value = index[order], value.reshape(index.shape + channels)[order]
 
-    def __two_point_spline(self, dx: np.ndarray, dy: np.ndarray, BC: np.ndarray, Y: np.ndarray) -> list[np.ndarray]:
+        # indices closer than the initial window are fitted again together
+        start = _window(tol)
+        groups = np.flatnonzero(np.diff(index) > 2 * start) + 1
+        for idx, val in zip(np.split(index, groups), np.split(value, groups)):
+            width = start
+            while True:
+                lo, hi = max(idx[0] - width, 0), min(idx[-1] + width, n - 1)
+                if 2 * (hi - lo) >= n - 1:
+                    lo, hi = 0, n - 1
+                if self.bc_type == "periodic" and (lo == 0 or hi == n - 1):
+                    lo, hi = 0, n - 1
+                    Y, _ = self._at_nodes(lo, hi)
+                    Y[idx] = val
+                    Y[[0, -1]] = Y[-1] if idx[-1] == n - 1 else Y[0]
+                    fitted = np.stack(PreparedKnots(self.nodes, check = False, uniform = False, bc_type = "periodic").coefficients(Y), axis = 1)
+                    break
+
+                Y, slopes = self._at_nodes(lo, hi)
+                Y[idx - lo] = val
+                fitted = self._fit_window(self.nodes[lo:hi + 1], Y, slopes[[0, -1]], lo == 0, hi == n - 1)
+
+                if lo == 0 and hi == n - 1:
+                    break
+                change = max(np.max(np.abs(fitted[1, 2] - slopes[1])) if lo > 0 else 0,
+                             np.max(np.abs(fitted[-1, 2] - slopes[-2])) if hi < n - 1 else 0)
+                if change <= tol * np.max(np.abs(fitted[:, 2])):
+                    break
+                width *= 2
+
+            self.coeffs[lo:hi] = fitted
+
+    def _fit_window(self, X: np.ndarray, Y: np.ndarray, slopes: np.ndarray, first: bool, last: bool) -> np.ndarray:
+        """
+        Private method fitting the coefficients of a window of nodes. Its edges are clamped to the given slopes,
+        except for the first and last node of the spline, which keep its boundary conditions and their values.
+        """
+        ends = list(bc_ends(self.bc_type)[1])
+        BC = list(slopes)
+        for side, edge in ((0, first), (1, last)):
+            if not edge:
+                ends[side] = "clamped"
+            elif ends[side] == "second-derivative":
+                a, b = self.coeffs[-side, :2]
+                BC[side] = 2 * b + 6 * a * (self.nodes[-1] - self.nodes[-2]) * side
+
+        knots = PreparedKnots(X, check = False, uniform = False, bc_type = tuple(ends))
+        return np.stack(knots.coefficients(Y, np.stack(BC)), axis = 1)
+
+    def _at_nodes(self, lo: int, hi: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Private method computing the values and the slopes of the spline at the nodes from lo to hi, included.
+        """
+        values = np.empty((hi - lo + 1,) + self.coeffs.shape[2:], dtype = np.float64)
+        slopes = np.empty_like(values)
+
+        last = min(hi, self.size - 1)
+        values[:last - lo + 1], slopes[:last - lo + 1] = self.coeffs[lo:last + 1, 3], self.coeffs[lo:last + 1, 2]
+        if hi == self.size:
+            values[-1], slopes[-1] = self._end()
+
+        return values, slopes
+
+    def save(self, path: str):
+        """
+        Write the spline to a binary file: a versioned header, the nodes and the block of coefficients,
+        both contiguous so that 'load' maps them without copies.
+
+        Parameters
+        ------------------
+        path : str
+            Path of the file, overwritten if it exists.
+        """
+        coeffs = np.ascontiguousarray(self.coeffs, dtype = self.coeffs.dtype.newbyteorder('<'))
+        channels = coeffs.shape[2:]
+        step = np.nan if self.step is None else self.step
+
+        bc_type = self.bc_type if isinstance(self.bc_type, str) else ",".join(self.bc_type)
+        size = -(-(_header.size + _bc_field[FILE_VERSION] + 8 * len(channels)) // FILE_ALIGN) * FILE_ALIGN
+        header = _header.pack(FILE_MAGIC, FILE_VERSION, size, coeffs.dtype.str.encode(), coeffs.shape[1], len(channels), len(self.nodes), step)
+        header += bc_type.encode().ljust(_bc_field[FILE_VERSION], b"\0")
+        header += struct.pack(f"<{len(channels)}Q", *channels)
+
+        with open(path, "wb") as file:
+            file.write(header.ljust(size, b"\0"))
+            file.write(np.ascontiguousarray(self.nodes, dtype = '<f8').tobytes())
+            file.write(coeffs.tobytes())
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> "CubicSpline":
+        """
+        Read a spline written by 'save'.
+
+        Parameters
+        ------------------
+        path : str
+            Path of the file.
+        mmap : bool
+            If True the nodes and the coefficients are read-only memory maps of the file, shared through the page
+            cache by all the processes loading it; otherwise they are read into memory.
+
+        Returns
+        ------------------
+        CubicSpline
+            Returns the spline.
+
+        Raises
+        ------------------
+        FormatException: if the file is not a spline of a supported version, or it is truncated.
+        """
+        with open(path, "rb") as file:
+            fixed = file.read(_header.size)
+            if len(fixed) < _header.size or fixed[:len(FILE_MAGIC)] != FILE_MAGIC:
+                raise FormatException("Not a spline file.")
+
+            _, version, size, dtype, columns, ndim, n, step = _header.unpack(fixed)
+            if version not in _bc_field:
+                raise FormatException(f"Unsupported spline file version {version}.")
+            # files of version 1 were written by clamped splines only
+            bc_type = file.read(_bc_field[version]).rstrip(b"\0").decode() or "clamped"
+            bc_type = bc_ends(tuple(bc_type.split(",")) if "," in bc_type else bc_type)[0]
+            channels = struct.unpack(f"<{ndim}Q", file.read(8 * ndim))
+
+            dtype = np.dtype(dtype.rstrip(b"\0").decode())
+            shape = (n - 1, columns) + channels
+            total = size + 8 * n + dtype.itemsize * int(np.prod(shape))
+            file.seek(0, 2)
+            if file.tell() < total:
+                raise FormatException("Truncated spline file.")
+
+            if mmap:
+                nodes = np.memmap(file, dtype = '<f8', mode = 'r', offset = size, shape = (n,))
+                coeffs = np.memmap(file, dtype = dtype, mode = 'r', offset = size + 8 * n, shape = shape)
+            else:
+                file.seek(size)
+                nodes = np.fromfile(file, dtype = '<f8', count = n)
+                coeffs = np.fromfile(file, dtype = dtype, count = int(np.prod(shape))).reshape(shape)
+
+        spline = cls.__new__(cls)
+        spline.nodes, spline.coeffs = nodes, coeffs
+        spline.size = n - 1
+        spline.step = None if np.isnan(step) else step
+        spline.bc_type = bc_type
+        return spline
+
+    def _end(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Private method computing the value and the slope of the spline at the last node.
+        """
+        a, b, c, d = self.coeffs[-1]
+        h = self.nodes[-1] - self.nodes[-2]
+        return ((a * h + b) * h + c) * h + d, (3 * a * h + 2 * b) * h + c
+
+    def _reserve(self, size: int) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Private method returning views of 'size' nodes and 'size - 1' coefficients, starting with the current ones,
+        into buffers owned by the spline. The buffers are reused while they have room, otherwise the current arrays
+        are copied into new ones of double capacity: arrays which the spline does not own are never written.
+        """
+        buffers = getattr(self, "_buffers", None)
+        if buffers is not None and self.nodes is buffers[3] and self.coeffs is buffers[4] and buffers[2] + size <= len(buffers[0]):
+            nodes, coeffs, start = buffers[:3]
+        else:
+            n = len(self.nodes)
+            nodes = np.empty(2 * size, dtype = self.nodes.dtype)
+            coeffs = np.empty((2 * size - 1,) + self.coeffs.shape[1:], dtype = self.coeffs.dtype)
+            nodes[:n], coeffs[:n - 1], start = self.nodes, self.coeffs, 0
+
+        self._buffers = (nodes, coeffs, start)
+        return nodes[start:start + size], coeffs[start:start + size - 1]
+
+    def __getstate__(self) -> dict:
+        """
+        Pickle the spline without the spare capacity of its growth buffers.
+        """
+        state = self.__dict__.copy()
+        state.pop("_buffers", None)
+        return state
+
+    def _from_coeffs(self, coeffs: np.ndarray) -> "CubicSpline":
+        """
+        Private method creating a piecewise polynomial over the same nodes, with the given coefficients.
+        """
+        new = copy.copy(self)
+        new.coeffs = np.ascontiguousarray(coeffs)
+        return new
+
+    def _interval(self, x: np.ndarray, assume_sorted: bool = False) -> np.ndarray:
+        """
+        Private method computing the index of the interval of each point, not squeezed in the valid range:
+        the points before the first node have a negative index, the ones from the last node on an index not lower
+        than the number of intervals, except for sorted points, whose indices are always valid.
+        Evenly spaced nodes are located in constant time, sorted points by a merge with the nodes,
+        otherwise a binary search is used.
+        """
+        if self.step is not None:
+            # bounded in float before the cast, so that infinite and nan points are not cast; nan gets the index of
+            # the binary search, after the last interval
+            k = np.clip(np.floor((x - self.nodes[0]) / self.step), -1, self.size)
+            k = np.where(np.isnan(k), self.size, k).astype(np.intp)
+        elif assume_sorted and np.ndim(x) == 1:
+            # each interior node increments the interval index of all the points from its position onward
+            start = np.searchsorted(x, self.nodes[1:-1], 'left')
+            return np.cumsum(np.bincount(start, minlength = len(x) + 1)[:len(x)])
+        else:
+            k = np.searchsorted(self.nodes, x, 'right') - 1 # get the right interval index
+
+        return k
+
+    def _outside(self, x: np.ndarray, k: np.ndarray, assume_sorted: bool = False) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Private method finding the positions of the points before the first node and after the last one,
+        from their interval indices; sorted points are bounded by two binary searches.
+        """
+        if assume_sorted:
+            # sorting puts nan points last, where they are not above the nodes
+            high = np.arange(np.searchsorted(x, self.nodes[-1], 'right'), len(x))
+            return np.arange(np.searchsorted(x, self.nodes[0], 'left')), high[x[high] > self.nodes[-1]]
+
+        high = np.flatnonzero(k >= self.size)
+        return np.flatnonzero(k < 0), high[x[high] > self.nodes[-1]]
+
+    def _end_slopes(self) -> tuple[np.ndarray, np.ndarray]:
+        """
+        Private method computing the first derivative at the first and last node.
+        """
+        P = self.coeffs.shape[1]
+        if P == 1:
+            return np.zeros_like(self.coeffs[0, 0]), np.zeros_like(self.coeffs[0, 0])
+
+        h = self.nodes[-1] - self.nodes[-2]
+        last = (P - 1) * self.coeffs[-1, 0]
+        for p in range(1, P - 1):
+            last = last * h + (P - 1 - p) * self.coeffs[-1, p]
+        return self.coeffs[0, P - 2], last
+
+
+class Workspace():
+    """
+    Scratch buffers of 'CubicSpline.eval', reused across calls to evaluate many chunks of points
+    within a fixed memory budget.
+
+    Parameters
+    --------------
+    size : int
+        Maximum number of points evaluated with the buffers.
+    shape : tuple
+        Shape of the coefficients of an interval, (4, ...).
+    dtype : np.dtype
+        Type of the coefficients.
+    """
+
+    def __init__(self, size: int, shape: tuple, dtype: np.dtype):
+        self.size = size
+        self.offset = np.empty(size, dtype = np.result_type(dtype, np.float64))
+        # offsets are subtracted in double precision, then rounded once to the type of the coefficients
+        self.local = self.offset if self.offset.dtype == dtype else np.empty(size, dtype = dtype)
+        self.coeffs = np.empty((size,) + tuple(shape), dtype = dtype)
+
+
+class PreparedKnots():
+    """
+    Spline nodes validated once, together with the factorization of the linear system of the spline,
+    which depends on the nodes only. Splines of new y values are then fitted without repeating that work.
+
+    Parameters
+    --------------
+    X : np.array
+        Containts x values of spline nodes.
+    check : bool
+        If False the nodes are trusted to be strictly increasing and are not validated.
+    uniform : bool, optional
+        Whether the nodes are evenly spaced; by default it is detected from the nodes.
+    bc_type : str or tuple
+        Type of the boundary conditions of the splines, one of 'BC_TYPES' or a pair of 'END_TYPES'.
+    dtype : np.dtype
+        Floating point type of the factorization.
+    """
+
+    def __init__(self, X: np.ndarray, check: bool = True, uniform: bool | None = None, bc_type: str | tuple = "clamped", dtype: type = np.float64):
+        """
+        PreparedKnots constructor. Validates the nodes and factorizes the linear system of the spline.
+
+        Parameters
+        --------------
+        X : np.array
+            Containts x values of spline nodes.
+        check : bool
+            If False the nodes are trusted to be strictly increasing and are not validated.
+        uniform : bool, optional
+            Whether the nodes are evenly spaced. By default they are considered so if all the displacements
+            agree within a relative tolerance of 1e-9; if True they are trusted to be.
+        bc_type : str or tuple
+            Type of the boundary conditions of the splines, one of 'BC_TYPES' or a pair of 'END_TYPES'.
+            The conditions at the ends are folded into the first and last equations of the slopes,
+            so that every type is solved by a single tridiagonal system.
+        dtype : np.dtype
+            Floating point type in which the system is factorized and solved, np.float64 or np.float32;
+            the nodes are kept in double precision anyway.
+
+        Raises
+        ---------------
+        - BoundaryConditionException: if the type of the boundary conditions is unknown.
+        - MinSizeException: if the number of nodes is less than two, three for periodic splines,
+          or four for not-a-knot ends.
+        - UniqueNodeException: if the x values of the nodes are not unique.
+        - UnorderedSetException: if x values for nodes are not ordered.
+        """
+        bc_type, ends = bc_ends(bc_type)
+        if len(X) < 2:
+            raise MinSizeException("Less than two nodes proveided.")
+        if bc_type == "periodic" and len(X) < 3:
+            raise MinSizeException("Less than three nodes provided for a periodic spline.")
+        if "not-a-knot" in ends and len(X) < 4:
+            raise MinSizeException("Less than four nodes provided for a not-a-knot end.")
+
+        X = np.asarray(X, dtype = np.float64)
+        self.nodes = X
+        self.size = len(X) - 1
+        self.dx = np.diff(X)
+
+        # strictly increasing nodes are also unique: the sort is paid only to tell the two errors apart
+        if check and not np.all(self.dx > 0):
+            if len(X) != len(np.unique(X)):
+                raise UniqueNodeException("X does not contain unique elements.")
+            raise UnorderedSetException("X elements are unordered.")
+
+        # evenly spaced nodes are located by arithmetic instead of a binary search
+        h = (X[-1] - X[0]) / self.size
+        if uniform is None:
+            uniform = bool(np.all(np.abs(self.dx - h) <= 1e-9 * h))
+        self.step = h if uniform else None
+        self.bc_type, self.ends = bc_type, ends
+        self.dtype = np.dtype(dtype)
+
+        dx = self.dx
+        if bc_type == "periodic":
+            # one slope for each node but the last, the equations of the first and last rows wrapping around
+            dxp = np.roll(dx, 1)
+            self.factorization = CyclicFactorization(dx[1:], 2 * (dxp + dx), dxp[:-1], dx[0], dxp[-1], dtype = dtype)
+            return
+
+        # each end slope is eliminated from the equation of the next node through the row of its condition,
+        # p * s_end + q * s_next = r, which changes the first and last elements of the diagonal
+        self.rows = [self.__end_row(side, ends[side]) for side in (0, 1)]
+        if len(X) == 2:
+            self.factorization = None # the two end rows only, see '__two_point_spline'
+            return
+
+        u = 2 * (dx[:-1] + dx[1:])
+        u[0] -= dx[1] * self.rows[0][1] / self.rows[0][0]
+        u[-1] -= dx[-2] * self.rows[1][1] / self.rows[1][0]
+        if len(X) == 3:
+            self.factorization, self.diagonal = None, u.astype(dtype) # a single unknown slope, see '__multiple_point_spline'
+        else:
+            self.factorization = Factorization(dx[2:], u, dx[:-2], dtype = dtype)
+
+    @property
+    def nbytes(self) -> int:
+        """
+        Memory used by the nodes, their displacements and the factors of the linear system.
+        """
+        factors = [] if self.factorization is None else self.factorization.factors
+        return sum(np.asarray(a).nbytes for a in [self.nodes, self.dx, *factors])
+
+    def fit(self, Y: np.ndarray, BC: np.ndarray | None = None) -> CubicSpline:
+        """
+        Fit a spline of the given y values over the prepared nodes.
+
+        Parameters
+        --------------
+        Y : np.array
+            Contains y values of spline nodes, with shape (n, ...).
+        BC : np.array, optional
+            Numpy array of two elements containing the values of the boundary conditions at first and last node,
+            respectively; see 'CubicSpline'.
+
+        Returns
+        ---------------
+        CubicSpline
+            Returns the fitted spline.
+        """
+        return CubicSpline(self, Y, BC)
+
+    def coefficients(self, Y: np.ndarray, BC: np.ndarray | None = None) -> list[np.ndarray]:
+        """
+        Compute the coefficients of the spline of the given y values over the prepared nodes.
+
+        Parameters
+        --------------
+        Y : np.array
+            Contains y values of spline nodes, with shape (n, ...).
+        BC : np.array, optional
+            Numpy array of two elements containing the values of the boundary conditions at first and last node,
+            respectively; see 'CubicSpline'.
+            It has shape (2,), shared by all the channels, or (2, ...), matching the channels of Y.
+
+        Returns
+        ---------------
+        list
+            Returns the list of parameters of the spline.
+
+        Raises
+        ---------------
+        - RelativeSizeException: if size of X and Y numpy arrays do not match.
+        - BoundaryConditionException: if the boundary conditions are missing while an end takes a value, are not two,
+          or do not match the channels of Y; for periodic splines, if they are given or the first and last values differ.
+        """
+        if len(self.nodes) != len(Y):
+            raise RelativeSizeException("X and Y do not ha same size.")
+
+        Y = np.asarray(Y)
+        if self.bc_type == "periodic":
+            if BC is not None:
+                raise BoundaryConditionException("Periodic splines take no boundary conditions.")
+            if not np.allclose(Y[0], Y[-1]):
+                raise BoundaryConditionException("Periodic splines need equal values at the first and last node.")
+            return self.__periodic_spline(self.dx, np.diff(Y, axis = 0), Y)
+
+        if BC is None:
+            if any(end in ("clamped", "second-derivative") for end in self.ends):
+                raise BoundaryConditionException("Exactly two boundary conditions are required.")
+            BC = np.zeros(2)
+        if len(BC) != 2:
+            raise BoundaryConditionException("Exactly two boundary conditions are required.")
+
+        BC = np.asarray(BC)
+        try:
+            BC = np.broadcast_to(BC.reshape(BC.shape + (1,) * (Y.ndim - BC.ndim)), (2,) + Y.shape[1:])
+        except ValueError:
+            raise BoundaryConditionException("Boundary conditions do not match the channels of Y.")
+
+        dy = np.diff(Y, axis = 0)
+        h = self.dx.reshape((-1,) + (1,) * (dy.ndim - 1)) # broadcast over the channels
+        rows = [(p, q, self.__end_value(side, dy / h, BC[side])) for side, (p, q) in enumerate(self.rows)]
+
+        if self.size == 1:
+            return self.__two_point_spline(h, dy, rows, Y)
+        return self.__multiple_point_spline(h, dy, rows, Y)
+
+    def __end_row(self, side: int, end: str) -> tuple[float, float]:
+        """
+        Private method computing the coefficients p, q of the condition of an end, p * s_end + q * s_next = r,
+        where s_end is the slope at the end node and s_next the one at its neighbour; side is 0 for the first node
+        and 1 for the last one.
+        """
+        if end == "clamped":
+            return 1., 0.
+        if end == "not-a-knot":
+            h0, h1 = (self.dx[0], self.dx[1]) if side == 0 else (self.dx[-1], self.dx[-2])
+            return h1, h0 + h1
+        return 2., 1.
+
+    def __end_value(self, side: int, m: np.ndarray, value: np.ndarray) -> np.ndarray:
+        """
+        Private method computing the known term r of the condition of an end, given the slopes m = dy / dx
+        of the intervals and the value of the condition.
+        """
+        end = self.ends[side]
+        if end == "clamped":
+            return value
+
+        h0, m0 = (self.dx[0], m[0]) if side == 0 else (self.dx[-1], m[-1])
+        if end == "not-a-knot":
+            h1, m1 = (self.dx[1], m[1]) if side == 0 else (self.dx[-2], m[-2])
+            return ((h0 + 2 * (h0 + h1)) * h1 * m0 + h0**2 * m1) / (h0 + h1)
+        if end == "natural":
+            return 3 * m0
+        # second derivative v: 2 * s0 + s1 = 3 * m0 - v * h0 / 2 at the first node, mirrored at the last one
+        return 3 * m0 + (2 * side - 1) * value * h0 / 2
+
+    def __two_point_spline(self, h: np.ndarray, dy: np.ndarray, rows: list[tuple], Y: np.ndarray) -> list[np.ndarray]:
         """
         Private method implementing the spline parameters' computation for the 
-        special case of two point spline.
+        special case of two point spline, whose slopes solve the two conditions of the ends.
         
         Parameters
         --------------
-        dx : np.array
-            Numpy array containing x displacements between consecutive nodes.
+        h : np.array
+            Numpy array containing x displacements between consecutive nodes, broadcast over the channels.
         dy : np.array
             Numpy array containing y displacements between consecutive nodes.
-        BC : np.array
-            Numpy array of two elements containing first derivatives at first and last node, respectively.
+        rows : list
+            Coefficients (p, q, r) of the conditions of first and last node, respectively.
         Y  : np.array
             Numpy array containing y values of spline nodes.
         Returns
@@ -137,30 +1241,60 @@ class CubicSpline():
         CubicSpline
             Returns the list of parameters of the spline.
         """
-        
-        v = 3 * dx**2
-        u = np.array([dx[0]**3, 2 * dx[0]])
-        w = dx**2
+        (p0, q0, r0), (p1, q1, r1) = rows
+        det = p0 * p1 - q0 * q1
+        c = (r0 * p1 - q0 * r1) / det
+        next = (p0 * r1 - q1 * r0) / det
 
-        delta = np.array([dy[0] - BC[0] * dx[0], BC[1] - BC[0]])
+        return self.__hermite(h, dy, c[None], next[None], Y)
 
-        beta, alpha, gamma = lu(v, u, w)
-        sol = solver(beta, alpha, gamma, delta)
-
-        return [sol[:1], sol[1:], BC[:1], Y[:len(dx)]]
-    def __multiple_point_spline(self, dx: np.ndarray, dy: np.ndarray, BC: np.ndarray, Y: np.ndarray) -> list[np.ndarray]:
+    def __multiple_point_spline(self, h: np.ndarray, dy: np.ndarray, rows: list[tuple], Y: np.ndarray) -> list[np.ndarray]:
         """
         Private method implementing the spline parameters' computation for the 
         general case of more than two point spline.
         
+        Parameters
+        --------------
+        h : np.array
+            Numpy array containing x displacements between consecutive nodes, broadcast over the channels.
+        dy : np.array
+            Numpy array containing y displacements between consecutive nodes.
+        rows : list
+            Coefficients (p, q, r) of the conditions of first and last node, respectively.
+        Y  : np.array
+            Numpy array containing y values of spline nodes.
+        Returns
+        ---------------
+        CubicSpline
+            Returns the list of parameters of the spline.
+        """
+        (p0, q0, r0), (p1, q1, r1) = rows
+        delta = 3 * (dy[:-1]/h[:-1] * h[1:] + dy[1:]/h[1:] * h[:-1])
+        delta[0]  = delta[0]  - h[1]  * r0 / p0
+        delta[-1] = delta[-1] - h[-2] * r1 / p1
+
+        if self.factorization is None:
+            sol = delta.astype(self.dtype) / self.diagonal[0] # three nodes: a single unknown slope
+        else:
+            sol = self.factorization.solve(delta)
+
+        # the end slopes from their conditions
+        c = np.concat((((r0 - q0 * sol[0]) / p0)[None], sol))
+        next = np.concat((sol, ((r1 - q1 * sol[-1]) / p1)[None]))
+
+        return self.__hermite(h, dy, c, next, Y)
+
+    def __periodic_spline(self, dx: np.ndarray, dy: np.ndarray, Y: np.ndarray) -> list[np.ndarray]:
+        """
+        Private method implementing the spline parameters' computation for periodic splines,
+        whose slopes solve a cyclic tridiagonal system.
+
         Parameters
         --------------
         dx : np.array
             Numpy array containing x displacements between consecutive nodes.
         dy : np.array
             Numpy array containing y displacements between consecutive nodes.
-        BC : np.array
-            Numpy array of two elements containing first derivatives at first and last node, respectively.
         Y  : np.array
             Numpy array containing y values of spline nodes.
         Returns
@@ -168,25 +1302,93 @@ class CubicSpline():
         CubicSpline
             Returns the list of parameters of the spline.
         """
+        h = dx.reshape((-1,) + (1,) * (dy.ndim - 1))
+        hp, dyp = np.roll(h, 1, axis = 0), np.roll(dy, 1, axis = 0) # displacements of the previous intervals
+        delta = 3 * (dyp/hp * h + dy/h * hp)
 
-        v = dx[2:]
-        w = dx[:-2]
-        u = 2 * (dx[:-1] + dx[1:])
+        c = self.factorization.solve(delta)
+        next = np.roll(c, -1, axis = 0)
 
-        
-        delta = 3 * (dy[:-1]/dx[:-1] * dx[1:] + dy[1:]/dx[1:] * dx[:-1])
-        delta[0]  = delta[0]  - dx[1]  * BC[0]
-        delta[-1] = delta[-1] - dx[-1] * BC[-1]
+        return self.__hermite(h, dy, c, next, Y)
 
-        beta, alpha, gamma = lu(v, u, w)
-        sol = solver(beta, alpha, gamma, delta)
+    def __hermite(self, h: np.ndarray, dy: np.ndarray, c: np.ndarray, next: np.ndarray, Y: np.ndarray) -> list[np.ndarray]:
+        """
+        Private method computing the parameters of the cubic polynomials of the intervals
+        from the values and the slopes at their ends.
+        """
+        a = ((c + next) * h - 2 * dy)/h**3
+        b = (3 * dy - (next + 2 * c) * h)/h**2
+        d = Y[:len(h)]
 
-        
-        c = np.concat((BC[:1], sol))
-        next = np.concat((sol, BC[:-1]))
+        return [a, b, c, d]
 
-        a = ((c + next) * dx - 2 * dy)/dx**3
-        b = (3 * dy - (next + 2 * c) * dx)/dx**2
-        d = Y[:len(dx)]
 
-        return [a, b, c, d]
+def bc_ends(bc_type: "str | tuple") -> tuple["str | tuple", tuple[str, str]]:
+    """
+    Validate a type of boundary conditions, one of 'BC_TYPES' or a pair of 'END_TYPES'.
+
+    Parameters
+    --------------
+    bc_type : str or tuple
+        Type of the boundary conditions.
+
+    Returns
+    --------------
+    tuple
+        Returns its normal form, a single name when the two ends agree, and the types of the two ends.
+
+    Raises
+    --------------
+    BoundaryConditionException: if the type is unknown.
+    """
+    if isinstance(bc_type, str):
+        if bc_type not in BC_TYPES:
+            raise BoundaryConditionException(f"Unknown type of boundary conditions '{bc_type}'.")
+        return bc_type, (bc_type, bc_type)
+
+    if not isinstance(bc_type, (tuple, list)) or len(bc_type) != 2 or any(end not in END_TYPES for end in bc_type):
+        raise BoundaryConditionException(f"Unknown type of boundary conditions '{bc_type}'.")
+    ends = tuple(bc_type)
+    return ends[0] if ends[0] == ends[1] else ends, ends
+
+
+def _window(tol: float) -> int:
+    """
+    Private function estimating the number of nodes over which a change of the slopes of a spline decays
+    below the relative tolerance 'tol': away from the change it shrinks by about 2 - sqrt(3) at each node.
+    """
+    return int(np.ceil(np.log(np.clip(tol, np.finfo(np.float64).tiny, 1.)) / np.log(2 - np.sqrt(3)))) + 2
+
+
+def prepare(X: np.ndarray, bc_type: "str | tuple" = "clamped") -> PreparedKnots:
+    """
+    Prepare the given nodes, reusing the result of a previous call on the same nodes.
+    Prepared knots are kept in a least recently used cache bounded by 'CACHE_BYTES'.
+
+    Parameters
+    --------------
+    X : np.array
+        Containts x values of spline nodes.
+    bc_type : str or tuple
+        Type of the boundary conditions of the splines, one of 'BC_TYPES' or a pair of 'END_TYPES'.
+
+    Returns
+    --------------
+    PreparedKnots
+        Returns the prepared nodes.
+    """
+    X = np.asarray(X)
+    bc_type = bc_ends(bc_type)[0]
+    key = (X.dtype.str, X.shape, hash(X.tobytes()), bc_type)
+
+    knots = _cache.get(key)
+    if knots is not None and np.array_equal(knots.nodes, X):
+        _cache.move_to_end(key)
+        return knots
+
+    knots = PreparedKnots(X.copy(), bc_type = bc_type)
+    _cache[key] = knots
+    while sum(k.nbytes for k in _cache.values()) > CACHE_BYTES and len(_cache) > 1:
+        _cache.popitem(last = False)
+
+    return knots
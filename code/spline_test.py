@@ -1,6 +1,10 @@
+import os
+import tempfile
 import unittest
+import warnings
 import numpy as np
 import spline
+import tls
 
 class TestCubicSpline(unittest.TestCase):
     def test_X_min_size(self):
@@ -49,6 +53,28 @@ class TestCubicSpline(unittest.TestCase):
         with self.assertRaises(spline.UnorderedSetException):
             spline.CubicSpline(X, Y, BC)
 
+    def test_unordered_duplicated_nodes(self):
+        """
+            Test that unordered nodes containing duplicates are reported as not unique.
+        """
+        X = np.array([1, 3, 2, 3])
+        Y = np.array([1, 5, 7, 9])
+        BC = np.array([0, 0])
+
+        with self.assertRaises(spline.UniqueNodeException):
+            spline.CubicSpline(X, Y, BC)
+
+    def test_unchecked_nodes(self):
+        """
+            Test that trusted nodes give the same spline when validation is skipped.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        BC = np.array([0, 0])
+
+        cs = spline.CubicSpline(X, Y, BC, check = False)
+        self.assertTrue(np.allclose(cs.eval(X), Y))
+
     def test_invalid_boundary_condition_size(self):
         """
             Test if the boundary conditions array have correct number of elements.
@@ -176,6 +202,270 @@ class TestCubicSpline(unittest.TestCase):
         a, b, c, d = cs.params
         self.assertAlmostEqual(3 * a[-1] * (X[-1] - X[-2])**2 + 2 * b[-1] * (X[-1] - X[-2]) + c[-1], BC[1])
 
+    def test_right_edge_nonzero_derivative(self):
+        """
+            Test both boundary conditions when they are different from zero and from each other.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        BC = np.array([0.5, -1.5])
+
+        cs = spline.CubicSpline(X, Y, BC)
+        a, b, c, d = cs.params
+        self.assertAlmostEqual(c[0], BC[0])
+        self.assertAlmostEqual(3 * a[-1] * (X[-1] - X[-2])**2 + 2 * b[-1] * (X[-1] - X[-2]) + c[-1], BC[1])
+        self.assertTrue(np.allclose(cs.eval(X), Y))
+
+    def test_three_point_spline(self):
+        """
+            Test the case of three nodes, where the system has a single unknown derivative.
+        """
+        X = np.array([0, 1, 3])
+        Y = (X + 1)**3
+        BC = 3 * (X[::2] + 1)**2
+
+        cs = spline.CubicSpline(X, Y, BC)
+        x = np.linspace(0, 3, 7)
+
+        self.assertTrue(np.allclose(cs.eval(x), (x + 1)**3))
+
+class TestMultiChannel(unittest.TestCase):
+    def setUp(self):
+        self.X = np.array([1, 4, 6, 8, 10])
+        self.Y = np.array([[2, 0], [-4, 1], [5, 3], [7, -2], [3, 1]])
+
+    def test_channels(self):
+        """
+            Test that each channel of a multi-channel spline coincides with the spline of that channel alone.
+        """
+        BC = np.array([[0, 1], [-1, 0]])
+        cs = spline.CubicSpline(self.X, self.Y, BC)
+        x = np.linspace(1, 10, 20)
+
+        self.assertEqual(cs.eval(x).shape, (20, 2))
+        for j in range(2):
+            single = spline.CubicSpline(self.X, self.Y[:, j], BC[:, j])
+            self.assertTrue(np.allclose(cs.eval(x)[:, j], single.eval(x)))
+            self.assertTrue(np.allclose(cs.params[0][:, j], single.params[0]))
+
+    def test_shared_boundary_conditions(self):
+        """
+            Test that two boundary conditions are shared by all the channels.
+        """
+        cs = spline.CubicSpline(self.X, self.Y, np.array([0, 0]))
+
+        self.assertEqual(cs.params[2].shape, (4, 2))
+        self.assertTrue(np.allclose(cs.eval(self.X), self.Y))
+        self.assertTrue(np.allclose(cs.eval(4.), self.Y[1]))
+
+    def test_invalid_boundary_conditions(self):
+        """
+            Test that boundary conditions not matching the channels raise an exception.
+        """
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(self.X, self.Y, np.zeros((2, 3)))
+
+class TestPreparedKnots(unittest.TestCase):
+    def setUp(self):
+        self.X = np.array([1, 4, 6, 8, 10])
+        self.Y = np.array([2, -4, 5, 7, 3])
+        self.BC = np.array([0.5, -1])
+
+    def tearDown(self):
+        spline._cache.clear()
+
+    def test_fit(self):
+        """
+            Test that a spline fitted from prepared knots coincides with the one built from the nodes.
+        """
+        knots = spline.PreparedKnots(self.X)
+        x = np.linspace(1, 10, 20)
+
+        for Y in (self.Y, -self.Y, self.Y**2):
+            self.assertTrue(np.allclose(knots.fit(Y, self.BC).eval(x), spline.CubicSpline(self.X, Y, self.BC).eval(x)))
+
+    def test_two_and_three_nodes(self):
+        """
+            Test the special cases of two and three nodes.
+        """
+        for n in (2, 3):
+            knots = spline.PreparedKnots(self.X[:n])
+            cs = spline.CubicSpline(self.X[:n], self.Y[:n], self.BC)
+            self.assertTrue(np.allclose(knots.fit(self.Y[:n], self.BC).eval(self.X[:n]), cs.eval(self.X[:n])))
+
+    def test_invalid_nodes(self):
+        """
+            Test that the nodes are validated when they are prepared.
+        """
+        with self.assertRaises(spline.UnorderedSetException):
+            spline.PreparedKnots(np.array([1, 4, 3, 5]))
+        with self.assertRaises(spline.UniqueNodeException):
+            spline.prepare(np.array([1, 3, 3, 5]))
+
+    def test_invalid_values(self):
+        """
+            Test that y values and boundary conditions are checked against the prepared nodes.
+        """
+        knots = spline.PreparedKnots(self.X)
+
+        with self.assertRaises(spline.RelativeSizeException):
+            knots.fit(self.Y[1:], self.BC)
+        with self.assertRaises(spline.BoundaryConditionException):
+            knots.fit(self.Y, self.BC[:1])
+
+    def test_cache(self):
+        """
+            Test that preparing equal nodes twice returns the same object, 
+            while different nodes are prepared again.
+        """
+        knots = spline.prepare(self.X)
+
+        self.assertIs(spline.prepare(self.X.copy()), knots)
+        self.assertIsNot(spline.prepare(self.X + 1), knots)
+
+    def test_cache_memory(self):
+        """
+            Test that the least recently used knots are dropped when the cache exceeds its memory budget.
+        """
+        budget = spline.CACHE_BYTES
+        try:
+            first = spline.prepare(self.X)
+            spline.CACHE_BYTES = 2 * first.nbytes
+            spline.prepare(self.X + 1)
+            spline.prepare(self.X + 2)
+
+            self.assertEqual(len(spline._cache), 2)
+            self.assertIsNot(spline.prepare(self.X), first)
+        finally:
+            spline.CACHE_BYTES = budget
+
+class TestCalculus(unittest.TestCase):
+    def setUp(self):
+        # underlying cubic polynomial, reproduced exactly by the spline
+        self.X = np.array([-1, 0, 0.5, 2, 3])
+        self.Y = (self.X + 1)**3
+        self.BC = 3 * (self.X[[0, -1]] + 1)**2
+        self.cs = spline.CubicSpline(self.X, self.Y, self.BC)
+        self.x = np.linspace(-1, 3, 41)
+
+    def test_first_derivative(self):
+        """
+            Test the first derivative against the one of the underlying cubic polynomial.
+        """
+        self.assertTrue(np.allclose(self.cs.eval_derivative(self.x), 3 * (self.x + 1)**2))
+
+    def test_second_derivative(self):
+        """
+            Test the second derivative against the one of the underlying cubic polynomial.
+        """
+        self.assertTrue(np.allclose(self.cs.eval_derivative(self.x, 2), 6 * (self.x + 1)))
+
+    def test_invalid_order(self):
+        """
+            Test that derivatives of order higher than the polynomial degree raise an exception.
+        """
+        with self.assertRaises(ValueError):
+            self.cs.derivative(4)
+
+    def test_antiderivative(self):
+        """
+            Test that the antiderivative is null at the first node and its derivative is the spline.
+        """
+        F = self.cs.antiderivative()
+
+        self.assertTrue(np.allclose(F.eval(self.x), (self.x + 1)**4 / 4))
+        self.assertTrue(np.allclose(F.eval_derivative(self.x), self.cs.eval(self.x)))
+
+    def test_integrate(self):
+        """
+            Test many definite integrals at once, including reversed and empty ones.
+        """
+        a = np.array([-1, 0.2, 2, 1])
+        b = np.array([3, 2.7, 2, -0.5])
+
+        self.assertTrue(np.allclose(self.cs.integrate(a, b), ((b + 1)**4 - (a + 1)**4) / 4))
+
+    def test_integrate_channels(self):
+        """
+            Test that the integrals of a multi-channel spline are computed channel by channel.
+        """
+        cs = spline.CubicSpline(self.X, np.column_stack((self.Y, 2 * self.Y)), np.column_stack((self.BC, 2 * self.BC)))
+
+        self.assertTrue(np.allclose(cs.integrate(-1, 3), [64, 128]))
+
+    def test_integrate_out_of_domain(self):
+        """
+            Test that bounds out of the node domain raise an exception.
+        """
+        with self.assertRaises(ValueError):
+            self.cs.integrate(-2, 0)
+
+class TestChunkedEval(unittest.TestCase):
+    def setUp(self):
+        self.X = np.array([1, 4, 6, 8, 10])
+        self.Y = np.array([[2, 0], [-4, 1], [5, 3], [7, -2], [3, 1]])
+        self.cs = spline.CubicSpline(self.X, self.Y, np.array([0, 0]))
+        self.x = np.random.default_rng(0).uniform(1, 10, 1000)
+
+    def test_eval_into(self):
+        """
+            Test that the chunked evaluation gives the values of a single evaluation.
+        """
+        out = np.empty((1000, 2))
+        y = self.cs.eval_into(self.x, out, chunk = 64)
+
+        self.assertIs(y, out)
+        self.assertTrue(np.allclose(out, self.cs.eval(self.x)))
+
+    def test_memory_mapped_arrays(self):
+        """
+            Test the chunked evaluation reading the points from, and writing the values to, memory mapped files.
+        """
+        with tempfile.TemporaryDirectory() as folder:
+            x = np.memmap(os.path.join(folder, "x.dat"), dtype = np.float64, mode = "w+", shape = (1000,))
+            x[:] = self.x
+            out = np.memmap(os.path.join(folder, "y.dat"), dtype = np.float64, mode = "w+", shape = (1000, 2))
+
+            self.cs.eval_into(x, out, chunk = 100)
+            out.flush()
+            y = np.fromfile(os.path.join(folder, "y.dat")).reshape(1000, 2)
+            del x, out
+
+        self.assertTrue(np.allclose(y, self.cs.eval(self.x)))
+
+    def test_stream(self):
+        """
+            Test the evaluation of a stream of chunks with different sizes.
+        """
+        chunks = np.split(self.x, [10, 300, 310, 800])
+        for chunk, y in zip(chunks, self.cs.eval_stream(iter(chunks))):
+            self.assertEqual(y.shape, (len(chunk), 2))
+            self.assertTrue(np.allclose(y, self.cs.eval(chunk)))
+
+    def test_large_eval(self):
+        """
+            Test that arrays larger than a chunk are evaluated in chunks with the same result.
+        """
+        chunk = spline.CHUNK
+        try:
+            spline.CHUNK = 64
+            y = self.cs.eval(self.x.reshape(10, 100))
+        finally:
+            spline.CHUNK = chunk
+
+        self.assertEqual(y.shape, (10, 100, 2))
+        self.assertTrue(np.allclose(y.reshape(1000, 2), self.cs.eval(self.x)))
+
+    def test_out_of_domain_chunk(self):
+        """
+            Test that a point out of the node domain in any chunk raises an exception.
+        """
+        x = self.x.copy()
+        x[-1] = 11
+
+        with self.assertRaises(ValueError):
+            self.cs.eval_into(x, np.empty((1000, 2)), chunk = 64)
+
 class TestEvalFunction(unittest.TestCase):
     def test_invalid_lower_input(self):
         """
@@ -219,6 +509,98 @@ class TestEvalFunction(unittest.TestCase):
 
         self.assertTrue(np.allclose(cs.eval(X), Y))
 
+    def test_uniform_nodes(self):
+        """
+            Test that evenly spaced nodes are detected and evaluated as with the binary search.
+        """
+        X = np.linspace(0, 3, 31)
+        Y = np.sin(X)
+        BC = np.array([1, np.cos(3)])
+        x = np.concatenate((X, np.linspace(0, 3, 1001)))
+
+        cs = spline.CubicSpline(X, Y, BC)
+        searched = spline.CubicSpline(X, Y, BC, uniform = False)
+
+        self.assertIsNotNone(cs.step)
+        self.assertIsNone(searched.step)
+        self.assertTrue(np.allclose(cs.eval(x), searched.eval(x)))
+        self.assertTrue(np.allclose(cs.eval(X), Y))
+
+    def test_non_uniform_nodes(self):
+        """
+            Test that unevenly spaced nodes are not treated as uniform.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        BC = np.array([0, 0])
+
+        self.assertIsNone(spline.CubicSpline(X, Y, BC).step)
+
+    def test_sorted_points(self):
+        """
+            Test that sorted points, including repeated ones and the nodes themselves,
+            are evaluated as with the binary search.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        BC = np.array([0, 0])
+        x = np.sort(np.concatenate((X, X, np.linspace(1, 10, 101))))
+
+        cs = spline.CubicSpline(X, Y, BC)
+
+        self.assertTrue(np.allclose(cs.eval(x, assume_sorted = True), cs.eval(x)))
+        self.assertTrue(np.allclose(cs.eval(X, assume_sorted = True), Y))
+        self.assertTrue(np.allclose(cs.eval(np.array([7.]), assume_sorted = True), cs.eval(7.)))
+
+    def test_coefficient_block(self):
+        """
+            Test that the coefficients are stored in one contiguous block, whose columns are the parameters.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        BC = np.array([0, 0])
+
+        cs = spline.CubicSpline(X, Y, BC)
+
+        self.assertEqual(cs.coeffs.shape, (4, 4))
+        self.assertTrue(cs.coeffs.flags.c_contiguous)
+        for p in range(4):
+            self.assertTrue(np.array_equal(cs.params[p], cs.coeffs[:, p]))
+
+    def test_output_array(self):
+        """
+            Test that the values are written in the given output array, reusing the same buffers.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([[2, 0], [-4, 1], [5, 3], [7, -2], [3, 1]])
+        BC = np.array([0, 0])
+        x = np.linspace(1, 10, 30)
+
+        cs = spline.CubicSpline(X, Y, BC)
+        scratch = cs.workspace(10)
+        out = np.empty((10, 2))
+
+        for chunk in x.reshape(3, 10):
+            y = cs.eval(chunk, out = out, scratch = scratch)
+            self.assertIs(y, out)
+            self.assertTrue(np.allclose(out, cs.eval(chunk)))
+
+    def test_invalid_buffers(self):
+        """
+            Test that an output array of the wrong shape or a workspace too small raise an exception.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        BC = np.array([0, 0])
+        x = np.linspace(1, 10, 30)
+
+        cs = spline.CubicSpline(X, Y, BC)
+
+        with self.assertRaises(ValueError):
+            cs.eval(x, out = np.empty(29))
+        with self.assertRaises(ValueError):
+            cs.eval(x, scratch = cs.workspace(29))
+
     def test_single_point(self):
         """
             Test that the eval function computes the spline value correctly using a single value input.
@@ -233,4 +615,743 @@ class TestEvalFunction(unittest.TestCase):
         self.assertTrue(np.allclose(cs.eval(X[1]), Y[1]))
     
 
-unittest.main()
\ No newline at end of file
+class TestAppend(unittest.TestCase):
+    def test_matches_full_fit(self):
+        """
+            Test that appending nodes one at a time gives the spline fitted on all of them,
+            whose right boundary condition is the one of the initial spline.
+        """
+        rng = np.random.default_rng(0)
+        X = np.cumsum(rng.uniform(0.5, 1.5, 200))
+        Y = np.sin(X / 5)
+        BC = np.array([0.1, 0.2])
+
+        full = spline.CubicSpline(X, Y, BC)
+        cs = spline.CubicSpline(X[:10], Y[:10], BC)
+        for x, y in zip(X[10:], Y[10:]):
+            cs.append(x, y)
+
+        self.assertEqual(cs.size, full.size)
+        self.assertTrue(np.allclose(cs.nodes, full.nodes))
+        self.assertTrue(np.allclose(cs.coeffs, full.coeffs, atol = 1e-10))
+
+    def test_many_nodes_and_channels(self):
+        """
+            Test that appending several nodes at once works on multiple channels.
+        """
+        X = np.linspace(0, 10, 41)
+        Y = np.column_stack((np.sin(X), np.cos(X)))
+        BC = np.array([[1, 0], [np.cos(10), -np.sin(10)]])
+
+        full = spline.CubicSpline(X, Y, BC)
+        cs = spline.CubicSpline(X[:5], Y[:5], BC)
+        cs.append(X[5:20], Y[5:20])
+        cs.append(X[20:], Y[20:])
+
+        self.assertIsNotNone(cs.step)
+        self.assertTrue(np.allclose(cs.coeffs, full.coeffs, atol = 1e-10))
+
+    def test_sliding_window(self):
+        """
+            Test that a window keeps the last nodes only, still interpolating them.
+        """
+        X = np.arange(30.)
+        Y = np.sqrt(X)
+        cs = spline.CubicSpline(X[:3], Y[:3], np.array([1, 0]))
+        for x, y in zip(X[3:], Y[3:]):
+            cs.append(x, y, window = 8)
+
+        self.assertEqual(len(cs.nodes), 8)
+        self.assertEqual(cs.size, 7)
+        self.assertTrue(np.allclose(cs.nodes, X[-8:]))
+        self.assertTrue(np.allclose(cs.eval(X[-8:]), Y[-8:]))
+
+    def test_sliding_window_ends(self):
+        """
+            Test that once a window drops nodes the new first node stays clamped to its slope, whatever the condition
+            of the dropped one: later appends keep its value and slope, and fit the retained nodes as a spline
+            clamped there, while the last node keeps its own condition.
+        """
+        X = np.arange(40.)
+        Y = np.sin(X / 3)
+        for bc_type in ("natural", "not-a-knot", ("second-derivative", "natural")):
+            cs = spline.CubicSpline(X[:20], Y[:20], np.zeros(2), bc_type = bc_type)
+            cs.append(X[20:24], Y[20:24], window = 12)
+            first = cs.coeffs[0].copy()
+            for x, y in zip(X[24:], Y[24:]):
+                cs.append(x, y)
+                self.assertTrue(np.array_equal(cs.coeffs[0, 2:], first[2:]), bc_type)
+
+            last = spline.bc_ends(bc_type)[1][1]
+            self.assertEqual(spline.bc_ends(cs.bc_type)[1], ("clamped", last))
+            reference = spline.CubicSpline(X[12:], Y[12:], np.array([first[2], 0]), bc_type = ("clamped", last))
+            self.assertTrue(np.allclose(cs.coeffs, reference.coeffs, rtol = 0, atol = 1e-9), bc_type)
+
+    def test_shared_arrays_untouched(self):
+        """
+            Test that appending to a spline does not write into the arrays of the spline it was derived from.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        BC = np.array([0, 0])
+
+        cs = spline.CubicSpline(X, Y, BC)
+        coeffs = cs.coeffs.copy()
+        other = spline.CubicSpline(X, Y, BC)
+        other.nodes, other.coeffs = cs.nodes, cs.coeffs
+        other.append(12, 1)
+
+        self.assertTrue(np.array_equal(cs.coeffs, coeffs))
+        self.assertEqual(len(cs.nodes), 5)
+
+    def test_invalid_nodes(self):
+        """
+            Test that nodes not past the last one, or values of the wrong size, raise an exception.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        cs = spline.CubicSpline(X, Y, np.array([0, 0]))
+
+        with self.assertRaises(spline.UnorderedSetException):
+            cs.append(10, 1)
+        with self.assertRaises(spline.UnorderedSetException):
+            cs.append([12, 11], [1, 1])
+        with self.assertRaises(spline.RelativeSizeException):
+            cs.append([12, 13], [1])
+        with self.assertRaises(ValueError):
+            cs.derivative().append(12, 1)
+
+
+class TestUpdateY(unittest.TestCase):
+    def test_single_value(self):
+        """
+            Test that changing one value gives the spline fitted on the new values, at the ends too.
+        """
+        rng = np.random.default_rng(0)
+        X = np.cumsum(rng.uniform(0.5, 1.5, 100))
+        Y = np.sin(X / 5)
+        BC = np.array([0.1, 0.2])
+
+        cs = spline.CubicSpline(X, Y, BC)
+        for i in (50, 0, -1):
+            Y[i] = 3
+            cs.update_y(i, 3)
+            self.assertTrue(np.allclose(cs.coeffs, spline.CubicSpline(X, Y, BC).coeffs, atol = 1e-10))
+
+    def test_window_from_tolerance(self):
+        """
+            Test that the refitted window follows the tolerance: a long spline keeps the coefficients
+            far from the change, while a short one is fitted again as a whole.
+        """
+        X = np.arange(1000.)
+        Y = np.sin(X / 7)
+        cs = spline.CubicSpline(X, Y, np.zeros(2))
+        coeffs = cs.coeffs.copy()
+        cs.update_y(500, 2, tol = 1e-12)
+        Y[500] = 2
+
+        width = spline._window(1e-12)
+        changed = np.flatnonzero(np.any(cs.coeffs != coeffs, axis = 1))
+        self.assertTrue(changed.min() >= 500 - width and changed.max() < 500 + width)
+        self.assertTrue(np.allclose(cs.coeffs, spline.CubicSpline(X, Y, np.zeros(2)).coeffs, rtol = 0, atol = 1e-10))
+
+        short = spline.CubicSpline(X[:40], Y[:40], np.zeros(2))
+        short.update_y(20, -1)
+        Y[20] = -1
+        self.assertTrue(np.allclose(short.coeffs, spline.CubicSpline(X[:40], Y[:40], np.zeros(2)).coeffs, rtol = 0, atol = 1e-12))
+
+    def test_batch(self):
+        """
+            Test that changing many values at once, near and far from each other, works on multiple channels.
+        """
+        rng = np.random.default_rng(1)
+        X = np.linspace(0, 30, 121)
+        Y = np.column_stack((np.sin(X), np.cos(X)))
+        BC = np.array([[1, 0], [0, 1]])
+        index = np.array([110, 2, 3, 60])
+        value = rng.normal(size = (4, 2))
+
+        cs = spline.CubicSpline(X, Y, BC)
+        cs.update_y(index, value)
+        Y[index] = value
+
+        self.assertTrue(np.allclose(cs.coeffs, spline.CubicSpline(X, Y, BC).coeffs, atol = 1e-10))
+        self.assertTrue(np.allclose(cs.eval(X), Y))
+
+    def test_small_splines(self):
+        """
+            Test the update of splines of two and three nodes.
+        """
+        for X in (np.array([0., 1.]), np.array([0., 1., 3.])):
+            Y = np.ones(len(X))
+            BC = np.array([0, 1])
+            cs = spline.CubicSpline(X, Y, BC)
+            cs.update_y(1, -2)
+            Y[1] = -2
+
+            self.assertTrue(np.allclose(cs.coeffs, spline.CubicSpline(X, Y, BC).coeffs))
+
+    def test_invalid_index(self):
+        """
+            Test that indices out of the nodes, or values of the wrong size, raise an exception.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        cs = spline.CubicSpline(X, Y, np.array([0, 0]))
+
+        with self.assertRaises(IndexError):
+            cs.update_y(5, 1)
+        with self.assertRaises(IndexError):
+            cs.update_y(-6, 1)
+        with self.assertRaises(spline.RelativeSizeException):
+            cs.update_y([1, 2], [1])
+
+
+class TestSaveLoad(unittest.TestCase):
+    def test_round_trip(self):
+        """
+            Test that a saved spline is loaded, mapped or read, with the same nodes, coefficients and step.
+        """
+        X = np.linspace(0, 1, 11)
+        Y = np.column_stack((X**2, np.sin(X)))
+        cs = spline.CubicSpline(X, Y, np.array([[0, 1], [2, np.cos(1)]]))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "spline.bin")
+            cs.save(path)
+
+            for mmap in (True, False):
+                loaded = spline.CubicSpline.load(path, mmap = mmap)
+                self.assertEqual(isinstance(loaded.coeffs, np.memmap), mmap)
+                self.assertTrue(np.array_equal(loaded.nodes, cs.nodes))
+                self.assertTrue(np.array_equal(loaded.coeffs, cs.coeffs))
+                self.assertEqual(loaded.step, cs.step)
+                self.assertEqual(loaded.size, cs.size)
+                self.assertEqual(loaded.bc_type, cs.bc_type)
+                self.assertTrue(np.allclose(loaded.eval(X), Y))
+                loaded = None
+
+    def test_mapped_read_only(self):
+        """
+            Test that a mapped spline cannot be updated in place, but can be extended into its own memory.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        cs = spline.CubicSpline(X, Y, np.array([0, 0]))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "spline.bin")
+            cs.save(path)
+            loaded = spline.CubicSpline.load(path)
+
+            self.assertFalse(loaded.coeffs.flags.writeable)
+            self.assertIsNone(loaded.step)
+            with self.assertRaises(ValueError):
+                loaded.update_y(1, 0)
+
+            loaded.append(12, 1)
+            self.assertTrue(np.allclose(loaded.eval(np.append(X, 12)), np.append(Y, 1)))
+            loaded = None
+
+    def test_mixed_conditions(self):
+        """
+            Test that the types of the boundary conditions of the two ends are saved.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        cs = spline.CubicSpline(X, Y, bc_type = ("not-a-knot", "natural"))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "spline.bin")
+            cs.save(path)
+            loaded = spline.CubicSpline.load(path, mmap = False)
+
+        self.assertEqual(loaded.bc_type, ("not-a-knot", "natural"))
+
+    def test_piecewise_polynomial(self):
+        """
+            Test that derived piecewise polynomials, with a different number of coefficients, are saved too.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        F = spline.CubicSpline(X, Y, np.array([0, 0])).antiderivative()
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "spline.bin")
+            F.save(path)
+            loaded = spline.CubicSpline.load(path, mmap = False)
+
+        self.assertEqual(loaded.coeffs.shape, (4, 5))
+        self.assertTrue(np.allclose(loaded.eval(X), F.eval(X)))
+
+    def test_invalid_file(self):
+        """
+            Test that files which are not splines, or are truncated, raise an exception.
+        """
+        X = np.array([1, 4, 6, 8, 10])
+        Y = np.array([2, -4, 5, 7, 3])
+        cs = spline.CubicSpline(X, Y, np.array([0, 0]))
+
+        with tempfile.TemporaryDirectory() as folder:
+            path = os.path.join(folder, "spline.bin")
+            with open(path, "wb") as file:
+                file.write(b"not a spline")
+            with self.assertRaises(spline.FormatException):
+                spline.CubicSpline.load(path)
+
+            cs.save(path)
+            with open(path, "r+b") as file:
+                file.truncate(os.path.getsize(path) - 8)
+            with self.assertRaises(spline.FormatException):
+                spline.CubicSpline.load(path)
+
+
+class TestPeriodic(unittest.TestCase):
+    def test_continuity_at_the_ends(self):
+        """
+            Test that a periodic spline interpolates the nodes, with the same first and second derivatives at the ends.
+        """
+        rng = np.random.default_rng(0)
+        for n in (3, 4, 12):
+            X = np.sort(rng.uniform(0, 5, n))
+            Y = rng.normal(size = (n, 2))
+            Y[-1] = Y[0]
+
+            cs = spline.CubicSpline(X, Y, bc_type = "periodic")
+            self.assertTrue(np.allclose(cs.eval(X), Y))
+            for nu in (1, 2):
+                ends = cs.eval_derivative(X[[0, -1]], nu = nu)
+                self.assertTrue(np.allclose(ends[0], ends[1]))
+
+    def test_sine(self):
+        """
+            Test that a sampled period of the sine is approximated closely.
+        """
+        X = np.linspace(0, 2 * np.pi, 33)
+        Y = np.sin(X)
+        Y[-1] = Y[0]
+        x = np.linspace(0, 2 * np.pi, 500)
+
+        cs = spline.prepare(X, "periodic").fit(Y)
+        self.assertEqual(cs.bc_type, "periodic")
+        self.assertTrue(np.allclose(cs.eval(x), np.sin(x), atol = 1e-4))
+
+    def test_update_y(self):
+        """
+            Test that changing the value of the first node changes the last one too.
+        """
+        X = np.linspace(0, 1, 20)
+        Y = np.cos(2 * np.pi * X)
+        cs = spline.CubicSpline(X, Y, bc_type = "periodic")
+        cs.update_y([0, 10], [0.5, 2])
+        Y[[0, -1, 10]] = [0.5, 0.5, 2]
+
+        self.assertTrue(np.allclose(cs.coeffs, spline.CubicSpline(X, Y, bc_type = "periodic").coeffs))
+
+    def test_invalid_conditions(self):
+        """
+            Test that boundary conditions given to a periodic spline, different values at the ends,
+            too few nodes and unknown types raise an exception.
+        """
+        X = np.array([0, 1, 2, 3])
+        Y = np.array([1, 2, 0, 1])
+
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(X, Y, np.array([0, 0]), bc_type = "periodic")
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(X, Y + X, bc_type = "periodic")
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(X, Y)
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(X, Y, bc_type = "cyclic")
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(spline.PreparedKnots(X, bc_type = "periodic"), Y, np.array([0, 0]), bc_type = "clamped")
+        with self.assertRaises(spline.MinSizeException):
+            spline.CubicSpline(X[:2], Y[[0, 0]], bc_type = "periodic")
+        with self.assertRaises(ValueError):
+            spline.CubicSpline(X, Y, bc_type = "periodic").append(4, 2)
+
+
+class TestBoundaryConditions(unittest.TestCase):
+    def setUp(self):
+        self.X = np.array([0, 0.5, 1.5, 2, 3.5, 4])
+        self.f = lambda x: x**3 - 2 * x**2 + x - 1
+        self.d1 = lambda x: 3 * x**2 - 4 * x + 1
+        self.d2 = lambda x: 6 * x - 4
+        self.x = np.linspace(0, 4, 100)
+
+    def test_natural(self):
+        """
+            Test that a natural spline interpolates the nodes with null second derivatives at the ends.
+        """
+        Y = self.f(self.X)
+        cs = spline.CubicSpline(self.X, Y, bc_type = "natural")
+
+        self.assertTrue(np.allclose(cs.eval(self.X), Y))
+        self.assertTrue(np.allclose(cs.eval_derivative(self.X[[0, -1]], nu = 2), 0))
+
+    def test_cubic_reproduced(self):
+        """
+            Test that not-a-knot ends, given second derivatives and their mixes reproduce a cubic exactly.
+        """
+        Y = self.f(self.X)
+        ends = self.X[[0, -1]]
+        cases = [("not-a-knot", None),
+                 ("second-derivative", self.d2(ends)),
+                 (("clamped", "second-derivative"), np.array([self.d1(ends[0]), self.d2(ends[1])])),
+                 (("not-a-knot", "clamped"), np.array([0, self.d1(ends[1])]))]
+
+        for bc_type, BC in cases:
+            cs = spline.CubicSpline(self.X, Y, BC, bc_type = bc_type)
+            self.assertTrue(np.allclose(cs.eval(self.x), self.f(self.x)), bc_type)
+
+    def test_mixed_channels(self):
+        """
+            Test that mixed conditions take their values from BC, for each channel.
+        """
+        Y = np.column_stack((self.f(self.X), self.X**2))
+        BC = np.array([[1, -2], [0, 0]])
+        cs = spline.CubicSpline(self.X, Y, BC, bc_type = ("clamped", "natural"))
+
+        self.assertEqual(cs.bc_type, ("clamped", "natural"))
+        self.assertTrue(np.allclose(cs.eval_derivative(self.X[0]), BC[0]))
+        self.assertTrue(np.allclose(cs.eval_derivative(self.X[-1], nu = 2), 0))
+
+    def test_small_splines(self):
+        """
+            Test that natural splines of two nodes are lines, and of three nodes interpolate them.
+        """
+        cs = spline.CubicSpline(np.array([0, 2]), np.array([1, 5]), bc_type = "natural")
+        self.assertTrue(np.allclose(cs.eval(np.array([0.5, 1])), [2, 3]))
+
+        X, Y = np.array([0, 1, 3]), np.array([1, -1, 2])
+        cs = spline.CubicSpline(X, Y, np.array([0.5, 1]), bc_type = "second-derivative")
+        self.assertTrue(np.allclose(cs.eval(X), Y))
+        self.assertTrue(np.allclose(cs.eval_derivative(X[[0, -1]], nu = 2), [0.5, 1]))
+
+    def test_same_types(self):
+        """
+            Test that a pair of equal types is the same type, for prepared knots too.
+        """
+        Y = self.f(self.X)
+        knots = spline.prepare(self.X, ("natural", "natural"))
+
+        self.assertIs(knots, spline.prepare(self.X, "natural"))
+        self.assertEqual(spline.CubicSpline(knots, Y, bc_type = "natural").bc_type, "natural")
+
+    def test_invalid_conditions(self):
+        """
+            Test that missing values, too few nodes for not-a-knot ends and unknown types raise an exception.
+        """
+        Y = self.f(self.X)
+
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(self.X, Y, bc_type = ("natural", "clamped"))
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(self.X, Y, bc_type = ("natural", "periodic"))
+        with self.assertRaises(spline.BoundaryConditionException):
+            spline.CubicSpline(self.X, Y, bc_type = ("natural",))
+        with self.assertRaises(spline.MinSizeException):
+            spline.CubicSpline(self.X[:3], Y[:3], bc_type = ("not-a-knot", "natural"))
+
+
+class TestExtrapolate(unittest.TestCase):
+    def setUp(self):
+        self.X = np.array([0, 1, 2.5, 4])
+        self.Y = np.array([[1, 0], [3, 1], [2, 4], [1, 2]])
+        self.BC = np.array([[1, 0], [-1, 2]])
+        self.cs = spline.CubicSpline(self.X, self.Y, self.BC)
+        self.x = np.array([-1, 0, 2, 4, 5])
+
+    def test_modes(self):
+        """
+            Test the values of the points out of the nodes in each mode, for unsorted and sorted points,
+            while the points inside keep their values.
+        """
+        inside = self.cs.eval(self.x[1:4])
+        first, last = self.cs.coeffs[0], self.cs.coeffs[-1]
+        expected = {
+            "clip": self.Y[[0, -1]],
+            "linear": np.array([self.Y[0] - self.BC[0], self.Y[-1] + self.BC[1]]),
+            "cubic": np.array([[np.polyval(first[:, j], -1) for j in range(2)], [np.polyval(last[:, j], 5 - 2.5) for j in range(2)]]),
+            "nan": np.full((2, 2), np.nan),
+            "periodic": self.cs.eval(np.array([3, 1])),
+        }
+
+        for mode, ends in expected.items():
+            for assume_sorted in (False, True):
+                y = self.cs.eval(self.x, assume_sorted = assume_sorted, extrapolate = mode)
+                self.assertTrue(np.allclose(y[1:4], inside), mode)
+                self.assertTrue(np.allclose(y[[0, -1]], ends, equal_nan = True), mode)
+
+    def test_raise(self):
+        """
+            Test that by default a point out of the nodes raises an exception, as an unknown mode does,
+            while the ends of the domain are valid points.
+        """
+        with self.assertRaises(ValueError):
+            self.cs.eval(self.x)
+        with self.assertRaises(ValueError):
+            self.cs.eval(self.x, assume_sorted = True)
+        with self.assertRaises(ValueError):
+            self.cs.eval(self.x, extrapolate = "mirror")
+
+        self.assertTrue(np.allclose(self.cs.eval(self.X[[0, -1]], extrapolate = "nan"), self.Y[[0, -1]]))
+
+    def test_uniform_nodes(self):
+        """
+            Test the detection of the points out of evenly spaced nodes.
+        """
+        X = np.linspace(0, 3, 4)
+        cs = spline.CubicSpline(X, self.Y, self.BC)
+        y = cs.eval(np.array([-0.5, 3, 3.5]), extrapolate = "nan")
+
+        self.assertIsNotNone(cs.step)
+        self.assertTrue(np.isnan(y[[0, 2]]).all())
+        self.assertTrue(np.allclose(y[1], self.Y[-1]))
+
+    def test_periodic_integer_points(self):
+        """
+            Test that integer points are wrapped into the node domain without being truncated.
+        """
+        cs = spline.CubicSpline(np.array([0, 0.7, 1.5]), np.array([1, 3, 2]), np.zeros(2))
+        for assume_sorted in (False, True):
+            y = cs.eval(np.array([-1, 2, 3]), assume_sorted = assume_sorted, extrapolate = "periodic")
+            self.assertTrue(np.allclose(y, cs.eval(np.array([0.5, 0.5, 0])), rtol = 0, atol = 1e-12))
+
+    def test_nan_points(self):
+        """
+            Test that a nan point gives nan in every mode but 'periodic', in the same way on uniform and
+            non uniform nodes, and that infinite points are out of the nodes on both.
+        """
+        for X in (np.linspace(0, 3, 4), np.array([0, 1, 2.5, 3])):
+            cs = spline.CubicSpline(X, self.Y, self.BC)
+            with warnings.catch_warnings():
+                warnings.simplefilter("error")
+                for mode in ("raise", "clip", "linear", "cubic", "nan"):
+                    y = cs.eval(np.array([np.nan, 1.5]), extrapolate = mode)
+                    self.assertTrue(np.isnan(y[0]).all() and not np.isnan(y[1]).any(), (cs.step, mode))
+                with self.assertRaises(ValueError):
+                    cs.eval(np.array([np.inf]))
+                self.assertTrue(np.allclose(cs.eval(np.array([-np.inf, np.inf]), extrapolate = "clip"), self.Y[[0, -1]]))
+
+    def test_sorted_nan_points(self):
+        """
+            Test that sorted points, with nan points sorted last, give nan for them as unsorted points do.
+        """
+        x = np.sort(np.array([np.nan, 3, -1, 1.5, np.nan]))
+        for X in (np.linspace(0, 3, 4), np.array([0, 1, 2.5, 3])):
+            cs = spline.CubicSpline(X, self.Y, self.BC)
+            for mode in ("raise", "clip", "linear", "cubic", "nan", "periodic"):
+                points = x[1:] if mode == "raise" else x # without the point before the nodes when raising
+                y = cs.eval(points, assume_sorted = True, extrapolate = mode)
+                self.assertTrue(np.isnan(y[-2:]).all(), (cs.step, mode))
+                self.assertTrue(np.allclose(y, cs.eval(points, extrapolate = mode), equal_nan = True), (cs.step, mode))
+
+    def test_chunks(self):
+        """
+            Test that the mode is applied by the chunked evaluation too.
+        """
+        x = np.linspace(-2, 6, 1000)
+        out = np.empty((1000, 2))
+        self.cs.eval_into(x, out, chunk = 64, extrapolate = "clip")
+
+        self.assertTrue(np.allclose(out, self.cs.eval(np.clip(x, 0, 4))))
+
+class TestPrecision(unittest.TestCase):
+    def setUp(self):
+        self.X = np.sort(np.random.default_rng(6).uniform(0, 10, 50))
+        self.Y = np.column_stack((np.sin(self.X), np.cos(self.X)))
+        self.BC = np.array([[np.cos(self.X[0]), -np.sin(self.X[0])], [np.cos(self.X[-1]), -np.sin(self.X[-1])]])
+        self.x = np.linspace(self.X[0], self.X[-1], 1000)
+        self.reference = spline.CubicSpline(self.X, self.Y, self.BC).eval(self.x)
+
+    def test_single_precision(self):
+        """
+            Test that a float32 spline, with single or double precision factors, stores float32 coefficients
+            and evaluates to float32 values close to the double precision spline, for any type of the points.
+        """
+        for factor_dtype in (None, np.float32, np.float64):
+            cs = spline.CubicSpline(self.X, self.Y, self.BC, dtype = np.float32, factor_dtype = factor_dtype)
+            self.assertEqual(cs.coeffs.dtype, np.float32)
+            # the ends are left out of the float32 points, which could round out of the nodes
+            for x, reference in ((self.x, self.reference), (self.x[1:-1].astype(np.float32), self.reference[1:-1])):
+                y = cs.eval(x)
+                self.assertEqual(y.dtype, np.float32)
+                self.assertTrue(np.allclose(y, reference, atol = 1e-5), factor_dtype)
+
+    def test_mixed_precision(self):
+        """
+            Test that double precision factors give the float64 coefficients rounded once.
+        """
+        cs = spline.CubicSpline(self.X, self.Y, self.BC, dtype = np.float32, factor_dtype = np.float64)
+        double = spline.CubicSpline(self.X, self.Y, self.BC)
+
+        self.assertTrue(np.array_equal(cs.coeffs, double.coeffs.astype(np.float32)))
+
+    def test_prepared_knots(self):
+        """
+            Test that prepared knots factorize in their own type, for any boundary condition,
+            and that the spline stores its coefficients in the requested one.
+        """
+        Y = np.sin(2 * np.pi * (self.X - self.X[0]) / (self.X[-1] - self.X[0]))
+        Y[-1] = Y[0]
+        for bc_type in ("natural", "not-a-knot", "periodic"):
+            knots = spline.PreparedKnots(self.X, bc_type = bc_type, dtype = np.float32)
+            cs = spline.CubicSpline(knots, Y, dtype = np.float32)
+            double = spline.CubicSpline(self.X, Y, bc_type = bc_type)
+            self.assertEqual(cs.coeffs.dtype, np.float32)
+            self.assertTrue(np.allclose(cs.eval(self.x), double.eval(self.x), atol = 1e-4), bc_type)
+
+    def test_workspace(self):
+        """
+            Test that a float32 spline evaluates in chunks, into its workspace, and extends in place.
+        """
+        cs = spline.CubicSpline(self.X, self.Y, self.BC, dtype = np.float32)
+        out = np.empty((len(self.x), 2), dtype = np.float32)
+        cs.eval_into(self.x, out, chunk = 64)
+        self.assertTrue(np.allclose(out, self.reference, atol = 1e-5))
+        self.assertTrue(np.array_equal(cs.eval(self.x, scratch = cs.workspace(1000)), out))
+
+        cs.append(self.X[-1] + 1, np.array([0, 0]))
+        self.assertEqual(cs.coeffs.dtype, np.float32)
+        self.assertTrue(np.allclose(cs.eval(self.X[-1] + 1), 0, atol = 1e-6))
+
+class TestSolve(unittest.TestCase):
+    def setUp(self):
+        self.X = np.sort(np.random.default_rng(7).uniform(0, 5, 40))
+        self.Y = np.exp(self.X / 5) + self.X
+        self.BC = 1 + np.exp(self.X[[0, -1]] / 5) / 5
+        self.cs = spline.CubicSpline(self.X, self.Y, self.BC)
+
+    def test_inverse(self):
+        """
+            Test that the solution of many values is mapped back on them by the spline, keeping their shape,
+            for increasing and decreasing splines.
+        """
+        y = np.linspace(self.Y[0], self.Y[-1], 2000).reshape(40, 50)
+        x = self.cs.solve(y)
+        self.assertEqual(x.shape, y.shape)
+        self.assertTrue(np.allclose(self.cs.eval(x), y, rtol = 0, atol = 1e-12))
+
+        decreasing = spline.CubicSpline(self.X, -self.Y, -self.BC)
+        self.assertTrue(np.allclose(decreasing.solve(-y), x, rtol = 0, atol = 1e-12))
+
+    def test_nodes(self):
+        """
+            Test that the values at the nodes give back the nodes, and a scalar gives a scalar.
+        """
+        self.assertTrue(np.allclose(self.cs.solve(self.Y), self.X, rtol = 0, atol = 1e-12))
+        self.assertEqual(np.shape(self.cs.solve(self.Y[3])), ())
+
+    def test_flat(self):
+        """
+            Test that a value of a flat part of the spline gives a point of that part.
+        """
+        cs = spline.CubicSpline(np.arange(5), np.array([0, 1, 1, 1, 2]), bc_type = "natural")
+        cs.coeffs[1:3] = [0, 0, 0, 1] # constant over [1, 3]
+        x = cs.solve(np.array([1, 0.5, 1.5]))
+
+        self.assertTrue(1 <= x[0] <= 3)
+        self.assertTrue(np.allclose(cs.eval(x), [1, 0.5, 1.5]))
+
+    def test_errors(self):
+        """
+            Test that values out of the range, splines which are not monotone or have channels raise a ValueError.
+        """
+        with self.assertRaises(ValueError):
+            self.cs.solve(self.Y[-1] + 1)
+        with self.assertRaises(ValueError):
+            spline.CubicSpline(self.X, np.sin(self.X), np.array([1, 1])).solve(0.5)
+        with self.assertRaises(ValueError):
+            spline.CubicSpline(self.X, np.column_stack((self.Y, self.Y)), np.array([1, 1])).solve(self.Y[1])
+
+    def test_extrema(self):
+        """
+            Test the extrema of the intervals against the spline sampled densely, for cubic and quadratic polynomials.
+        """
+        for cs in (spline.CubicSpline(self.X, np.sin(3 * self.X), np.array([1, -1])), self.cs.derivative()):
+            low, high = cs.extrema()
+            for i in range(cs.size):
+                y = cs.eval(np.linspace(self.X[i], self.X[i + 1], 2001))
+                self.assertTrue(np.isclose(low[i], y.min(), atol = 1e-7) and np.isclose(high[i], y.max(), atol = 1e-7))
+                self.assertTrue(low[i] <= y.min() + 1e-12 and high[i] >= y.max() - 1e-12)
+
+class TestSmoothing(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(8)
+        self.X = np.sort(rng.uniform(0, 10, 60))
+        self.Y = np.sin(self.X) + 0.2 * rng.standard_normal(60)
+        self.weights = rng.uniform(0.5, 2, 60)
+
+    def dense(self, lam):
+        """
+            Values at the nodes of the smoothing spline from a dense solve of the same normal equations.
+        """
+        h = np.diff(self.X)
+        n = len(self.X)
+        Q, R = np.zeros((n, n - 2)), np.zeros((n - 2, n - 2))
+        for j in range(n - 2):
+            Q[j:j + 3, j] = 1 / h[j], -1 / h[j] - 1 / h[j + 1], 1 / h[j + 1]
+            R[j, j] = (h[j] + h[j + 1]) / 3
+            if j < n - 3:
+                R[j, j + 1] = R[j + 1, j] = h[j + 1] / 6
+        gamma = np.linalg.solve(R + lam * Q.T @ np.diag(1 / self.weights) @ Q, Q.T @ self.Y)
+        return self.Y - lam * (Q @ gamma) / self.weights
+
+    def test_known_solution(self):
+        """
+            Test the values at the nodes against a dense solve, with every backend, and that the spline
+            is natural and twice continuously differentiable.
+        """
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            cs = spline.CubicSpline.smoothing(self.X, self.Y, 0.5, self.weights)
+            self.assertTrue(np.allclose(cs.eval(self.X), self.dense(0.5)), name)
+        tls.BACKEND = "auto"
+
+        self.assertEqual(cs.bc_type, "natural")
+        second = cs.derivative(2)
+        self.assertTrue(np.allclose(second.eval(self.X[[0, -1]]), 0))
+        self.assertTrue(np.allclose(second.coeffs[1:, -1], second.eval(self.X[1:-1] - 1e-12), atol = 1e-6))
+
+    def test_limits(self):
+        """
+            Test that a null penalty interpolates with a natural spline, and a large one gives
+            the straight line of the weighted least squares.
+        """
+        interpolant = spline.CubicSpline(self.X, self.Y, bc_type = "natural")
+        self.assertTrue(np.allclose(spline.CubicSpline.smoothing(self.X, self.Y, 0).coeffs, interpolant.coeffs))
+
+        line = np.polyfit(self.X, self.Y, 1, w = np.sqrt(self.weights))
+        cs = spline.CubicSpline.smoothing(self.X, self.Y, 1e12, self.weights)
+        self.assertTrue(np.allclose(cs.eval(self.X), np.polyval(line, self.X), atol = 1e-8))
+
+    def test_channels(self):
+        """
+            Test that the channels are smoothed independently, and that few nodes are handled.
+        """
+        Y = np.column_stack((self.Y, -2 * self.Y))
+        cs = spline.CubicSpline.smoothing(self.X, Y, 0.5, self.weights)
+        self.assertTrue(np.allclose(cs.eval(self.X), np.column_stack((self.dense(0.5), -2 * self.dense(0.5)))))
+
+        for n in (2, 3, 4, 5):
+            cs = spline.CubicSpline.smoothing(self.X[:n], self.Y[:n], 1e12)
+            line = np.polyfit(self.X[:n], self.Y[:n], 1)
+            self.assertTrue(np.allclose(cs.eval(self.X[:n]), np.polyval(line, self.X[:n]), atol = 1e-8), n)
+
+    def test_errors(self):
+        """
+            Test that a negative penalty, non positive weights or values not matching the nodes raise an exception.
+        """
+        with self.assertRaises(ValueError):
+            spline.CubicSpline.smoothing(self.X, self.Y, -1)
+        with self.assertRaises(ValueError):
+            spline.CubicSpline.smoothing(self.X, self.Y, 1, np.zeros(60))
+        with self.assertRaises(spline.RelativeSizeException):
+            spline.CubicSpline.smoothing(self.X, self.Y[1:], 1)
+        with self.assertRaises(spline.RelativeSizeException):
+            spline.CubicSpline.smoothing(self.X, self.Y, 1, self.weights[1:])
+
+
+unittest.main()
@@ -3,22 +3,41 @@ Defines the foreward-backward algorithm to solve tridiagonal linear systems.
 """
 
 import numpy as np
+from lu import lu, lu5
+
+try:
+    import numba
+except ImportError:
+    numba = None
+try:
+    from scipy.linalg import lapack
+except ImportError:
+    lapack = None
 
 class MinSizeException(Exception):
     pass
 class RelativeSizeException(Exception):
     pass
+class BackendException(Exception):
+    pass
+
+# Backend used by 'thomas': one of "auto", "numba", "scipy" or "numpy".
+# "auto" picks the first available one in this order; an unavailable backend falls back to "numpy".
+BACKEND = "auto"
 
-def backward(gamma: np.ndarray, temp: np.ndarray) -> np.ndarray:
+def backward(gamma: np.ndarray, temp: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     """ 
         Backward substitution algorithm using numpy arrays. Specialized algorithm for unitriangular upper matrices with the only non-zero elements in the adjacent off-diagonal elements.
+        If 'gamma' has shape (m, n - 1) it describes m independent systems, whose number vectors are the rows of 'temp', of shape (m, n).
         
         Parameters
         -----------------
         gamma : np.array
             Upper diagonal numbers.
         temp : np.array
-            Number vector.
+            Number vector, or array of shape (n, ...) whose columns are solved together.
+        out : np.array, optional
+            Preallocated array where the solution is written. It can be 'temp' itself.
 
         Returns
         -----------------
@@ -31,21 +50,34 @@ def backward(gamma: np.ndarray, temp: np.ndarray) -> np.ndarray:
         - RelativeSizeException: if the main diagonal and the upper diagonal do not have the correct relative number of elements.
     """
 
-    if len(temp) < 2:
+    batched = np.ndim(gamma) > 1
+    n = np.shape(temp)[-1] if batched else len(temp)
+
+    if n < 2:
         raise MinSizeException("Main diagonal has less than two elements.")
-    if len(temp) != len(gamma) + 1:
+    if n != np.shape(gamma)[-1] + 1:
         raise RelativeSizeException("Main diagonal and upper diagonal do not have the correct relative number of elements.")
+    if batched and np.shape(temp)[:-1] != np.shape(gamma)[:-1]:
+        raise RelativeSizeException("Upper diagonal and number vectors do not stack the same number of systems.")
     
 
-    sol = temp[-1:]
-    for i in range(1, len(temp)):
-        sol = np.concatenate((sol, [temp[len(temp) - 1 - i] - sol[-1] * gamma[len(temp) - 1 - i]]))
+    if out is None:
+        out = np.empty(np.shape(temp), dtype = np.result_type(gamma, temp, np.float64))
+
+    # stacked systems are transposed so that each step of the recurrence works on all of them at once
+    g, t, x = (np.asarray(gamma).T, np.asarray(temp).T, out.T) if batched else (gamma, temp, out)
 
-    return np.flip(sol)
+    # the recurrence only reads temp[i] before writing out[i], so out may alias temp
+    x[n - 1] = t[n - 1]
+    for i in range(n - 2, -1, -1):
+        x[i] = t[i] - x[i + 1] * g[i]
 
-def forward(beta: np.ndarray, alpha: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    return out
+
+def forward(beta: np.ndarray, alpha: np.ndarray, delta: np.ndarray, out: np.ndarray | None = None) -> np.ndarray:
     """ 
         Foreward substitution algorithm using numpy arrays. Specialized algorithm for lower triangula matrices with the only non-zero elements in the main diagonal and its lower djacent off-diagonal.
+        If 'alpha' has shape (m, n) it describes m independent systems, whose number vectors are the rows of 'delta', of shape (m, n).
         
         Parameters
         -----------------
@@ -54,7 +86,9 @@ def forward(beta: np.ndarray, alpha: np.ndarray, delta: np.ndarray) -> np.ndarra
         alpha : np.array
             Diagonal numbers.
         delta : np.array
-            Number vector.
+            Number vector, or array of shape (n, ...) whose columns are solved together.
+        out : np.array, optional
+            Preallocated array where the solution is written.
 
         Returns
         -----------------
@@ -68,25 +102,36 @@ def forward(beta: np.ndarray, alpha: np.ndarray, delta: np.ndarray) -> np.ndarra
         - ValueError: if alpha contains any null value.
     """
 
-    if len(alpha) < 2:
+    batched = np.ndim(alpha) > 1
+    n = np.shape(alpha)[-1]
+
+    if n < 2:
         raise MinSizeException("Main diagonal has less than two elements.")
-    if len(alpha) != len(delta):
+    if batched and np.shape(alpha) != np.shape(delta):
+        raise RelativeSizeException("Main diagonal and known values have different size.")
+    if not batched and n != len(delta):
         raise RelativeSizeException("Main diagonal and known values have different size.")
-    if len(alpha) != len(beta) + 1:
+    if np.shape(alpha) != np.shape(beta)[:-1] + (np.shape(beta)[-1] + 1,):
         raise RelativeSizeException("Main diagonal and lower diagonal do not have the correct relative size.")
-    if len(alpha[alpha == 0]) != 0:
+    if np.any(np.asarray(alpha) == 0):
         raise ValueError("Main diagonal contains one or more null element.")
 
-    temp = np.array([delta[0] / alpha[0]])
-    
-    for i in range(1, len(alpha)):
-        temp = np.concatenate((temp, [(delta[i] - temp[i - 1] * beta[i - 1]) / alpha[i]]))
-        
-    return temp
+    if out is None:
+        out = np.empty(np.shape(delta), dtype = np.result_type(beta, alpha, delta, np.float64))
+
+    # stacked systems are transposed so that each step of the recurrence works on all of them at once
+    b, a, d, x = (np.asarray(beta).T, np.asarray(alpha).T, np.asarray(delta).T, out.T) if batched else (beta, alpha, delta, out)
+
+    x[0] = d[0] / a[0]
+    for i in range(1, n):
+        x[i] = (d[i] - x[i - 1] * b[i - 1]) / a[i]
+
+    return out
 
 def solver(beta: np.ndarray, alpha: np.ndarray, gamma: np.ndarray, delta: np.ndarray) -> np.ndarray:
     """ 
         Foreward substitution algorithm using numpy arrays. Specialized algorithm for tridiagonal linear systems.
+        Diagonals of shape (m, n) describe m independent systems, solved together, whose number vectors are the rows of 'delta'.
         
         Parameters
         -----------------
@@ -97,11 +142,529 @@ def solver(beta: np.ndarray, alpha: np.ndarray, gamma: np.ndarray, delta: np.nda
         gamma : np.array
             Upper diagonal numbers.
         delta : np.array
-            Number vector.
+            Number vector, or array of shape (n, ...) whose columns are solved together in one sweep.
 
         Returns
         -----------------
         np.array
-            Returns a numpy array containing the solution.
+            Returns a numpy array containing the solution, with the same shape of 'delta'.
+    """
+    # a single buffer is allocated: the backward pass runs in place on the forward result
+    temp = forward(beta, alpha, delta)
+    return backward(gamma, temp, out = temp)
+
+def solver5(l2: np.ndarray, l1: np.ndarray, alpha: np.ndarray, gamma: np.ndarray, f: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    """ 
+        Forward-backward substitution algorithm for pentadiagonal linear systems, given the factors of 'lu.lu5'.
+        Factors of shape (m, n) describe m independent systems, solved together, whose number vectors are the rows of 'delta'.
+
+        Parameters
+        -----------------
+        l2, l1 : np.array
+            Second lower and lower diagonal numbers of L.
+        alpha, gamma, f : np.array
+            Diagonal, upper and second upper diagonal numbers of U.
+        delta : np.array
+            Number vector, or array of shape (n, ...) whose columns are solved together in one sweep.
+
+        Returns
+        -----------------
+        np.array
+            Returns a numpy array containing the solution, with the same shape of 'delta'.
+
+        Raises
+        -----------------
+        - RelativeSizeException: if the factors and the known values do not have the correct relative size.
+    """
+    batched = np.ndim(alpha) > 1
+    n = np.shape(alpha)[-1]
+    if (np.shape(delta) if batched else np.shape(delta)[:1]) != np.shape(alpha):
+        raise RelativeSizeException("Main diagonal and known values have different size.")
+
+    out = np.array(delta, dtype = np.result_type(alpha, delta, np.float64))
+
+    # stacked systems are transposed so that each step of the recurrence works on all of them at once
+    a, b, c, g, h, x = (np.asarray(l2).T, np.asarray(l1).T, np.asarray(alpha).T, np.asarray(gamma).T, np.asarray(f).T, out.T) if batched else (l2, l1, alpha, gamma, f, out)
+
+    # the unit lower triangular L, then U, both in place
+    x[1] -= b[0] * x[0]
+    for i in range(2, n):
+        x[i] -= b[i - 1] * x[i - 1] + a[i - 2] * x[i - 2]
+
+    x[n - 1] /= c[n - 1]
+    x[n - 2] = (x[n - 2] - g[n - 2] * x[n - 1]) / c[n - 2]
+    for i in range(n - 3, -1, -1):
+        x[i] = (x[i] - g[i] * x[i + 1] - h[i] * x[i + 2]) / c[i]
+
+    return out
+
+def _thomas_kernel(v: np.ndarray, u: np.ndarray, w: np.ndarray, delta: np.ndarray, out: np.ndarray, gamma: np.ndarray) -> int:
+    """
+        Fused factorization and substitution loop over the rows of 'delta', of shape (n, k);
+        compiled by numba when available. Returns 1 if a null pivot is met, 0 otherwise.
+    """
+    n, k = delta.shape
+    alpha = u[0]
+    if alpha == 0:
+        return 1
+    gamma[0] = w[0] / alpha
+    for j in range(k):
+        out[0, j] = delta[0, j] / alpha
+    for i in range(1, n):
+        alpha = u[i] - v[i - 1] * gamma[i - 1]
+        if alpha == 0:
+            return 1
+        if i < n - 1:
+            gamma[i] = w[i] / alpha
+        for j in range(k):
+            out[i, j] = (delta[i, j] - v[i - 1] * out[i - 1, j]) / alpha
+
+    for i in range(n - 2, -1, -1):
+        for j in range(k):
+            out[i, j] = out[i, j] - gamma[i] * out[i + 1, j]
+
+    return 0
+
+def _substitution_kernel(beta: np.ndarray, alpha: np.ndarray, gamma: np.ndarray, delta: np.ndarray, out: np.ndarray):
+    """
+        Forward-backward substitution loop over the rows of 'delta', of shape (n, k);
+        compiled by numba when available.
+    """
+    n, k = delta.shape
+    for j in range(k):
+        out[0, j] = delta[0, j] / alpha[0]
+    for i in range(1, n):
+        for j in range(k):
+            out[i, j] = (delta[i, j] - beta[i - 1] * out[i - 1, j]) / alpha[i]
+
+    for i in range(n - 2, -1, -1):
+        for j in range(k):
+            out[i, j] = out[i, j] - gamma[i] * out[i + 1, j]
+
+def _factorization_kernel(v: np.ndarray, u: np.ndarray, w: np.ndarray, alpha: np.ndarray, gamma: np.ndarray) -> int:
+    """
+        LU factorization loop, same factors of 'lu.lu'; compiled by numba when available.
+        Returns 1 if a null pivot is met, 0 otherwise.
+    """
+    n = u.shape[0]
+    alpha[0] = u[0]
+    for i in range(1, n):
+        if alpha[i - 1] == 0:
+            return 1
+        gamma[i - 1] = w[i - 1] / alpha[i - 1]
+        alpha[i] = u[i] - v[i - 1] * gamma[i - 1]
+
+    return 1 if alpha[n - 1] == 0 else 0
+
+def _pentadiagonal_kernel(e: np.ndarray, v: np.ndarray, u: np.ndarray, w: np.ndarray, f: np.ndarray, delta: np.ndarray, out: np.ndarray,
+                          alpha: np.ndarray, gamma: np.ndarray) -> int:
+    """
+        Fused factorization of 'lu.lu5' and substitution loop over the rows of 'delta', of shape (n, k);
+        compiled by numba when available. Returns 1 if a null pivot is met, 0 otherwise.
+    """
+    n, k = delta.shape
+    for i in range(n):
+        l1, l2 = 0., 0.
+        alpha[i] = u[i]
+        if i > 1:
+            l2 = e[i - 2] / alpha[i - 2]
+            alpha[i] -= l2 * f[i - 2]
+        if i > 0:
+            l1 = v[i - 1] - (l2 * gamma[i - 2] if i > 1 else 0.)
+            l1 = l1 / alpha[i - 1]
+            alpha[i] -= l1 * gamma[i - 1]
+        if alpha[i] == 0:
+            return 1
+        if i < n - 1:
+            gamma[i] = w[i] - (l1 * f[i - 1] if i > 0 else 0.)
+        for j in range(k):
+            out[i, j] = delta[i, j] - (l1 * out[i - 1, j] if i > 0 else 0.) - (l2 * out[i - 2, j] if i > 1 else 0.)
+
+    for i in range(n - 1, -1, -1):
+        for j in range(k):
+            x = out[i, j]
+            if i < n - 1:
+                x -= gamma[i] * out[i + 1, j]
+            if i < n - 2:
+                x -= f[i] * out[i + 2, j]
+            out[i, j] = x / alpha[i]
+
+    return 0
+
+if numba is not None:
+    _factorization_kernel = numba.njit(cache = True)(_factorization_kernel)
+    _pentadiagonal_kernel = numba.njit(cache = True)(_pentadiagonal_kernel)
+    _thomas_kernel = numba.njit(cache = True)(_thomas_kernel)
+    _substitution_kernel = numba.njit(cache = True)(_substitution_kernel)
+
+def available_backends() -> list[str]:
+    """
+        List the backends of 'thomas' that can be used in the current environment.
+
+        Returns
+        -----------------
+        list
+            Returns the names of the available backends, in order of preference.
+    """
+    names = []
+    if numba is not None:
+        names.append("numba")
+    if lapack is not None:
+        names.append("scipy")
+    names.append("numpy")
+
+    return names
+
+def backend() -> str:
+    """
+        Resolve the module-level 'BACKEND' setting into the backend actually used.
+
+        Returns
+        -----------------
+        str
+            Returns the name of the backend.
+
+        Raises
+        -----------------
+        - BackendException: if 'BACKEND' is not a known backend name.
+    """
+    if BACKEND not in ("auto", "numba", "scipy", "numpy"):
+        raise BackendException(f"Unknown backend '{BACKEND}'.")
+
+    names = available_backends()
+    if BACKEND == "auto":
+        return names[0]
+
+    return BACKEND if BACKEND in names else "numpy"
+
+def thomas(v: np.ndarray, u: np.ndarray, w: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    """ 
+        Thomas algorithm: LU factorization and forward-backward substitution of a tridiagonal linear system
+        fused in a single call. The work is dispatched to the backend selected by 'BACKEND';
+        stacked diagonals of shape (m, n), describing m independent systems, always run on the vectorized numpy code.
+        
+        Parameters
+        -----------------
+        v : np.array
+            Lower diagonal numbers.
+        u : np.array
+            Main diagonal numbers.
+        w : np.array
+            Upper diagonal numbers.
+        delta : np.array
+            Number vector, or array of shape (n, ...) whose columns are solved together.
+
+        Returns
+        -----------------
+        np.array
+            Returns a numpy array containing the solution, with the same shape of 'delta'.
+
+        Raises
+        -----------------
+        - MinSizeException: if the main diagonal has less than two elements.
+        - RelativeSizeException: if the diagonals and the known values do not have the correct relative size.
+        - ZeroDivisionError: if the matrix is singular (or, without pivoting, a null pivot is met).
+    """
+
+    if np.ndim(u) > 1:
+        return solver(*lu(v, u, w), delta)
+
+    if len(u) < 2:
+        raise MinSizeException("Main diagonal has less than two elements.")
+    if len(u) != len(v) + 1 or len(u) != len(w) + 1:
+        raise RelativeSizeException("Main diagonal and off diagonals do not have the correct relative size.")
+    if len(u) != len(delta):
+        raise RelativeSizeException("Main diagonal and known values have different size.")
+
+    name = backend()
+    if name == "numba":
+        v, u, w, rhs = (np.ascontiguousarray(a, dtype = np.float64) for a in (v, u, w, delta))
+        rhs = rhs.reshape(len(u), -1)
+        out = np.empty_like(rhs)
+        if _thomas_kernel(v, u, w, rhs, out, np.empty_like(w)):
+            raise ZeroDivisionError
+        return out.reshape(np.shape(delta))
+    if name == "scipy":
+        v, u, w, rhs = (np.asarray(a, dtype = np.float64) for a in (v, u, w, delta))
+        *_, x, info = lapack.dgtsv(v, u, w, rhs.reshape(len(u), -1))
+        if info > 0:
+            raise ZeroDivisionError
+        return x.reshape(np.shape(delta))
+
+    return solver(*lu(v, u, w), delta)
+
+
+class Factorization():
+    """
+    LU factorization of a tridiagonal matrix, computed once and reused for any number of known values.
+    The factors are computed by the backend selected by 'BACKEND' when the object is created;
+    stacked diagonals of shape (m, n) are factorized by 'lu.lu' and solved by 'solver'.
+
+    Parameters
+    --------------
+    v : np.array
+        Lower diagonal numbers.
+    u : np.array
+        Main diagonal numbers.
+    w : np.array
+        Upper diagonal numbers.
+    dtype : np.dtype
+        Floating point type of the factors and of the solutions, np.float64 or np.float32.
+    """
+
+    def __init__(self, v: np.ndarray, u: np.ndarray, w: np.ndarray, dtype: type = np.float64):
+        """
+        Factorization constructor. Computes the factors of the matrix.
+
+        Raises
+        ---------------
+        - MinSizeException: if the main diagonal has less than two elements.
+        - RelativeSizeException: if the off diagonals do not have one element less than the main diagonal,
+          or stacked diagonals do not describe the same number of matrices.
+        - ZeroDivisionError: if the matrix is singular (or, without pivoting, a null pivot is met).
+        """
+        # the sizes are checked here for every backend, so that all of them raise the exceptions of this module
+        self.size = np.shape(u)[-1]
+        if self.size < 2:
+            raise MinSizeException("Main diagonal has less than two elements.")
+        if np.shape(v) != np.shape(u)[:-1] + (self.size - 1,) or np.shape(w) != np.shape(v):
+            raise RelativeSizeException("Main diagonal and off diagonals do not have the correct relative size.")
+
+        self.dtype = np.dtype(dtype)
+        self.backend = backend() if np.ndim(u) == 1 else "numpy"
+        if self.backend == "scipy" and self.size == 2:
+            self.backend = "numpy" # the wrapper of gttrf rejects systems of two unknowns
+
+        if self.backend in ("scipy", "numba"):
+            v, u, w = (np.ascontiguousarray(a, dtype = self.dtype) for a in (v, u, w))
+
+        if self.backend == "scipy":
+            gttrf = lapack.get_lapack_funcs("gttrf", dtype = self.dtype)
+            *self.factors, info = gttrf(v, u, w)
+            if info > 0:
+                raise ZeroDivisionError
+        elif self.backend == "numba":
+            alpha, gamma = np.empty_like(u), np.empty_like(w)
+            if _factorization_kernel(v, u, w, alpha, gamma):
+                raise ZeroDivisionError
+            self.factors = [v, alpha, gamma]
+        else:
+            self.factors = [np.ascontiguousarray(f, dtype = self.dtype) for f in lu(v, u, w, dtype = self.dtype)]
+
+    def solve(self, delta: np.ndarray) -> np.ndarray:
+        """
+        Solve the factorized system for the given known values.
+
+        Parameters
+        --------------
+        delta : np.array
+            Number vector, or array of shape (n, ...) whose columns are solved together in one sweep.
+
+        Returns
+        --------------
+        np.array
+            Returns a numpy array containing the solution, with the same shape of 'delta'.
+
+        Raises
+        --------------
+        - RelativeSizeException: if 'delta' has not the size of the matrix along its first axis.
+        """
+        if self.backend == "numpy" and np.ndim(self.factors[1]) > 1:
+            return solver(*self.factors, delta).astype(self.dtype, copy = False)
+        if len(delta) != self.size:
+            raise RelativeSizeException("Matrix and known values have different size.")
+
+        if self.backend == "scipy":
+            rhs = np.asarray(delta, dtype = self.dtype).reshape(self.size, -1)
+            x, _ = lapack.get_lapack_funcs("gttrs", dtype = self.dtype)(*self.factors, rhs)
+            return x.reshape(np.shape(delta))
+        if self.backend == "numba":
+            rhs = np.ascontiguousarray(delta, dtype = self.dtype).reshape(self.size, -1)
+            out = np.empty_like(rhs)
+            _substitution_kernel(*self.factors, rhs, out)
+            return out.reshape(np.shape(delta))
+
+        return solver(*self.factors, delta).astype(self.dtype, copy = False)
+
+
+class CyclicFactorization():
+    """
+    Factorization of a cyclic tridiagonal matrix, a tridiagonal matrix with two more elements in the corners,
+    reused for any number of known values.
+    The matrix is written as a tridiagonal one plus a matrix of rank one, so that by the Sherman-Morrison formula
+    each solution costs a single tridiagonal solve; the tridiagonal part is a 'Factorization'.
+
+    Parameters
+    --------------
+    v : np.array
+        Lower diagonal numbers.
+    u : np.array
+        Main diagonal numbers.
+    w : np.array
+        Upper diagonal numbers.
+    top : float
+        Number in the top right corner, coefficient of the last unknown in the first row.
+    bottom : float
+        Number in the bottom left corner, coefficient of the first unknown in the last row.
+    dtype : np.dtype
+        Floating point type of the factors and of the solutions, see 'Factorization'.
     """
-    return backward(gamma, forward(beta, alpha, delta))
\ No newline at end of file
+
+    def __init__(self, v: np.ndarray, u: np.ndarray, w: np.ndarray, top: float, bottom: float, dtype: type = np.float64):
+        """
+        CyclicFactorization constructor. Computes the factors of the tridiagonal part and the correction of the corners.
+
+        Raises
+        ---------------
+        - MinSizeException, RelativeSizeException: same conditions of 'lu.lu'.
+        - ZeroDivisionError: if the matrix is singular (or, without pivoting, a null pivot is met).
+        """
+        v, u, w = (np.array(a, dtype = np.float64) for a in (v, u, w))
+        self.size = len(u)
+        if self.size == 2:
+            # the corners are on the off diagonals
+            v[0], w[0] = v[0] + bottom, w[0] + top
+            self.tridiagonal, self.correction = Factorization(v, u, w, dtype = dtype), None
+            return
+
+        # A = B + p q^T, with p = (g, 0, ..., bottom) and q = (1, 0, ..., top / g)
+        g = -u[0] if u[0] != 0 else -1.0
+        u[0], u[-1] = u[0] - g, u[-1] - bottom * top / g
+        self.tridiagonal = Factorization(v, u, w, dtype = dtype)
+
+        p = np.zeros(self.size, dtype = dtype)
+        p[0], p[-1] = g, bottom
+        z = self.tridiagonal.solve(p)
+        scale = 1 + z[0] + top / g * z[-1]
+        # the matrix is singular when the correction cancels out, up to the rounding of its terms
+        if abs(scale) <= 8 * np.finfo(dtype).eps * (1 + abs(z[0]) + abs(top / g * z[-1])):
+            raise ZeroDivisionError
+        self.correction = (z, top / g, scale)
+
+    @property
+    def factors(self) -> list:
+        """
+        Factors of the tridiagonal part, followed by the solution of the correction when there is one.
+        """
+        extra = [] if self.correction is None else [self.correction[0]]
+        return list(self.tridiagonal.factors) + extra
+
+    def solve(self, delta: np.ndarray) -> np.ndarray:
+        """
+        Solve the factorized system for the given known values.
+
+        Parameters
+        --------------
+        delta : np.array
+            Number vector, or array of shape (n, ...) whose columns are solved together.
+
+        Returns
+        --------------
+        np.array
+            Returns a numpy array containing the solution, with the same shape of 'delta'.
+
+        Raises
+        --------------
+        - RelativeSizeException: if 'delta' has not the size of the matrix along its first axis.
+        """
+        y = self.tridiagonal.solve(delta)
+        if self.correction is None:
+            return y
+
+        z, ratio, scale = self.correction
+        factor = (y[0] + ratio * y[-1]) / scale
+        return y - z.reshape((-1,) + (1,) * (np.ndim(y) - 1)) * factor
+
+
+def cyclic(v: np.ndarray, u: np.ndarray, w: np.ndarray, top: float, bottom: float, delta: np.ndarray) -> np.ndarray:
+    """
+    Solve a cyclic tridiagonal linear system, see 'CyclicFactorization'.
+
+    Parameters
+    -----------------
+    v : np.array
+        Lower diagonal numbers.
+    u : np.array
+        Main diagonal numbers.
+    w : np.array
+        Upper diagonal numbers.
+    top : float
+        Number in the top right corner.
+    bottom : float
+        Number in the bottom left corner.
+    delta : np.array
+        Number vector, or array of shape (n, ...) whose columns are solved together.
+
+    Returns
+    -----------------
+    np.array
+        Returns a numpy array containing the solution, with the same shape of 'delta'.
+
+    Raises
+    -----------------
+    Same exceptions of 'CyclicFactorization' and of its 'solve' method.
+    """
+    return CyclicFactorization(v, u, w, top, bottom).solve(delta)
+
+
+def pentadiagonal(e: np.ndarray, v: np.ndarray, u: np.ndarray, w: np.ndarray, f: np.ndarray, delta: np.ndarray) -> np.ndarray:
+    """
+    Solve a pentadiagonal linear system in linear time: the factorization of 'lu.lu5' and the substitution
+    are dispatched, as in 'thomas', to the backend selected by 'BACKEND'; the scipy one calls the banded solver
+    of LAPACK, with partial pivoting. Stacked diagonals of shape (m, n) always run on the vectorized numpy code.
+
+    Parameters
+    -----------------
+    e : np.array
+        Second lower diagonal numbers.
+    v : np.array
+        Lower diagonal numbers.
+    u : np.array
+        Main diagonal numbers.
+    w : np.array
+        Upper diagonal numbers.
+    f : np.array
+        Second upper diagonal numbers.
+    delta : np.array
+        Number vector, or array of shape (n, ...) whose columns are solved together.
+
+    Returns
+    -----------------
+    np.array
+        Returns a numpy array containing the solution, with the same shape of 'delta'.
+
+    Raises
+    -----------------
+    - MinSizeException: if the main diagonal has less than three elements.
+    - RelativeSizeException: if the diagonals and the known values do not have the correct relative size.
+    - ZeroDivisionError: if the matrix is singular (or, without pivoting, a null pivot is met).
+    """
+    if np.ndim(u) > 1:
+        return solver5(*lu5(e, v, u, w, f), delta)
+
+    n = len(u)
+    if n < 3:
+        raise MinSizeException("Main diagonal has less than three elements.")
+    if len(v) != n - 1 or len(w) != n - 1 or len(e) != n - 2 or len(f) != n - 2:
+        raise RelativeSizeException("Main diagonal and off diagonals do not have the correct relative size.")
+    if len(delta) != n:
+        raise RelativeSizeException("Main diagonal and known values have different size.")
+
+    name = backend()
+    if name == "numba":
+        e, v, u, w, f, rhs = (np.ascontiguousarray(a, dtype = np.float64) for a in (e, v, u, w, f, delta))
+        rhs = rhs.reshape(n, -1)
+        out = np.empty_like(rhs)
+        if _pentadiagonal_kernel(e, v, u, w, f, rhs, out, np.empty_like(u), np.empty_like(w)):
+            raise ZeroDivisionError
+        return out.reshape(np.shape(delta))
+    if name == "scipy":
+        # band storage with two more rows for the fill-in of the pivoting: ab[4 + i - j, j] = A[i, j]
+        ab = np.zeros((7, n))
+        ab[2, 2:], ab[3, 1:], ab[4], ab[5, :-1], ab[6, :-2] = f, w, u, v, e
+        *_, x, info = lapack.dgbsv(2, 2, ab, np.asarray(delta, dtype = np.float64).reshape(n, -1))
+        if info > 0:
+            raise ZeroDivisionError
+        return x.reshape(np.shape(delta))
+
+    return solver5(*lu5(e, v, u, w, f), delta)
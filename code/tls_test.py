@@ -1,6 +1,6 @@
 import unittest
 import numpy as np
-from lu import lu
+from lu import lu, lu5
 import tls
 
 class TestForewardSubstitution(unittest.TestCase):
@@ -123,6 +123,20 @@ class TestBackwardSubstitution(unittest.TestCase):
         x = tls.backward(gamma, temp)
 
         self.assertTrue(np.allclose(sol, x))
+
+    def test_in_place_solution(self):
+        """
+            Test that the backward substitution can overwrite its input vector,
+            which is the way the solver avoids a second allocation.
+        """
+        gamma = np.array([3/10, 10/37])
+        temp = np.array([57/20, 273/74, -165/92])
+
+        sol = np.array([147/92, 96/23, -165/92])
+        x = tls.backward(gamma, temp, out = temp)
+
+        self.assertIs(x, temp)
+        self.assertTrue(np.allclose(x, sol))
     
 class TestSolver(unittest.TestCase):
     # check known solution
@@ -230,4 +244,329 @@ class TestSolver(unittest.TestCase):
         
         self.assertTrue(np.allclose(xsolver, xbackward))
 
-unittest.main()
\ No newline at end of file
+    def test_large_system(self):
+        """
+            Test the solver on a large diagonally dominant system, 
+            comparing the solution with the product of the matrix and the solution itself.
+        """
+        rng = np.random.default_rng(0)
+        n = 10000
+        v = rng.uniform(0, 1, n - 1)
+        u = 2 + rng.uniform(0, 1, n)
+        w = rng.uniform(0, 1, n - 1)
+        delta = rng.uniform(-1, 1, n)
+
+        x = tls.solver(*lu(v, u, w), delta)
+        Ax = u * x
+        Ax[1:] += v * x[:-1]
+        Ax[:-1] += w * x[1:]
+
+        self.assertTrue(np.allclose(Ax, delta))
+
+class TestThomas(unittest.TestCase):
+    def tearDown(self):
+        tls.BACKEND = "auto"
+
+    def test_backends_agree(self):
+        """
+            Test that every available backend computes the same solution
+            of the factorization followed by the forward-backward substitution.
+        """
+        v = np.array([2, 2])
+        u = np.array([10, 8, 8])
+        w = np.array([3, 2])
+        delta = np.array([57/2, 33, -6])
+
+        sol = tls.solver(*lu(v, u, w), delta)
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            self.assertEqual(tls.backend(), name)
+            self.assertTrue(np.allclose(tls.thomas(v, u, w, delta), sol))
+
+    def test_unknown_backend(self):
+        """
+            Test that selecting a backend that does not exist raises an exception.
+        """
+        tls.BACKEND = "fortran"
+
+        with self.assertRaises(tls.BackendException):
+            tls.backend()
+
+    def test_singular_matrix(self):
+        """
+            Test that a singular matrix raises a ZeroDivisionError with every backend.
+        """
+        v = np.array([1, 0])
+        u = np.array([1, 1, 1])
+        w = np.array([1, 0])
+        delta = np.array([1, 2, 3])
+
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            with self.assertRaises(ZeroDivisionError):
+                tls.thomas(v, u, w, delta)
+
+    def test_size(self):
+        """
+            Test that the known values must have the same size of the main diagonal.
+        """
+        v = np.array([2, 2])
+        u = np.array([10, 8, 8])
+        w = np.array([3, 2])
+        delta = np.array([1, 2])
+
+        with self.assertRaises(tls.RelativeSizeException):
+            tls.thomas(v, u, w, delta)
+
+class TestMultipleKnownValues(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(1)
+        n, k = 50, 7
+        self.v = rng.uniform(0, 1, n - 1)
+        self.u = 2 + rng.uniform(0, 1, n)
+        self.w = rng.uniform(0, 1, n - 1)
+        self.delta = rng.uniform(-1, 1, (n, k))
+
+    def tearDown(self):
+        tls.BACKEND = "auto"
+
+    def test_solver_columns(self):
+        """
+            Test that solving a 2-D array of known values gives, column by column,
+            the same solution of the one dimensional solver.
+        """
+        factors = lu(self.v, self.u, self.w)
+        x = tls.solver(*factors, self.delta)
+
+        self.assertEqual(x.shape, self.delta.shape)
+        for j in range(self.delta.shape[1]):
+            self.assertTrue(np.allclose(x[:, j], tls.solver(*factors, self.delta[:, j])))
+
+    def test_thomas_columns(self):
+        """
+            Test that every backend of the fused algorithm solves all the columns at once.
+        """
+        sol = tls.solver(*lu(self.v, self.u, self.w), self.delta)
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            self.assertTrue(np.allclose(tls.thomas(self.v, self.u, self.w, self.delta), sol))
+
+    def test_factorization_reuse(self):
+        """
+            Test that a factorization computed once solves different known values,
+            with every backend, both for vectors and 2-D arrays.
+        """
+        sol = tls.solver(*lu(self.v, self.u, self.w), self.delta)
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            factors = tls.Factorization(self.v, self.u, self.w)
+            self.assertEqual(factors.backend, name)
+            self.assertTrue(np.allclose(factors.solve(self.delta), sol))
+            self.assertTrue(np.allclose(factors.solve(self.delta[:, 0]), sol[:, 0]))
+
+    def test_factorization_size(self):
+        """
+            Test that known values with a different size of the matrix raise an exception.
+        """
+        factors = tls.Factorization(self.v, self.u, self.w)
+
+        with self.assertRaises(tls.RelativeSizeException):
+            factors.solve(self.delta[1:])
+
+    def test_factorization_diagonal_size(self):
+        """
+            Test that every backend raises the exceptions of this module for diagonals of invalid size,
+            single or stacked.
+        """
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            with self.assertRaises(tls.MinSizeException):
+                tls.Factorization(np.array([]), np.array([1.]), np.array([]))
+            for v, u, w in ((self.v[1:], self.u, self.w), (self.v, self.u, self.w[1:]), (self.v[:2], self.u[:2], self.w[:2]),
+                            (np.ones((2, 2)), np.ones((3, 3)), np.ones((2, 2)))):
+                with self.assertRaises(tls.RelativeSizeException):
+                    tls.Factorization(v, u, w)
+
+    def test_singular_factorization(self):
+        """
+            Test that the factorization of a singular matrix raises a ZeroDivisionError with every backend.
+        """
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            with self.assertRaises(ZeroDivisionError):
+                tls.Factorization(np.array([1, 0]), np.array([1, 1, 1]), np.array([1, 0]))
+
+    def test_single_precision_factorization(self):
+        """
+            Test that every backend factorizes and solves in single precision when asked,
+            close to the double precision solution.
+        """
+        sol = tls.solver(*lu(self.v, self.u, self.w), self.delta)
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            factors = tls.Factorization(self.v, self.u, self.w, dtype = np.float32)
+            x = factors.solve(self.delta)
+            self.assertEqual(x.dtype, np.float32)
+            self.assertTrue(all(f.dtype == np.float32 for f in factors.factors if f.dtype.kind == "f"))
+            self.assertTrue(np.allclose(x, sol, rtol = 1e-5, atol = 1e-6))
+
+class TestStackedSystems(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(2)
+        m, n = 30, 12
+        self.v = rng.uniform(0, 1, (m, n - 1))
+        self.u = 2 + rng.uniform(0, 1, (m, n))
+        self.w = rng.uniform(0, 1, (m, n - 1))
+        self.delta = rng.uniform(-1, 1, (m, n))
+
+    def test_solver_rows(self):
+        """
+            Test that stacked independent systems are solved, row by row, 
+            as the corresponding single systems.
+        """
+        x = tls.solver(*lu(self.v, self.u, self.w), self.delta)
+
+        self.assertEqual(x.shape, self.delta.shape)
+        for j in range(len(self.u)):
+            single = tls.solver(*lu(self.v[j], self.u[j], self.w[j]), self.delta[j])
+            self.assertTrue(np.allclose(x[j], single))
+
+    def test_thomas_rows(self):
+        """
+            Test that the fused algorithm and the factorization object accept stacked systems.
+        """
+        sol = tls.solver(*lu(self.v, self.u, self.w), self.delta)
+
+        self.assertTrue(np.allclose(tls.thomas(self.v, self.u, self.w, self.delta), sol))
+        self.assertTrue(np.allclose(tls.Factorization(self.v, self.u, self.w).solve(self.delta), sol))
+
+    def test_stacked_size(self):
+        """
+            Test that the known values must stack the same number of systems of the diagonals.
+        """
+        beta, alpha, gamma = lu(self.v, self.u, self.w)
+
+        with self.assertRaises(tls.RelativeSizeException):
+            tls.forward(beta, alpha, self.delta[1:])
+        with self.assertRaises(tls.RelativeSizeException):
+            tls.backward(gamma, self.delta[1:])
+
+class TestCyclic(unittest.TestCase):
+    def tearDown(self):
+        tls.BACKEND = "auto"
+
+    def dense(self, v, u, w, top, bottom):
+        A = np.diag(u) + np.diag(v, -1) + np.diag(w, 1)
+        A[0, -1] += top
+        A[-1, 0] += bottom
+        return A
+
+    def test_known_solution(self):
+        """
+            Test that the cyclic system is solved by every backend, for one or many columns of known values.
+        """
+        rng = np.random.default_rng(0)
+        for n in (3, 4, 10):
+            v, w = rng.normal(size = (2, n - 1))
+            u = 4 + rng.random(n)
+            top, bottom = rng.normal(size = 2)
+            delta = rng.normal(size = (n, 3))
+            A = self.dense(v, u, w, top, bottom)
+
+            for name in tls.available_backends():
+                tls.BACKEND = name
+                self.assertTrue(np.allclose(A @ tls.cyclic(v, u, w, top, bottom, delta), delta))
+                self.assertTrue(np.allclose(A @ tls.cyclic(v, u, w, top, bottom, delta[:, 0]), delta[:, 0]))
+
+    def test_two_unknowns(self):
+        """
+            Test that with two unknowns the corners are added to the off diagonals.
+        """
+        v, u, w = np.array([1.]), np.array([4., 5.]), np.array([2.])
+        delta = np.array([1., 2.])
+        A = np.array([[4., 2. + 3.], [1. + 0.5, 5.]])
+
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            self.assertTrue(np.allclose(tls.cyclic(v, u, w, 3., 0.5, delta), np.linalg.solve(A, delta)))
+
+    def test_factorization_reuse(self):
+        """
+            Test that a factorization solves many known values.
+        """
+        v, u, w = np.ones(4), 4 * np.ones(5), np.ones(4)
+        factorization = tls.CyclicFactorization(v, u, w, 1., 1.)
+        A = self.dense(v, u, w, 1., 1.)
+
+        for delta in np.eye(5):
+            self.assertTrue(np.allclose(A @ factorization.solve(delta), delta))
+        with self.assertRaises(tls.RelativeSizeException):
+            factorization.solve(np.ones(4))
+
+    def test_singular_matrix(self):
+        """
+            Test that a singular cyclic matrix raises a ZeroDivisionError.
+        """
+        # every row sums to zero
+        with self.assertRaises(ZeroDivisionError):
+            tls.CyclicFactorization(np.ones(3), -2 * np.ones(4), np.ones(3), 1., 1.)
+
+class TestPentadiagonal(unittest.TestCase):
+    def setUp(self):
+        rng = np.random.default_rng(5)
+        n = 40
+        self.e, self.v, self.w, self.f = rng.random(n - 2), rng.random(n - 1), rng.random(n - 1), rng.random(n - 2)
+        self.u = 4 + rng.random(n)
+        self.delta = rng.uniform(-1, 1, (n, 3))
+        A = np.diag(self.u) + np.diag(self.v, -1) + np.diag(self.w, 1) + np.diag(self.e, -2) + np.diag(self.f, 2)
+        self.sol = np.linalg.solve(A, self.delta)
+
+    def tearDown(self):
+        tls.BACKEND = "auto"
+
+    def test_known_solution(self):
+        """
+            Test that every backend solves the system, for one or many columns of known values,
+            and that the substitution of the factors of 'lu5' gives the same solution.
+        """
+        diagonals = (self.e, self.v, self.u, self.w, self.f)
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            self.assertTrue(np.allclose(tls.pentadiagonal(*diagonals, self.delta), self.sol), name)
+            self.assertTrue(np.allclose(tls.pentadiagonal(*diagonals, self.delta[:, 0]), self.sol[:, 0]), name)
+
+        self.assertTrue(np.allclose(tls.solver5(*lu5(*diagonals), self.delta), self.sol))
+
+    def test_stacked(self):
+        """
+            Test that stacked systems are solved row by row as the single ones.
+        """
+        diagonals = [np.stack((a, 2 * a)) for a in (self.e, self.v, self.u, self.w, self.f)]
+        delta = np.stack((self.delta[:, 0], self.delta[:, 1]))
+        x = tls.pentadiagonal(*diagonals, delta)
+
+        self.assertTrue(np.allclose(x[0], self.sol[:, 0]))
+        self.assertTrue(np.allclose(x[1], tls.pentadiagonal(*(d[1] for d in diagonals), delta[1])))
+
+    def test_size(self):
+        """
+            Test that small systems and known values of the wrong size raise an exception.
+        """
+        with self.assertRaises(tls.MinSizeException):
+            tls.pentadiagonal([], [1], [1, 1], [1], [], [1, 1])
+        with self.assertRaises(tls.RelativeSizeException):
+            tls.pentadiagonal(self.e, self.v, self.u, self.w, self.f, self.delta[1:])
+        with self.assertRaises(tls.RelativeSizeException):
+            tls.solver5(*lu5(self.e, self.v, self.u, self.w, self.f), self.delta[1:])
+
+    def test_singular_matrix(self):
+        """
+            Test that a singular matrix raises a ZeroDivisionError with every backend.
+        """
+        for name in tls.available_backends():
+            tls.BACKEND = name
+            with self.assertRaises(ZeroDivisionError):
+                tls.pentadiagonal([1], [1, 1], [1, 1, 1], [1, 1], [1], [1, 2, 3])
+
+
+unittest.main()